@@ -3,7 +3,8 @@ from __future__ import annotations
 from aqt import gui_hooks, mw
 from aqt.qt import QAction
 
-from .graph_launcher import show_family_graph
+from .graph_launcher import discard_family_graph, show_family_graph
+from .graph_prewarm import register_prewarm
 from .version import __version__  # noqa: F401
 
 
@@ -48,6 +49,8 @@ _register_menu()
 _register_exports()
 gui_hooks.profile_did_open.append(lambda *_args, **_kw: _register_menu())
 gui_hooks.profile_did_open.append(lambda *_args, **_kw: _register_exports())
+gui_hooks.profile_will_close.append(lambda *_args, **_kw: discard_family_graph())
+register_prewarm()
 
 
 # Browser Sidebar Link
@@ -25,46 +25,6 @@ def _call_editor_api_fn(fn: Any, nid: int) -> bool:
     return False
 
 
-def _call_dependency_tree_api_fn(fn: Any, nid: int) -> dict[str, Any]:
-    attempts = [
-        ((), {"nid": nid}),
-        ((), {"note_id": nid}),
-        ((), {"id": nid}),
-        ((nid,), {}),
-    ]
-    for args, kwargs in attempts:
-        try:
-            out = fn(*args, **kwargs)
-        except TypeError:
-            continue
-        except Exception:
-            continue
-        if isinstance(out, dict):
-            return out
-    return {}
-
-
-def _get_dependency_tree_via_main_api(nid: int) -> dict[str, Any]:
-    if mw is None:
-        return {}
-    api = getattr(mw, "_ajpc_graph_api", None)
-    if not isinstance(api, dict):
-        return {}
-    keys = (
-        "get_dependency_tree",
-        "get_prio_chain",
-    )
-    for key in keys:
-        fn = api.get(key)
-        if not callable(fn):
-            continue
-        out = _call_dependency_tree_api_fn(fn, nid)
-        if out:
-            logger.dbg("deptree via api", key, nid)
-            return out
-    return {}
-
-
 def _open_editor_via_main_api(nid: int) -> bool:
     if mw is None:
         return False
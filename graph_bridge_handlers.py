@@ -14,7 +14,6 @@ from .graph_actions import (
     _open_browser_for_tag,
     _open_editor,
 )
-from .graph_api_adapter import _get_dependency_tree_via_main_api
 from .graph_config import (
     set_card_dot_buried_color,
     set_card_dot_suspended_color,
@@ -61,7 +60,7 @@ from .graph_config import (
     set_solver_value,
     set_trailing_hub_distance,
 )
-from .graph_data import _parse_family_field
+from .graph_data import _parse_family_field, hub_members_page
 from .graph_note_ops import (
     _append_family_to_note,
     _append_link_to_note,
@@ -70,6 +69,7 @@ from .graph_note_ops import (
     _remove_link_from_note,
 )
 from .graph_previewer import _open_preview, _open_preview_card
+from .graph_web_bundle import remove_payload_file
 
 
 class GraphBridgeHandlersMixin:
@@ -84,6 +84,8 @@ class GraphBridgeHandlersMixin:
             self._load()
         elif message.startswith("log:"):
             logger.dbg("js", message[4:])
+        elif message.startswith("payload:done:"):
+            remove_payload_file(message[len("payload:done:"):])
         elif message.startswith("embed_editor:"):
             try:
                 _prefix, rest = message.split(":", 1)
@@ -355,6 +357,7 @@ class GraphBridgeHandlersMixin:
                 _prefix, val = message.split(":", 1)
                 set_reference_damping(val == "1")
                 logger.dbg("reference damping", val)
+                self._schedule_refresh("reference damping")
             except Exception:
                 logger.dbg("reference damping parse failed", message)
         elif message.startswith("linkmst:"):
@@ -362,6 +365,7 @@ class GraphBridgeHandlersMixin:
                 _prefix, val = message.split(":", 1)
                 set_link_mst_enabled(val == "1")
                 logger.dbg("link mst enabled", val)
+                self._schedule_refresh("link mst")
             except Exception:
                 logger.dbg("link mst parse failed", message)
         elif message.startswith("hubdamp:"):
@@ -369,6 +373,7 @@ class GraphBridgeHandlersMixin:
                 _prefix, val = message.split(":", 1)
                 set_hub_damping(val == "1")
                 logger.dbg("hub damping", val)
+                self._schedule_refresh("hub damping")
             except Exception:
                 logger.dbg("hub damping parse failed", message)
         elif message.startswith("kcomp:"):
@@ -383,6 +388,7 @@ class GraphBridgeHandlersMixin:
                 _prefix, val = message.split(":", 1)
                 set_kanji_tfidf_enabled(val == "1")
                 logger.dbg("kanji tfidf enabled", val)
+                self._schedule_refresh("kanji tfidf")
             except Exception:
                 logger.dbg("kanji tfidf parse failed", message)
         elif message.startswith("kanjitopkenabled:"):
@@ -390,6 +396,7 @@ class GraphBridgeHandlersMixin:
                 _prefix, val = message.split(":", 1)
                 set_kanji_top_k_enabled(val == "1")
                 logger.dbg("kanji top-k enabled", val)
+                self._schedule_refresh("kanji top-k")
             except Exception:
                 logger.dbg("kanji top-k enabled parse failed", message)
         elif message.startswith("kanjitopk:"):
@@ -397,6 +404,7 @@ class GraphBridgeHandlersMixin:
                 _prefix, val = message.split(":", 1)
                 set_kanji_top_k(float(val))
                 logger.dbg("kanji top-k", val)
+                self._schedule_refresh("kanji top-k")
             except Exception:
                 logger.dbg("kanji top-k parse failed", message)
         elif message.startswith("kanjinorm:"):
@@ -404,6 +412,7 @@ class GraphBridgeHandlersMixin:
                 _prefix, val = message.split(":", 1)
                 set_kanji_quantile_norm(val == "1")
                 logger.dbg("kanji quantile norm", val)
+                self._schedule_refresh("kanji quantile norm")
             except Exception:
                 logger.dbg("kanji quantile norm parse failed", message)
         elif message.startswith("kcompstyle:"):
@@ -511,30 +520,25 @@ class GraphBridgeHandlersMixin:
                 self._schedule_refresh("family chain edges")
             except Exception:
                 logger.dbg("family chain parse failed", message)
-        elif message.startswith("deptree:"):
-            try:
-                _prefix, raw_nid = message.split(":", 1)
-                nid = int(raw_nid or "0")
-            except Exception:
-                nid = 0
-            try:
-                data = _get_dependency_tree_via_main_api(nid) if nid > 0 else {}
-                if not isinstance(data, dict):
-                    data = {}
-                if nid > 0 and not data.get("current_nid"):
-                    data["current_nid"] = int(nid)
-                payload_json = json.dumps(data, ensure_ascii=False).replace("</", "<\\/")
-                js = (
-                    "(function(){"
-                    "if(window.setActiveDepTreeFromPy){"
-                    "window.setActiveDepTreeFromPy(" + payload_json + ");"
-                    "}"
-                    "})();"
+        elif message.startswith("hub:expand:"):
+            rest = message[len("hub:expand:"):]
+            raw_id, _sep, raw_page = rest.partition(":")
+            hub_id = unquote(raw_id)
+            try:
+                page = int(raw_page or 0)
+                batch = hub_members_page(mw.col, getattr(self, "_hub_members", {}) or {}, hub_id, page)
+                payload_json = json.dumps(batch, ensure_ascii=False).replace("</", "<\\/")
+                self.web.eval(
+                    "window.ajpcHubMembersFromPy && window.ajpcHubMembersFromPy(" + payload_json + ");"
+                )
+                logger.dbg("hub expand", hub_id, "page", page, "nodes", batch.get("total_nodes"))
+            except Exception as exc:
+                logger.dbg("hub expand failed", message, repr(exc))
+                # clears the webview's loading flag so the hub can be requested again
+                error_json = json.dumps({"hub_id": hub_id, "error": str(exc) or repr(exc)}, ensure_ascii=False)
+                self.web.eval(
+                    "window.ajpcHubMembersFromPy && window.ajpcHubMembersFromPy(" + error_json.replace("</", "<\\/") + ");"
                 )
-                self.web.eval(js)
-                logger.dbg("deptree", nid, "nodes=", len(data.get("nodes", []) or []), "edges=", len(data.get("edges", []) or []))
-            except Exception:
-                logger.dbg("deptree failed", message)
         elif message.startswith("ctx:"):
             try:
                 _prefix, rest = message.split(":", 1)
@@ -0,0 +1,209 @@
+"""Run build_graph headless (no Qt, no running Anki) for profiling and regression runs.
+
+Needs the ``anki`` package (``pip install anki``); the add-on's GUI modules are never
+imported. Point it at a *copy* of the collection, since opening it may upgrade it:
+
+    python graph_build_cli.py collection.anki2 --tools-config ajpc_tools/meta.json \\
+        --graph-config graph_config.json --out payload.json --report report.json \\
+        --cprofile build.prof --tracemalloc
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import io
+import json
+import os
+import sys
+import time
+import types
+from typing import Any
+
+try:
+    import resource
+except Exception:  # not available on Windows
+    resource = None
+
+ADDON_DIR = os.path.dirname(os.path.abspath(__file__))
+# Stand-in package so the add-on's relative imports resolve without running __init__.py,
+# which registers menus and GUI hooks.
+_HEADLESS_PKG = "ajpc_graph_headless"
+PROFILE_TOP = 40
+TRACEMALLOC_TOP = 25
+
+
+def _addon_module(name: str):
+    if __package__:
+        return importlib.import_module(f"{__package__}.{name}")
+    if _HEADLESS_PKG not in sys.modules:
+        pkg = types.ModuleType(_HEADLESS_PKG)
+        pkg.__path__ = [ADDON_DIR]
+        sys.modules[_HEADLESS_PKG] = pkg
+    return importlib.import_module(f"{_HEADLESS_PKG}.{name}")
+
+
+def _read_json(path: str) -> Any:
+    with open(path, "r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def load_tools_config(path: str) -> dict[str, Any]:
+    """Tools add-on config from its config.json, or from meta.json (user config under "config")."""
+    data = _read_json(path)
+    if isinstance(data, dict) and isinstance(data.get("config"), dict):
+        data = data["config"]
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a JSON object")
+    return data
+
+
+def _write_json(path: str, value: Any, indent: int | None = None, rss=None) -> int:
+    text = json.dumps(value, ensure_ascii=False, indent=indent)
+    data = text.encode("utf-8")
+    if rss is not None:
+        # both copies are alive here; the sampler thread can't run during json.dumps
+        rss.sample()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as handle:
+        handle.write(data)
+    return len(data)
+
+
+def _peak_rss_kb() -> int | None:
+    # lifetime peak of this process, which here is just the one build
+    if resource is None:
+        return None
+    try:
+        peak = int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    except Exception:
+        return None
+    # macOS reports bytes, Linux/BSD KiB
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _profile_summary(profile, limit: int) -> list[str]:
+    import pstats
+
+    buf = io.StringIO()
+    stats = pstats.Stats(profile, stream=buf)
+    stats.sort_stats("cumulative").print_stats(limit)
+    return [line for line in buf.getvalue().splitlines() if line.strip()]
+
+
+def _tracemalloc_summary(snapshot, limit: int) -> list[str]:
+    return [str(stat) for stat in snapshot.statistics("lineno")[:limit]]
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    if args.vendor and args.vendor not in sys.path:
+        # same fallback the add-on uses for fugashi: the tools add-on's vendor dir
+        sys.path.insert(0, args.vendor)
+
+    logger = _addon_module("logger")
+    graph_config = _addon_module("graph_config")
+    graph_data = _addon_module("graph_data")
+    graph_web_bundle = _addon_module("graph_web_bundle")
+    from anki.collection import Collection
+
+    logger.set_enabled(bool(args.debug))
+    tools_cfg = load_tools_config(args.tools_config)
+    graph_cfg = graph_config.load_graph_config(args.graph_config)
+
+    report: dict[str, Any] = {
+        "collection": os.path.abspath(args.collection),
+        "graph_config": os.path.abspath(args.graph_config) if args.graph_config else graph_config.CONFIG_PATH,
+    }
+
+    t_open = time.perf_counter()
+    col = Collection(args.collection)
+    report["open_ms"] = round((time.perf_counter() - t_open) * 1000.0, 2)
+    profile = None
+    try:
+        if args.tracemalloc:
+            import tracemalloc
+
+            tracemalloc.start(args.tracemalloc_frames)
+        if args.cprofile:
+            import cProfile
+
+            profile = cProfile.Profile()
+            profile.enable()
+        t0 = time.perf_counter()
+        try:
+            result = graph_data.build_graph(col, tools_cfg=tools_cfg, graph_cfg=graph_cfg)
+        finally:
+            build_ms = (time.perf_counter() - t0) * 1000.0
+            if profile is not None:
+                profile.disable()
+        report["build_ms"] = round(build_ms, 2)
+        if args.tracemalloc:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            report["tracemalloc"] = {
+                "current_bytes": current,
+                "peak_bytes": peak,
+                "top": _tracemalloc_summary(snapshot, TRACEMALLOC_TOP),
+            }
+    finally:
+        col.close()
+        logger.flush()
+
+    # hub members never reach the webview; only their size is of interest here
+    hub_members = result.pop("hub_members", None) or {}
+    meta = result.get("meta") or {}
+    report["error"] = meta.get("error")
+    report["nodes"] = len(result.get("nodes") or [])
+    report["edges"] = len(result.get("edges") or [])
+    report["hubs"] = len(hub_members)
+    report["hub_member_nodes"] = sum(len(entry.get("nodes") or []) for entry in hub_members.values())
+    report["perf"] = meta.get("perf")
+    if args.out:
+        t_dump = time.perf_counter()
+        rss = graph_data.RssSampler().start()
+        try:
+            if meta.get("memory_bounded_build"):
+                os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+                report["payload_bytes"] = graph_web_bundle.stream_json(result, args.out)
+            else:
+                report["payload_bytes"] = _write_json(args.out, result, rss=rss)
+        finally:
+            rss.stop()
+        report["serialize_ms"] = round((time.perf_counter() - t_dump) * 1000.0, 2)
+        report["serialize_rss_peak_growth_kb"] = rss.peak_growth_kb()
+    # after serialisation, so it covers the payload copies as well as the build
+    report["peak_rss_kb"] = _peak_rss_kb()
+    if profile is not None:
+        profile.dump_stats(args.cprofile)
+        report["cprofile"] = {"path": os.path.abspath(args.cprofile), "top": _profile_summary(profile, PROFILE_TOP)}
+    return report
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Build the AJpC graph payload without the Anki GUI.")
+    parser.add_argument("collection", help="path to collection.anki2 (use a copy)")
+    parser.add_argument("--tools-config", required=True, help="AJpC Tools config.json or meta.json")
+    parser.add_argument("--graph-config", default=None, help="graph_config.json (default: the add-on's own)")
+    parser.add_argument("--out", default=None, help="write the payload JSON here")
+    parser.add_argument("--report", default=None, help="write the timing report here (default: stdout)")
+    parser.add_argument("--cprofile", default=None, help="capture cProfile stats into this .prof file")
+    parser.add_argument("--tracemalloc", action="store_true", help="record allocation peak and top sites")
+    parser.add_argument("--tracemalloc-frames", type=int, default=1, help="frames kept per allocation")
+    parser.add_argument("--vendor", default=None, help="extra import path (e.g. the tools add-on's vendor dir)")
+    parser.add_argument("--debug", action="store_true", help="enable the add-on debug log during the build")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parser().parse_args(argv)
+    report = run(args)
+    if args.report:
+        _write_json(args.report, report, indent=2)
+    else:
+        sys.stdout.write(json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+    return 1 if report.get("error") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
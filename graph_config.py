@@ -99,6 +99,11 @@ DEFAULT_CFG: dict[str, Any] = {
         "sigma_side_margin": 0.0,
         "sigma_animations_time": 180.0,
         "sigma_enable_edge_hovering": False,
+        "sigma_lod_enabled": True,
+        "sigma_lod_far_zoom": 0.35,
+        "sigma_lod_cull_zoom": 1.5,
+        "sigma_lod_cull_margin": 0.5,
+        "sigma_flow_fps": 30.0,
     },
     "node": {
         "node_degree_size_factor": 0.18,
@@ -142,6 +147,11 @@ DEFAULT_CFG: dict[str, Any] = {
     "card_dot_suspended_color": "#ef4444",
     "card_dot_buried_color": "#f59e0b",
     "card_dots_enabled": True,
+    "web_bundle": True,
+    "prebuild_on_profile_open": False,
+    "keep_window_warm": True,
+    "packed_styles": False,
+    "memory_bounded_build": False,
 }
 
 _SOLVER_BOOL_KEYS = {
@@ -159,6 +169,7 @@ _RENDERER_BOOL_KEYS = {
     "sigma_mouse_wheel_enabled",
     "sigma_double_click_enabled",
     "sigma_enable_edge_hovering",
+    "sigma_lod_enabled",
 }
 
 _NODE_BOOL_KEYS: set[str] = set()
@@ -335,14 +346,25 @@ def _normalize(cfg: dict[str, Any]) -> dict[str, Any]:
         cfg["kanji_top_k"] = DEFAULT_CFG["kanji_top_k"]
     if not isinstance(cfg.get("kanji_quantile_norm"), bool):
         cfg["kanji_quantile_norm"] = DEFAULT_CFG["kanji_quantile_norm"]
+    if not isinstance(cfg.get("web_bundle"), bool):
+        cfg["web_bundle"] = DEFAULT_CFG["web_bundle"]
+    if not isinstance(cfg.get("prebuild_on_profile_open"), bool):
+        cfg["prebuild_on_profile_open"] = DEFAULT_CFG["prebuild_on_profile_open"]
+    if not isinstance(cfg.get("keep_window_warm"), bool):
+        cfg["keep_window_warm"] = DEFAULT_CFG["keep_window_warm"]
+    if not isinstance(cfg.get("packed_styles"), bool):
+        cfg["packed_styles"] = DEFAULT_CFG["packed_styles"]
+    if not isinstance(cfg.get("memory_bounded_build"), bool):
+        cfg["memory_bounded_build"] = DEFAULT_CFG["memory_bounded_build"]
     return cfg
 
 
-def load_graph_config() -> dict[str, Any]:
-    if not os.path.exists(CONFIG_PATH):
+def load_graph_config(path: str | None = None) -> dict[str, Any]:
+    path = path or CONFIG_PATH
+    if not os.path.exists(path):
         return DEFAULT_CFG.copy()
     try:
-        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+        with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
         if not isinstance(data, dict):
             return DEFAULT_CFG.copy()
@@ -1,18 +1,33 @@
 from __future__ import annotations
 
+import bisect
 import json
 import html
+import math
 import os
 import re
 import sys
+import threading
+import time
+import tracemalloc
 import unicodedata
 from typing import Any, Iterable
 
-from aqt import mw
+try:
+    import psutil
+except Exception:  # optional; Linux reads /proc/self/statm instead, elsewhere RSS is left out of meta.perf
+    psutil = None
+
 from anki.collection import Collection
 
+try:
+    from aqt import mw
+except Exception:  # headless builds (graph_build_cli.py) run without the GUI
+    mw = None
+
 from . import logger
 from .graph_config import load_graph_config
+from .graph_styles import layer_degrees, pack_styles
 
 _HTML_RE = re.compile(r"<.*?>", re.DOTALL)
 _FURIGANA_BR_RE = re.compile(r"\[[^\]]*\]")
@@ -24,20 +39,34 @@ _FORCE_NID_VAL_RE = re.compile(r"(\d+)")
 
 MAX_COMPONENT_DEPTH = 5
 MAX_DIRECT_FAMILY_MEMBERS = 80
+MST_LAYERS = ("note_links", "mass_links", "kanji")
+HUB_NODE_KINDS = ("family", "kanji_hub", "note_type_hub")
+HUB_SAMPLE_LABELS = 5
+HUB_PAGE_NODES = 500
+HUB_PAGE_EDGES = 2000
+RSS_SAMPLE_INTERVAL = 0.02
 
 _FUGASHI_TAGGER = None
 _FUGASHI_READY = False
 
 
-def _tools_vendor_path() -> str | None:
+_TOOLS_CFG_CACHE: dict[str, Any] | None = None
+_TOOLS_CFG_TOKEN: tuple[Any, ...] | None = None
+
+
+def _tools_config_getter():
     if mw is None:
-        return None
+        return None, None
     api = getattr(mw, "_ajpc_graph_api", None)
     if not isinstance(api, dict):
-        return None
+        return None, None
     getter = api.get("get_config")
     if not callable(getter):
-        return None
+        return api, None
+    return api, getter
+
+
+def _tools_addon_dir(getter) -> str | None:
     mod_name = str(getattr(getter, "__module__", "") or "").strip()
     if not mod_name:
         return None
@@ -45,22 +74,58 @@ def _tools_vendor_path() -> str | None:
     mod_file = str(getattr(mod, "__file__", "") or "").strip() if mod is not None else ""
     if not mod_file:
         return None
-    addon_dir = os.path.dirname(os.path.dirname(os.path.abspath(mod_file)))
+    return os.path.dirname(os.path.dirname(os.path.abspath(mod_file)))
+
+
+def _tools_vendor_path() -> str | None:
+    _api, getter = _tools_config_getter()
+    if getter is None:
+        return None
+    addon_dir = _tools_addon_dir(getter)
+    if not addon_dir:
+        return None
     vendor = os.path.join(addon_dir, "vendor")
     if os.path.isdir(vendor):
         return vendor
     return None
 
 
-def _get_tools_config() -> dict[str, Any] | None:
-    if mw is None:
-        return None
-    api = getattr(mw, "_ajpc_graph_api", None)
-    if not isinstance(api, dict):
+def _tools_config_token(api: dict[str, Any], getter) -> tuple[Any, ...] | None:
+    # A version counter from the API wins; otherwise the add-on config files' mtimes.
+    version = api.get("config_version")
+    if callable(version):
+        try:
+            version = version()
+        except Exception:
+            version = None
+    stamps: list[Any] = []
+    addon_dir = _tools_addon_dir(getter)
+    if addon_dir:
+        for name in ("meta.json", "config.json"):
+            try:
+                st = os.stat(os.path.join(addon_dir, name))
+                stamps.append((name, st.st_mtime_ns, st.st_size))
+            except OSError:
+                continue
+    if version is None and not stamps:
         return None
-    getter = api.get("get_config")
-    if not callable(getter):
+    return (version, *stamps)
+
+
+def invalidate_tools_config_cache() -> None:
+    global _TOOLS_CFG_CACHE, _TOOLS_CFG_TOKEN
+    _TOOLS_CFG_CACHE = None
+    _TOOLS_CFG_TOKEN = None
+
+
+def _get_tools_config() -> dict[str, Any] | None:
+    global _TOOLS_CFG_CACHE, _TOOLS_CFG_TOKEN
+    api, getter = _tools_config_getter()
+    if getter is None:
         return None
+    token = _tools_config_token(api, getter)
+    if token is not None and token == _TOOLS_CFG_TOKEN and _TOOLS_CFG_CACHE is not None:
+        return _TOOLS_CFG_CACHE
     try:
         cfg = getter(reload=True)
     except Exception:
@@ -70,6 +135,13 @@ def _get_tools_config() -> dict[str, Any] | None:
             cfg = None
     if isinstance(cfg, dict):
         logger.set_enabled(bool(cfg.get("debug_enabled", True)))
+        if cfg.get("debug_level"):
+            logger.set_level(cfg.get("debug_level"))
+        # without a change token every call re-reads, as before
+        _TOOLS_CFG_CACHE = cfg if token is not None else None
+        _TOOLS_CFG_TOKEN = token
+    else:
+        invalidate_tools_config_cache()
     return cfg
 
 
@@ -255,17 +327,78 @@ def _note_label(note, prefer_field: str | None = None) -> str:
     return f"Note {getattr(note, 'id', '')}"
 
 
-def _note_type_name(col: Collection, mid: int) -> str:
+# Notetype registry shared across builds; dropped on the notetype change flag or collection switch.
+_NOTETYPE_CACHE: dict[int, dict[str, Any] | None] = {}
+_NOTETYPE_IDS_BY_NAME: dict[str, str] | None = None
+_NOTETYPE_CACHE_COL: int | None = None
+
+
+def invalidate_notetype_cache() -> None:
+    global _NOTETYPE_CACHE, _NOTETYPE_IDS_BY_NAME
+    _NOTETYPE_CACHE = {}
+    _NOTETYPE_IDS_BY_NAME = None
+
+
+def _notetype_registry(col: Collection) -> dict[int, dict[str, Any] | None]:
+    global _NOTETYPE_CACHE_COL
+    if _NOTETYPE_CACHE_COL != id(col):
+        invalidate_notetype_cache()
+        _NOTETYPE_CACHE_COL = id(col)
+    return _NOTETYPE_CACHE
+
+
+def _notetype_info(col: Collection, mid: Any) -> dict[str, Any] | None:
     try:
-        model = col.models.get(mid)
-        if model and isinstance(model, dict):
-            return str(model.get("name", mid))
+        mid_int = int(mid)
     except Exception:
-        pass
+        return None
+    registry = _notetype_registry(col)
+    if mid_int in registry:
+        return registry[mid_int]
+    try:
+        model = col.models.get(mid_int)
+    except Exception:
+        model = None
+    info: dict[str, Any] | None = None
+    if model and isinstance(model, dict):
+        fields: list[str] = []
+        try:
+            fields = [str(f.get("name", "")) for f in (model.get("flds") or []) if f.get("name")]
+        except Exception:
+            fields = []
+        templates: list[str] = []
+        tmpl_by_ord: dict[int, str] = {}
+        for idx, tmpl in enumerate(model.get("tmpls") or []):
+            if not isinstance(tmpl, dict):
+                continue
+            name = str(tmpl.get("name", "")).strip()
+            if not name:
+                continue
+            templates.append(name)
+            try:
+                ord_val = int(tmpl.get("ord", idx))
+            except Exception:
+                ord_val = idx
+            tmpl_by_ord[ord_val] = name
+        info = {
+            "name": str(model.get("name", mid_int)),
+            "fields": fields,
+            "templates": templates,
+            "tmpl_by_ord": tmpl_by_ord,
+        }
+    registry[mid_int] = info
+    return info
+
+
+def _note_type_name(col: Collection, mid: int) -> str:
+    info = _notetype_info(col, mid)
+    if info:
+        return info["name"]
     return str(mid)
 
 
 def _resolve_note_type_id(col: Collection, raw: Any) -> str:
+    global _NOTETYPE_IDS_BY_NAME
     try:
         s = str(raw).strip()
     except Exception:
@@ -274,13 +407,18 @@ def _resolve_note_type_id(col: Collection, raw: Any) -> str:
         return ""
     if s.isdigit():
         return s
-    try:
-        for info in col.models.all_names_and_ids():
-            if str(info.get("name", "")) == s:
-                return str(info.get("id"))
-    except Exception:
-        pass
-    return s
+    _notetype_registry(col)
+    ids_by_name = _NOTETYPE_IDS_BY_NAME
+    if ids_by_name is None:
+        ids_by_name = {}
+        try:
+            for info in col.models.all_names_and_ids():
+                name = str(getattr(info, "name", None) or info.get("name", ""))
+                ids_by_name.setdefault(name, str(getattr(info, "id", None) or info.get("id")))
+        except Exception:
+            pass
+        _NOTETYPE_IDS_BY_NAME = ids_by_name
+    return ids_by_name.get(s, s)
 
 
 def _normalize_note_type_map(col: Collection, cfg_map: Any) -> dict[str, Any]:
@@ -341,26 +479,10 @@ def _extract_stability(value: Any, memory_state: Any) -> float | None:
 
 
 def _card_template_name_map(col: Collection, mid: int) -> dict[int, str]:
-    out: dict[int, str] = {}
-    try:
-        model = col.models.get(int(mid))
-    except Exception:
-        model = None
-    if not isinstance(model, dict):
-        return out
-    tmpls = model.get("tmpls") or []
-    for idx, tmpl in enumerate(tmpls):
-        if not isinstance(tmpl, dict):
-            continue
-        name = str(tmpl.get("name", "")).strip()
-        if not name:
-            continue
-        try:
-            ord_val = int(tmpl.get("ord", idx))
-        except Exception:
-            ord_val = idx
-        out[ord_val] = name
-    return out
+    info = _notetype_info(col, mid)
+    if not info:
+        return {}
+    return info["tmpl_by_ord"]
 
 
 def _build_card_map(col: Collection, nids: list[int]) -> dict[int, list[dict[str, Any]]]:
@@ -474,17 +596,91 @@ def _note_ids_for_query(col: Collection, q: str) -> list[int]:
         return []
 
 
-def _note_ids_for_deck(col: Collection, deck_name: str) -> list[int]:
+def _deck_ids_with_children(col: Collection, deck_names: Iterable[str]) -> list[int]:
+    out: set[int] = set()
+    for deck_name in deck_names:
+        deck_name = str(deck_name or "").strip()
+        if not deck_name:
+            continue
+        try:
+            did = col.decks.id_for_name(deck_name)
+        except Exception:
+            did = None
+        if not did:
+            continue
+        try:
+            out.update(int(x) for x in col.decks.deck_and_child_ids(did))
+        except Exception:
+            out.add(int(did))
+            try:
+                out.update(int(child_id) for _name, child_id in col.decks.children(did))
+            except Exception:
+                pass
+    return sorted(out)
+
+
+def _deck_filter_sql(deck_ids: list[int]) -> str:
+    # cards moved into a filtered deck still count for their home deck, like deck:"..."
+    id_list = "(" + ",".join(str(int(x)) for x in deck_ids) + ")"
+    return f"(did in {id_list} or odid in {id_list})"
+
+
+def _note_ids_for_decks(col: Collection, deck_ids: list[int]) -> list[int]:
+    if not deck_ids:
+        return []
+    try:
+        return list(col.db.list(f"select distinct nid from cards where {_deck_filter_sql(deck_ids)}"))
+    except Exception:
+        return []
+
+
+def _note_ids_for_deck(
+    col: Collection, deck_name: str, allowed_deck_ids: list[int] | None = None
+) -> list[int]:
     if not deck_name:
         return []
-    dn = (deck_name or "").replace("\\", "\\\\").replace('"', '\\"')
-    return _note_ids_for_query(col, f'deck:"{dn}"')
+    deck_ids = _deck_ids_with_children(col, [deck_name])
+    if not deck_ids:
+        return []
+    if allowed_deck_ids is None:
+        return sorted(_note_ids_for_decks(col, deck_ids))
+    if not allowed_deck_ids:
+        return []
+    try:
+        return list(
+            col.db.list(
+                f"select distinct nid from cards where {_deck_filter_sql(deck_ids)} "
+                f"and nid in (select nid from cards where {_deck_filter_sql(allowed_deck_ids)}) order by nid"
+            )
+        )
+    except Exception:
+        return []
 
 
-def _note_ids_for_mid(col: Collection, mid: str) -> list[int]:
+def _note_ids_for_mid(col: Collection, mid: str, allowed_deck_ids: list[int] | None = None) -> list[int]:
     if not mid:
         return []
-    return _note_ids_for_query(col, f"mid:{mid}")
+    try:
+        mid_int = int(mid)
+    except Exception:
+        return []
+    if allowed_deck_ids is None:
+        try:
+            return list(col.db.list("select id from notes where mid = ? order by id", mid_int))
+        except Exception:
+            return _note_ids_for_query(col, f"mid:{mid}")
+    if not allowed_deck_ids:
+        return []
+    try:
+        return list(
+            col.db.list(
+                "select id from notes where mid = ? and id in "
+                f"(select nid from cards where {_deck_filter_sql(allowed_deck_ids)}) order by id",
+                mid_int,
+            )
+        )
+    except Exception:
+        return []
 
 
 def _build_kanji_maps(
@@ -494,16 +690,14 @@ def _build_kanji_maps(
     kanji_alt_field: str,
     radical_mid: str,
     radical_field: str,
-    allowed_nids: set[int] | None = None,
+    allowed_deck_ids: list[int] | None = None,
 ) -> tuple[dict[str, list[int]], dict[str, list[int]], dict[int, list[str]]]:
     kanji_map: dict[str, list[int]] = {}
     radical_map: dict[str, list[int]] = {}
     kanji_components: dict[int, list[str]] = {}
 
     if kanji_mid and kanji_field:
-        for nid in _note_ids_for_mid(col, kanji_mid):
-            if allowed_nids is not None and nid not in allowed_nids:
-                continue
+        for nid in _note_ids_for_mid(col, kanji_mid, allowed_deck_ids):
             try:
                 note = col.get_note(nid)
             except Exception:
@@ -526,15 +720,411 @@ def _build_kanji_maps(
     return kanji_map, radical_map, kanji_components
 
 
-def build_graph(col: Collection) -> dict[str, Any]:
-    cfg = _get_tools_config()
+def _rank_vocab_kanji(
+    vocab_chars: dict[int, list[str]],
+    tfidf_enabled: bool,
+    top_k: int,
+    quantile_norm: bool,
+) -> dict[int, list[tuple[str, float | None]]]:
+    """Pick and weight the kanji each vocab note links to.
+
+    Scores are tf * idf over the vocab notes in ``vocab_chars`` (idf smoothed as
+    log(1 + N / df) so no kanji scores zero). ``top_k`` > 0 keeps the k best
+    scoring kanji per note. Weights are only emitted with ``tfidf_enabled``,
+    scaled into (0, 1] by the global maximum or, with ``quantile_norm``, by
+    their quantile rank across all kept kanji edges.
+    """
+    if not tfidf_enabled and top_k <= 0:
+        return {nid: [(ch, None) for ch in chars] for nid, chars in vocab_chars.items()}
+    doc_freq: dict[str, int] = {}
+    for chars in vocab_chars.values():
+        for ch in set(chars):
+            doc_freq[ch] = doc_freq.get(ch, 0) + 1
+    total_docs = max(1, len(vocab_chars))
+    idf = {ch: math.log(1.0 + total_docs / df) for ch, df in doc_freq.items()}
+
+    ranked: dict[int, list[tuple[str, float]]] = {}
+    for nid, chars in vocab_chars.items():
+        if not chars:
+            continue
+        counts: dict[str, int] = {}
+        for ch in chars:
+            counts[ch] = counts.get(ch, 0) + 1
+        scored = [(ch, (cnt / len(chars)) * idf.get(ch, 0.0)) for ch, cnt in counts.items()]
+        if top_k > 0 and len(scored) > top_k:
+            keep = {ch for ch, _score in sorted(scored, key=lambda item: -item[1])[:top_k]}
+            scored = [item for item in scored if item[0] in keep]
+        ranked[nid] = scored
+
+    if not tfidf_enabled:
+        return {nid: [(ch, None) for ch, _score in items] for nid, items in ranked.items()}
+
+    scores = sorted(score for items in ranked.values() for _ch, score in items)
+    if not scores:
+        return {}
+    if quantile_norm:
+        count = len(scores)
+
+        def _norm(score: float) -> float:
+            return bisect.bisect_right(scores, score) / count
+
+    else:
+        top = scores[-1] if scores[-1] > 0 else 1.0
+
+        def _norm(score: float) -> float:
+            return score / top
+
+    return {
+        nid: [(ch, round(_norm(score), 4)) for ch, score in items]
+        for nid, items in ranked.items()
+    }
+
+
+def _mark_spanning_forest(edges: list[dict[str, Any]], layers: Iterable[str]) -> tuple[int, int]:
+    """Keep a minimum spanning forest per layer as the solver backbone.
+
+    Kruskal over each layer in ``layers`` with a union-find (path halving,
+    union by size). Cost prefers manual links, then higher build-time weight;
+    ties keep payload order. Kept edges get ``meta.structural``, the rest
+    ``meta.render_only``. Flow-only reverse edges follow their visible twin.
+    Returns (kept, demoted).
+    """
+    wanted = set(layers)
+    by_layer: dict[str, list[int]] = {}
+    for idx, e in enumerate(edges):
+        layer = str(e.get("layer") or "")
+        if layer not in wanted or (e.get("meta") or {}).get("flow_only"):
+            continue
+        by_layer.setdefault(layer, []).append(idx)
+
+    def _cost(idx: int) -> tuple[int, float]:
+        meta = edges[idx].get("meta") or {}
+        try:
+            weight = float(meta.get("weight", 1.0))
+        except Exception:
+            weight = 1.0
+        return (0 if meta.get("manual") else 1, -weight)
+
+    kept = 0
+    demoted = 0
+    structural_pairs: set[tuple[str, str, str]] = set()
+    for layer, idxs in by_layer.items():
+        node_index: dict[str, int] = {}
+        parent: list[int] = []
+        size: list[int] = []
+
+        def _slot(node_id: str) -> int:
+            slot = node_index.get(node_id)
+            if slot is None:
+                slot = len(parent)
+                node_index[node_id] = slot
+                parent.append(slot)
+                size.append(1)
+            return slot
+
+        def _find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for idx in sorted(idxs, key=_cost):
+            e = edges[idx]
+            src = str(e.get("source"))
+            dst = str(e.get("target"))
+            meta = dict(e.get("meta") or {})
+            ra = _find(_slot(src))
+            rb = _find(_slot(dst))
+            if ra != rb:
+                if size[ra] < size[rb]:
+                    ra, rb = rb, ra
+                parent[rb] = ra
+                size[ra] += size[rb]
+                meta["structural"] = True
+                meta.pop("render_only", None)
+                structural_pairs.add((layer, src, dst))
+                kept += 1
+            else:
+                meta["render_only"] = True
+                meta.pop("structural", None)
+                demoted += 1
+            e["meta"] = meta
+
+    for e in edges:
+        meta = e.get("meta") or {}
+        layer = str(e.get("layer") or "")
+        if layer not in wanted or not meta.get("flow_only"):
+            continue
+        meta = dict(meta)
+        if (layer, str(e.get("target")), str(e.get("source"))) in structural_pairs:
+            meta["structural"] = True
+        else:
+            meta["render_only"] = True
+        e["meta"] = meta
+    return kept, demoted
+
+
+def _apply_link_damping(
+    edge_lists: Iterable[list[dict[str, Any]]],
+    nodes: dict[str, dict[str, Any]],
+    hub_damping: bool,
+    reference_damping: bool,
+) -> int:
+    """Scale link strength by endpoint degree into ``meta.strength``.
+
+    ``hub_damping`` scales edges touching a hub node (family, kanji hub,
+    note type hub) by 1 / sqrt(hub degree). ``reference_damping`` scales
+    note_links edges by 1 / sqrt(max endpoint reference degree). Both factors
+    multiply. Returns the number of damped edges.
+    """
+    lists = [lst for lst in edge_lists if lst]
+    hub_ids = {nid for nid, n in nodes.items() if n.get("kind") in HUB_NODE_KINDS} if hub_damping else set()
+    hub_deg: dict[str, int] = {}
+    ref_deg: dict[str, int] = {}
+    seen_pairs: set[tuple[str, str, str]] = set()
+    for lst in lists:
+        for e in lst:
+            meta = e.get("meta") or {}
+            if meta.get("flow_only"):
+                continue
+            src = str(e.get("source"))
+            dst = str(e.get("target"))
+            layer = str(e.get("layer") or "")
+            if hub_ids and (src in hub_ids or dst in hub_ids):
+                # family hub edges exist in a direct and a chain variant; count each pair once
+                pair = (layer, src, dst)
+                if pair not in seen_pairs:
+                    seen_pairs.add(pair)
+                    if src in hub_ids:
+                        hub_deg[src] = hub_deg.get(src, 0) + 1
+                    if dst in hub_ids:
+                        hub_deg[dst] = hub_deg.get(dst, 0) + 1
+            if reference_damping and layer == "note_links":
+                ref_deg[src] = ref_deg.get(src, 0) + 1
+                ref_deg[dst] = ref_deg.get(dst, 0) + 1
+
+    damped = 0
+    for lst in lists:
+        for e in lst:
+            src = str(e.get("source"))
+            dst = str(e.get("target"))
+            factor = 1.0
+            if hub_ids:
+                deg = max(hub_deg.get(src, 0), hub_deg.get(dst, 0))
+                if deg > 1:
+                    factor /= math.sqrt(deg)
+            if reference_damping and str(e.get("layer") or "") == "note_links":
+                deg = max(ref_deg.get(src, 0), ref_deg.get(dst, 0))
+                if deg > 1:
+                    factor /= math.sqrt(deg)
+            if factor >= 1.0:
+                continue
+            e["meta"] = {**(e.get("meta") or {}), "strength": round(factor, 4)}
+            damped += 1
+    return damped
+
+
+_PSUTIL_PROC = None
+
+
+def _current_rss_kb() -> int | None:
+    """Current resident set size of this process in KiB (None where unsupported)."""
+    global _PSUTIL_PROC
+    if psutil is not None:
+        try:
+            if _PSUTIL_PROC is None:
+                _PSUTIL_PROC = psutil.Process()
+            return int(_PSUTIL_PROC.memory_info().rss) // 1024
+        except Exception:
+            pass
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as handle:
+            pages = int(handle.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except Exception:
+        return None
+
+
+class RssSampler:
+    """RSS high-water mark (KiB) between start() and stop(), relative to the RSS at start().
+
+    A daemon thread samples every RSS_SAMPLE_INTERVAL; sample() adds a reading by hand
+    after a call that holds the GIL for long (json.dumps). The Anki process' lifetime
+    peak (ru_maxrss) says nothing about one build, hence the delta.
+    """
+
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.start_kb: int | None = None
+        self.peak_kb = 0
+        self._window_peak = 0
+        self._last = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "RssSampler":
+        self.start_kb = _current_rss_kb()
+        if self.start_kb is None:
+            return self
+        self.peak_kb = self._window_peak = self._last = self.start_kb
+        self._thread = threading.Thread(target=self._run, name="ajpc-graph-rss", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        if self.start_kb is None:
+            return
+        rss = _current_rss_kb()
+        if rss is None:
+            return
+        with self._lock:
+            self._last = rss
+            if rss > self.peak_kb:
+                self.peak_kb = rss
+            if rss > self._window_peak:
+                self._window_peak = rss
+
+    def window(self) -> tuple[int, int] | None:
+        """(current, peak since the previous window()) growth over start, then open a new window."""
+        self.sample()
+        if self.start_kb is None:
+            return None
+        with self._lock:
+            current, peak = self._last, self._window_peak
+            self._window_peak = self._last
+        return current - self.start_kb, peak - self.start_kb
+
+    def peak_growth_kb(self) -> int | None:
+        self.sample()
+        return None if self.start_kb is None else self.peak_kb - self.start_kb
+
+    def stop(self) -> None:
+        self.sample()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+
+class _BuildProfiler:
+    """Per-gate wall time, counters and memory for build_graph, returned as meta.perf.
+
+    Memory comes from the build's RssSampler: growth over the build start at each gate end
+    and the highest growth seen inside the gate.
+    """
+
+    def __init__(self, snapshot, measure_bytes: bool = False, rss: RssSampler | None = None) -> None:
+        # snapshot() -> (nodes dict, tuple of edge lists); read at gate boundaries
+        self._snapshot = snapshot
+        self.measure_bytes = bool(measure_bytes)
+        self.notes_read = 0
+        self.gates: list[dict[str, Any]] = []
+        self._t_start = time.perf_counter()
+        self._open: tuple[str, float, int, int, list[int]] | None = None
+        self._rss = rss
+
+    def begin(self, gate: str) -> None:
+        self.end()
+        nodes, edge_lists = self._snapshot()
+        if self._rss is not None:
+            self._rss.window()
+        self._open = (gate, time.perf_counter(), self.notes_read, len(nodes), [len(x) for x in edge_lists])
+
+    def end(self, extra: Any = None) -> None:
+        if self._open is None:
+            return
+        gate, t0, notes0, nodes0, sizes0 = self._open
+        self._open = None
+        ms = (time.perf_counter() - t0) * 1000.0
+        nodes, edge_lists = self._snapshot()
+        entry: dict[str, Any] = {
+            "gate": gate,
+            "ms": round(ms, 2),
+            "notes": self.notes_read - notes0,
+            "nodes": len(nodes) - nodes0,
+            "edges": sum(len(x) for x in edge_lists) - sum(sizes0),
+        }
+        if self.measure_bytes:
+            size = 0
+            try:
+                for lst, n0 in zip(edge_lists, sizes0):
+                    if len(lst) > n0:
+                        size += _json_size(lst[n0:])
+                if len(nodes) > nodes0:
+                    size += _json_size(list(nodes.values())[nodes0:])
+                if extra is not None:
+                    size += _json_size(extra)
+            except Exception:
+                pass
+            entry["bytes"] = size
+        window = self._rss.window() if self._rss is not None else None
+        if window is not None:
+            entry["rss_growth_kb"], entry["rss_peak_growth_kb"] = window
+        if tracemalloc.is_tracing():
+            # read only: the peak counter belongs to whoever started tracing
+            entry["traced_kb"] = tracemalloc.get_traced_memory()[0] // 1024
+        self.gates.append(entry)
+
+    def summary(self) -> dict[str, Any]:
+        self.end()
+        out: dict[str, Any] = {
+            "total_ms": round((time.perf_counter() - self._t_start) * 1000.0, 2),
+            "notes": self.notes_read,
+            "gates": self.gates,
+        }
+        if self._rss is not None and self._rss.start_kb is not None:
+            out["rss_start_kb"] = self._rss.start_kb
+            out["rss_peak_growth_kb"] = self._rss.peak_growth_kb()
+        if tracemalloc.is_tracing():
+            out["traced_peak_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+        return out
+
+
+def _meta_fingerprint(meta: dict[str, Any]) -> Any:
+    """Key-order-insensitive hashable key for an edge meta dict; JSON only for unhashable values."""
+    try:
+        return frozenset(meta.items())
+    except TypeError:
+        return json.dumps(meta, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def _json_size(value: Any) -> int:
+    return len(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def build_graph(
+    col: Collection,
+    tools_cfg: dict[str, Any] | None = None,
+    graph_cfg: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    rss = RssSampler().start()
+    try:
+        return _build_graph(col, tools_cfg, graph_cfg, rss)
+    finally:
+        rss.stop()
+
+
+def _build_graph(
+    col: Collection,
+    tools_cfg: dict[str, Any] | None,
+    graph_cfg: dict[str, Any] | None,
+    rss: RssSampler,
+) -> dict[str, Any]:
+    # explicit configs replace the live add-on lookups (headless builds)
+    cfg = tools_cfg if tools_cfg is not None else _get_tools_config()
     if not cfg:
         logger.dbg("config missing: _ajpc_graph_api unavailable")
         return {"nodes": [], "edges": [], "meta": {"error": "missing_tools_config"}}
     debug_enabled = bool(cfg.get("debug_enabled", False)) if isinstance(cfg, dict) else False
     debug_mode = str(cfg.get("debug_mode") or "").strip().lower() if isinstance(cfg, dict) else ""
 
-    graph_cfg = load_graph_config()
+    if graph_cfg is None:
+        graph_cfg = load_graph_config()
     label_fields = _normalize_note_type_map(col, graph_cfg.get("note_type_label_fields") or {})
     linked_fields = _normalize_note_type_map(col, graph_cfg.get("note_type_linked_fields") or {})
     tooltip_fields = _normalize_note_type_map(col, graph_cfg.get("note_type_tooltip_fields") or {})
@@ -582,6 +1172,7 @@ def build_graph(col: Collection) -> dict[str, Any]:
     except Exception:
         kanji_top_k = 0
     kanji_quantile_norm = bool(graph_cfg.get("kanji_quantile_norm", False))
+    kanji_rank_top_k = max(0, kanji_top_k) if kanji_top_k_enabled else 0
     kanji_hubs = bool(graph_cfg.get("kanji_hubs", True))
     kanji_components_enabled = bool(graph_cfg.get("kanji_components_enabled", True))
     kanji_component_style = str(graph_cfg.get("kanji_component_style") or "solid")
@@ -599,8 +1190,11 @@ def build_graph(col: Collection) -> dict[str, Any]:
         graph_cfg.get("card_dot_buried_color") or "#f59e0b"
     )
     card_dots_enabled = bool(graph_cfg.get("card_dots_enabled", True))
+    memory_bounded = bool(graph_cfg.get("memory_bounded_build", False))
+    # bounded builds share one string per node id between the node and all its edge endpoints
+    node_key = sys.intern if memory_bounded else str
 
-    logger.dbg("build_graph start")
+    logger.dbg("build_graph start", "memory_bounded=", memory_bounded)
     nodes: dict[str, dict[str, Any]] = {}
     edges: list[dict[str, Any]] = []
     family_edges_direct: list[dict[str, Any]] = []
@@ -609,21 +1203,22 @@ def build_graph(col: Collection) -> dict[str, Any]:
     family_hub_edges_chain: list[dict[str, Any]] = []
     hub_members: dict[str, dict[str, Any]] = {}
     autolink_tags: dict[str, set[int]] = {}
+    # bytes are only measured with debug on (they cost an extra serialization per gate)
+    profiler = _BuildProfiler(
+        lambda: (nodes, (edges, family_edges_direct, family_edges_chain, family_hub_edges_direct, family_hub_edges_chain)),
+        measure_bytes=debug_enabled,
+        rss=rss,
+    )
 
+    # Deck selection is resolved once to deck ids (with children); gate queries join on it in SQL.
+    allowed_deck_ids: list[int] | None = None
     allowed_nids: set[int] | None = None
     if isinstance(selected_decks, list) and selected_decks:
-        allowed_nids = set()
-        for deck_name in selected_decks:
-            deck_name = str(deck_name or "").strip()
-            if not deck_name:
-                continue
-            allowed_nids.update(_note_ids_for_deck(col, deck_name))
-        logger.dbg("deck filter", "decks=", len(selected_decks), "notes=", len(allowed_nids))
-
-    def _filter_nids(nids: list[int]) -> list[int]:
-        if allowed_nids is None:
-            return nids
-        return [nid for nid in nids if nid in allowed_nids]
+        allowed_deck_ids = _deck_ids_with_children(col, selected_decks)
+        allowed_nids = set(_note_ids_for_decks(col, allowed_deck_ids))
+        logger.dbg(
+            "deck filter", "decks=", len(selected_decks), "deck_ids=", len(allowed_deck_ids), "notes=", len(allowed_nids)
+        )
 
     def _note_extra(note) -> list[dict[str, str]]:
         extra: list[dict[str, str]] = []
@@ -640,9 +1235,20 @@ def build_graph(col: Collection) -> dict[str, Any]:
             extra.append({"name": fname, "value": val})
         return extra
 
+    def release(*scratch: Any) -> None:
+        # bounded builds drop a gate's lookup tables once the gate is done with them
+        if not memory_bounded:
+            return
+        for table in scratch:
+            try:
+                table.clear()
+            except Exception:
+                pass
+
     def ensure_node(node_id: str, **kwargs: Any) -> None:
         n = nodes.get(node_id)
         if n is None:
+            node_id = node_key(node_id)
             base = {"id": node_id}
             base.update(kwargs)
             nodes[node_id] = base
@@ -668,18 +1274,61 @@ def build_graph(col: Collection) -> dict[str, Any]:
     def add_edge(src: str, dst: str, layer: str, **meta: Any) -> None:
         if src == dst:
             return
-        edges.append({"source": src, "target": dst, "layer": layer, "meta": meta})
+        edges.append({"source": node_key(src), "target": node_key(dst), "layer": layer, "meta": meta})
+
+    # Reference (manual) links keyed by packed note id pair; low bits record seen directions.
+    ref_edge_slots: dict[int, int] = {}
+    ref_edge_dirs: dict[int, int] = {}
+
+    def add_reference_edge(src_nid: int, dst_nid: int, label: str) -> bool:
+        if src_nid == dst_nid:
+            return False
+        a, b = (src_nid, dst_nid) if src_nid < dst_nid else (dst_nid, src_nid)
+        key = (a << 64) | b
+        direction = 1 if src_nid == a else 2
+        seen = ref_edge_dirs.get(key, 0)
+        if seen & direction:
+            return False
+        ref_edge_dirs[key] = seen | direction
+        if not seen:
+            ref_edge_slots[key] = len(edges)
+            edges.append(
+                {
+                    "source": node_key(str(src_nid)),
+                    "target": node_key(str(dst_nid)),
+                    "layer": "note_links",
+                    "meta": {"label": label, "manual": True},
+                }
+            )
+            return True
+        # second direction: one visible edge plus a flow-only reverse on the same line
+        visible = edges[ref_edge_slots[key]]
+        vmeta = visible["meta"]
+        vmeta["bidirectional"] = True
+        edges.append(
+            {
+                "source": visible["target"],
+                "target": visible["source"],
+                "layer": "note_links",
+                "meta": {**vmeta, "flow_only": True},
+            }
+        )
+        return True
+
+    def read_note(nid: int):
+        profiler.notes_read += 1
+        return col.get_note(nid)
 
     def add_family_edge(
         bucket: list[dict[str, Any]], src: str, dst: str, layer: str, **meta: Any
     ) -> None:
         if src == dst:
             return
-        bucket.append({"source": src, "target": dst, "layer": layer, "meta": meta})
+        bucket.append({"source": node_key(src), "target": node_key(dst), "layer": layer, "meta": meta})
 
     def resolve_note_id(raw_id: int) -> int | None:
         try:
-            note = col.get_note(raw_id)
+            note = read_note(raw_id)
             if note:
                 return int(note.id)
         except Exception:
@@ -693,6 +1342,7 @@ def build_graph(col: Collection) -> dict[str, Any]:
         return None
 
     # Family Gate (direct + hub)
+    profiler.begin("family")
     fg = cfg.get("family_gate", {})
     if fg.get("enabled"):
         family_field = str(fg.get("family_field") or "")
@@ -704,11 +1354,11 @@ def build_graph(col: Collection) -> dict[str, Any]:
         family_groups: dict[str, list[tuple[int, int]]] = {}
 
         for nt_id in note_types.keys():
-            nids = _filter_nids(_note_ids_for_mid(col, str(nt_id)))
+            nids = _note_ids_for_mid(col, str(nt_id), allowed_deck_ids)
             logger.dbg("family_gate note_type", nt_id, "notes=", len(nids))
             for nid in nids:
                 try:
-                    note = col.get_note(nid)
+                    note = read_note(nid)
                 except Exception:
                     continue
                 if family_field not in note:
@@ -896,8 +1546,10 @@ def build_graph(col: Collection) -> dict[str, Any]:
                                 fid=fid,
                                 same_prio=False,
                             )
+        release(family_groups)
 
     # Example Gate
+    profiler.begin("example")
     eg = cfg.get("example_gate", {})
     if eg.get("enabled"):
         vocab_deck = str(eg.get("vocab_deck") or "")
@@ -908,9 +1560,9 @@ def build_graph(col: Collection) -> dict[str, Any]:
         vocab_index: dict[str, list[int]] = {}
         vocab_by_nid: dict[int, str] = {}
         if vocab_deck and key_field:
-            for nid in _filter_nids(_note_ids_for_deck(col, vocab_deck)):
+            for nid in _note_ids_for_deck(col, vocab_deck, allowed_deck_ids):
                 try:
-                    note = col.get_note(nid)
+                    note = read_note(nid)
                 except Exception:
                     continue
                 if key_field not in note:
@@ -932,9 +1584,9 @@ def build_graph(col: Collection) -> dict[str, Any]:
 
         logger.dbg("example_gate vocab keys", len(vocab_index))
         if example_deck and key_field:
-            for nid in _filter_nids(_note_ids_for_deck(col, example_deck)):
+            for nid in _note_ids_for_deck(col, example_deck, allowed_deck_ids):
                 try:
-                    note = col.get_note(nid)
+                    note = read_note(nid)
                 except Exception:
                     continue
 
@@ -982,8 +1634,10 @@ def build_graph(col: Collection) -> dict[str, Any]:
                     key=vocab_by_nid.get(int(source_nid), ""),
                     lookup=lookup_reason,
                 )
+        release(vocab_index, vocab_by_nid)
 
     # Kanji Gate
+    profiler.begin("kanji")
     kg = cfg.get("kanji_gate", {})
     if kg.get("enabled"):
         kanji_mid = _resolve_note_type_id(col, kg.get("kanji_note_type") or "")
@@ -1000,9 +1654,9 @@ def build_graph(col: Collection) -> dict[str, Any]:
             radical_pairs: list[tuple[str, str]] = []
 
             if kanji_mid and kanji_field:
-                for nid in _filter_nids(_note_ids_for_mid(col, kanji_mid)):
+                for nid in _note_ids_for_mid(col, kanji_mid, allowed_deck_ids):
                     try:
-                        note = col.get_note(nid)
+                        note = read_note(nid)
                     except Exception:
                         continue
                     vals: list[str] = []
@@ -1037,15 +1691,16 @@ def build_graph(col: Collection) -> dict[str, Any]:
 
             # vocab -> kanji hubs
             vocab_cfg = kanji_vocab_note_types
+            vocab_chars: dict[int, list[str]] = {}
             for nt_id, vcfg in vocab_cfg.items():
                 if not isinstance(vcfg, dict):
                     continue
                 field = str(vcfg.get("reading_field") or vcfg.get("furigana_field") or "").strip()
                 if not field:
                     continue
-                for nid in _filter_nids(_note_ids_for_mid(col, str(nt_id))):
+                for nid in _note_ids_for_mid(col, str(nt_id), allowed_deck_ids):
                     try:
-                        note = col.get_note(nid)
+                        note = read_note(nid)
                     except Exception:
                         continue
                     if field not in note:
@@ -1063,18 +1718,24 @@ def build_graph(col: Collection) -> dict[str, Any]:
                         note_type=_note_type_name(col, int(note.mid)),
                         extra=_note_extra(note),
                     )
-                    for ch in chars:
-                        add_edge(str(nid), ensure_kanji_hub(ch), "kanji", kind="vocab", value=ch)
+                    vocab_chars[int(nid)] = chars
+            ranked_chars = _rank_vocab_kanji(vocab_chars, kanji_tfidf_enabled, kanji_rank_top_k, kanji_quantile_norm)
+            for nid, picks in ranked_chars.items():
+                for ch, weight in picks:
+                    extra_meta = {"weight": weight} if weight is not None else {}
+                    add_edge(str(nid), ensure_kanji_hub(ch), "kanji", kind="vocab", value=ch, **extra_meta)
+            release(vocab_chars, ranked_chars)
         else:
-            kanji_map, radical_map, _ = _build_kanji_maps(
+            kanji_map, radical_map, kanji_note_map = _build_kanji_maps(
                 col,
                 kanji_mid,
                 kanji_field,
                 kanji_alt_field,
                 radical_mid,
                 radical_field,
-                allowed_nids,
+                allowed_deck_ids,
             )
+            profiler.notes_read += len(kanji_note_map)
             logger.dbg(
                 "kanji_gate maps",
                 "kanji=",
@@ -1083,9 +1744,9 @@ def build_graph(col: Collection) -> dict[str, Any]:
 
             # map components per kanji note
             if kanji_mid and components_field:
-                for nid in _filter_nids(_note_ids_for_mid(col, kanji_mid)):
+                for nid in _note_ids_for_mid(col, kanji_mid, allowed_deck_ids):
                     try:
-                        note = col.get_note(nid)
+                        note = read_note(nid)
                     except Exception:
                         continue
                     if components_field not in note:
@@ -1102,7 +1763,7 @@ def build_graph(col: Collection) -> dict[str, Any]:
                                 extra=_note_extra(note),
                             )
                             try:
-                                comp_note = col.get_note(comp_nid)
+                                comp_note = read_note(comp_nid)
                             except Exception:
                                 comp_note = None
                             ensure_node(
@@ -1121,15 +1782,16 @@ def build_graph(col: Collection) -> dict[str, Any]:
 
             # vocab -> kanji
             vocab_cfg = kanji_vocab_note_types
+            vocab_chars = {}
             for nt_id, vcfg in vocab_cfg.items():
                 if not isinstance(vcfg, dict):
                     continue
                 field = str(vcfg.get("reading_field") or vcfg.get("furigana_field") or "").strip()
                 if not field:
                     continue
-                for nid in _filter_nids(_note_ids_for_mid(col, str(nt_id))):
+                for nid in _note_ids_for_mid(col, str(nt_id), allowed_deck_ids):
                     try:
-                        note = col.get_note(nid)
+                        note = read_note(nid)
                     except Exception:
                         continue
                     if field not in note:
@@ -1147,25 +1809,34 @@ def build_graph(col: Collection) -> dict[str, Any]:
                         note_type=_note_type_name(col, int(note.mid)),
                         extra=_note_extra(note),
                     )
-                    for ch in chars:
-                        for k_nid in kanji_map.get(ch, []):
-                            try:
-                                knote = col.get_note(k_nid)
-                            except Exception:
-                                knote = None
-                            ensure_node(
-                                str(k_nid),
-                                label=_note_label(knote, label_fields.get(str(knote.mid))) if knote else ch,
-                                kind="kanji",
-                                note_type_id=str(knote.mid) if knote else None,
-                                note_type=_note_type_name(col, int(knote.mid))
-                                if knote
-                                else "Kanji",
-                                extra=_note_extra(knote) if knote else None,
-                            )
-                            add_edge(str(nid), str(k_nid), "kanji", kind="vocab", value=ch)
+                    # only kanji with a kanji note can link; others must not take idf weight or top-k slots
+                    linkable = [ch for ch in chars if ch in kanji_map]
+                    if linkable:
+                        vocab_chars[int(nid)] = linkable
+            ranked_chars = _rank_vocab_kanji(vocab_chars, kanji_tfidf_enabled, kanji_rank_top_k, kanji_quantile_norm)
+            for nid, picks in ranked_chars.items():
+                for ch, weight in picks:
+                    extra_meta = {"weight": weight} if weight is not None else {}
+                    for k_nid in kanji_map.get(ch, []):
+                        try:
+                            knote = read_note(k_nid)
+                        except Exception:
+                            knote = None
+                        ensure_node(
+                            str(k_nid),
+                            label=_note_label(knote, label_fields.get(str(knote.mid))) if knote else ch,
+                            kind="kanji",
+                            note_type_id=str(knote.mid) if knote else None,
+                            note_type=_note_type_name(col, int(knote.mid))
+                            if knote
+                            else "Kanji",
+                            extra=_note_extra(knote) if knote else None,
+                        )
+                        add_edge(str(nid), str(k_nid), "kanji", kind="vocab", value=ch, **extra_meta)
+            release(vocab_chars, ranked_chars, kanji_map, radical_map, kanji_note_map)
 
     # Mass Linker
+    profiler.begin("mass_linker")
     linker_rules: dict[str, dict[str, Any]] = {}
     mass_block = cfg.get("mass_linker", {}) if isinstance(cfg, dict) else {}
     if isinstance(mass_block, dict) and mass_block.get("enabled"):
@@ -1199,7 +1870,7 @@ def build_graph(col: Collection) -> dict[str, Any]:
             target_labels: dict[int, str] = {}
             for tnid in target_nids:
                 try:
-                    tnote = col.get_note(tnid)
+                    tnote = read_note(tnid)
                 except Exception:
                     continue
                 if label_field and label_field in tnote:
@@ -1215,9 +1886,9 @@ def build_graph(col: Collection) -> dict[str, Any]:
                     extra=_note_extra(tnote),
                 )
 
-            for snid in _filter_nids(_note_ids_for_mid(col, str(nt_id))):
+            for snid in _note_ids_for_mid(col, str(nt_id), allowed_deck_ids):
                 try:
-                    snote = col.get_note(snid)
+                    snote = read_note(snid)
                 except Exception:
                     continue
                 if templates_raw:
@@ -1238,12 +1909,8 @@ def build_graph(col: Collection) -> dict[str, Any]:
                             mid_key = str(snote.mid)
                             tmpl_names = tmpl_name_cache.get(mid_key)
                             if tmpl_names is None:
-                                model = col.models.get(snote.mid)
-                                tmpl_names = {
-                                    str(t.get("name", ""))
-                                    for t in (model.get("tmpls") or [])
-                                    if t.get("name")
-                                } if model else set()
+                                nt_info = _notetype_info(col, snote.mid)
+                                tmpl_names = set(nt_info["templates"]) if nt_info else set()
                                 tmpl_name_cache[mid_key] = tmpl_names
                             if tmpl_names & template_names:
                                 matched = True
@@ -1270,6 +1937,7 @@ def build_graph(col: Collection) -> dict[str, Any]:
                     )
 
     # Manual linked notes (reference)
+    profiler.begin("reference")
     if isinstance(linked_fields, dict) and linked_fields:
         manual_edges = 0
         manual_matches = 0
@@ -1281,9 +1949,9 @@ def build_graph(col: Collection) -> dict[str, Any]:
             if not field:
                 continue
             note_count = 0
-            for nid in _filter_nids(_note_ids_for_mid(col, str(nt_id))):
+            for nid in _note_ids_for_mid(col, str(nt_id), allowed_deck_ids):
                 try:
-                    note = col.get_note(nid)
+                    note = read_note(nid)
                 except Exception:
                     continue
                 if field not in note:
@@ -1321,7 +1989,7 @@ def build_graph(col: Collection) -> dict[str, Any]:
                     if not resolved:
                         continue
                     try:
-                        rnote = col.get_note(resolved)
+                        rnote = read_note(resolved)
                     except Exception:
                         rnote = None
                     ensure_node(
@@ -1336,14 +2004,8 @@ def build_graph(col: Collection) -> dict[str, Any]:
                         else "Note",
                         extra=_note_extra(rnote) if rnote else None,
                     )
-                    add_edge(
-                        str(nid),
-                        str(resolved),
-                        "note_links",
-                        label=label,
-                        manual=True,
-                    )
-                    manual_edges += 1
+                    if add_reference_edge(int(nid), int(resolved), label):
+                        manual_edges += 1
             if note_count:
                 logger.dbg("manual links", "note_type", nt_id, "field", field, "notes", note_count)
         if manual_edges or manual_matches:
@@ -1364,15 +2026,16 @@ def build_graph(col: Collection) -> dict[str, Any]:
                 logger.dbg("manual links sample", sample_raw)
 
     # Include unlinked notes for configured note types (layer-gated)
+    profiler.begin("unlinked")
     if show_unlinked:
         def _add_unlinked_notes(nt_ids: set[str], layer: str) -> None:
             for nt_id in nt_ids:
                 nt_id = str(nt_id or "").strip()
                 if not nt_id:
                     continue
-                for nid in _filter_nids(_note_ids_for_mid(col, nt_id)):
+                for nid in _note_ids_for_mid(col, nt_id, allowed_deck_ids):
                     try:
-                        note = col.get_note(nid)
+                        note = read_note(nid)
                     except Exception:
                         continue
                     ensure_node(
@@ -1417,64 +2080,8 @@ def build_graph(col: Collection) -> dict[str, Any]:
             if mass_nts:
                 _add_unlinked_notes(mass_nts, "mass_links")
 
-    # Collapse duplicate reference edges (manual/auto) into a single visible edge.
-    # If both directions exist, keep one visible edge and add a flow-only reverse
-    # so the flow appears bidirectional on the same line.
-    if edges:
-        ref_groups: dict[tuple[str, str, bool], dict[str, list[dict[str, Any]]]] = {}
-        out_edges: list[dict[str, Any]] = []
-        for e in edges:
-            if e.get("layer") != "note_links":
-                out_edges.append(e)
-                continue
-            s = str(e.get("source"))
-            t = str(e.get("target"))
-            meta = e.get("meta") or {}
-            manual = bool(meta.get("manual"))
-            a, b = (s, t) if s < t else (t, s)
-            entry = ref_groups.setdefault((a, b, manual), {"ab": [], "ba": []})
-            if s == a and t == b:
-                entry["ab"].append(e)
-            else:
-                entry["ba"].append(e)
-        for (_a, _b, manual), entry in ref_groups.items():
-            ab = entry.get("ab") or []
-            ba = entry.get("ba") or []
-            def _pick(group: list[dict[str, Any]]) -> dict[str, Any] | None:
-                for e in group:
-                    if not (e.get("meta") or {}).get("flow_only"):
-                        return e
-                return group[0] if group else None
-            vis_ab = _pick(ab)
-            vis_ba = _pick(ba)
-            if vis_ab and vis_ba:
-                visible = vis_ab
-                vmeta = dict(visible.get("meta") or {})
-                vmeta.pop("flow_only", None)
-                vmeta["manual"] = manual
-                vmeta["bidirectional"] = True
-                visible["meta"] = vmeta
-                out_edges.append(visible)
-                out_edges.append(
-                    {
-                        "source": visible.get("target"),
-                        "target": visible.get("source"),
-                        "layer": "note_links",
-                        "meta": {**vmeta, "flow_only": True, "manual": manual, "bidirectional": True},
-                    }
-                )
-            else:
-                visible = vis_ab or vis_ba
-                if visible is None:
-                    continue
-                vmeta = dict(visible.get("meta") or {})
-                vmeta.pop("flow_only", None)
-                vmeta["manual"] = manual
-                visible["meta"] = vmeta
-                out_edges.append(visible)
-        edges = out_edges
-
     # Aggregate autolink tags into hubs (optional)
+    profiler.begin("hub_aggregation")
     if autolink_tags:
         hub_map: dict[str, str] = {}
         hub_counts: dict[str, int] = {}
@@ -1520,19 +2127,9 @@ def build_graph(col: Collection) -> dict[str, Any]:
             for nid in hub_map.keys():
                 nodes.pop(nid, None)
             new_edges: list[dict[str, Any]] = []
-            seen: set[tuple[str, str, str, str]] = set()
-
-            def _hub_meta_key(meta: Any) -> str:
-                if not isinstance(meta, dict):
-                    return ""
-                keep: dict[str, Any] = {}
-                for k in ("flow_only", "manual", "bidirectional", "kind"):
-                    if k in meta:
-                        keep[k] = meta.get(k)
-                try:
-                    return json.dumps(keep, sort_keys=True, default=str)
-                except Exception:
-                    return str(keep)
+            seen: set[tuple[str, str, str, int, Any]] = set()
+            passed: set[tuple[str, str, str, Any]] = set()
+            hub_prefixes = ("notetype:", "autolink:")
 
             for e in edges:
                 raw_src = str(e.get("source"))
@@ -1549,25 +2146,45 @@ def build_graph(col: Collection) -> dict[str, Any]:
                 if src == dst:
                     continue
                 meta = e.get("meta") or {}
-                if (
-                    str(src).startswith("notetype:")
-                    or str(dst).startswith("notetype:")
-                    or str(src).startswith("autolink:")
-                    or str(dst).startswith("autolink:")
-                ):
-                    meta_key = _hub_meta_key(meta)
+                if src.startswith(hub_prefixes) or dst.startswith(hub_prefixes):
+                    # hub edges dedupe on a small fingerprint: flag bits + kind
+                    flags = (
+                        (1 if meta.get("flow_only") else 0)
+                        | (2 if meta.get("manual") else 0)
+                        | (4 if meta.get("bidirectional") else 0)
+                    )
+                    key = (src, dst, str(e.get("layer") or ""), flags, meta.get("kind"))
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                if src_hub or dst_hub:
+                    new_edges.append({"source": src, "target": dst, "layer": e.get("layer"), "meta": meta})
                 else:
-                    try:
-                        meta_key = json.dumps(meta, sort_keys=True, default=str)
-                    except Exception:
-                        meta_key = str(meta)
-                key = (src, dst, str(e.get("layer") or ""), meta_key)
-                if key in seen:
-                    continue
-                seen.add(key)
-                new_edges.append({"source": src, "target": dst, "layer": e.get("layer"), "meta": meta})
+                    # edges between untouched notes pass through uncopied; dedupeEdges in the webview
+                    # compares JSON.stringify(meta), so key-order variants are dropped here
+                    key = (raw_src, raw_dst, str(e.get("layer") or ""), _meta_fingerprint(meta))
+                    if key in passed:
+                        continue
+                    passed.add(key)
+                    new_edges.append(e)
             edges = new_edges
+            release(hub_map, seen, passed)
+
+    profiler.begin("links")
+    if edges and link_mst_enabled:
+        mst_kept, mst_demoted = _mark_spanning_forest(edges, MST_LAYERS)
+        logger.dbg("link mst", "structural", mst_kept, "render_only", mst_demoted)
+
+    if hub_damping or reference_damping:
+        damped = _apply_link_damping(
+            (edges, family_hub_edges_direct, family_hub_edges_chain),
+            nodes,
+            hub_damping,
+            reference_damping,
+        )
+        logger.dbg("link damping", "hub", hub_damping, "reference", reference_damping, "edges", damped)
 
+    profiler.begin("filter")
     if edges:
         node_layers_from_edges = {"families", "examples", "mass_links", "kanji"}
         for e in edges:
@@ -1594,6 +2211,7 @@ def build_graph(col: Collection) -> dict[str, Any]:
                 linked_ids.add(str(e.get("target")))
         nodes = {nid: n for nid, n in nodes.items() if nid in linked_ids}
 
+    profiler.begin("card_map")
     note_ids: list[int] = []
     for nid, node in nodes.items():
         if node.get("kind") != "note":
@@ -1602,15 +2220,9 @@ def build_graph(col: Collection) -> dict[str, Any]:
             note_ids.append(int(nid))
         except Exception:
             continue
-    for hub_entry in hub_members.values():
-        for node in hub_entry.get("nodes", []):
-            if node.get("kind") != "note":
-                continue
-            try:
-                note_ids.append(int(node.get("id")))
-            except Exception:
-                continue
+    # hub member cards are loaded per page in hub_members_page()
     card_map = _build_card_map(col, note_ids)
+    profiler.notes_read += len(note_ids)
     for nid, node in nodes.items():
         if node.get("kind") != "note":
             continue
@@ -1618,14 +2230,9 @@ def build_graph(col: Collection) -> dict[str, Any]:
             node["cards"] = card_map.get(int(nid), [])
         except Exception:
             node["cards"] = []
-    for hub_entry in hub_members.values():
-        for node in hub_entry.get("nodes", []):
-            if node.get("kind") != "note":
-                continue
-            try:
-                node["cards"] = card_map.get(int(node.get("id")), [])
-            except Exception:
-                node["cards"] = []
+    profiler.end(card_map)
+    release(card_map, ref_edge_slots, ref_edge_dirs)
+    profiler.begin("meta")
     note_type_meta: list[dict[str, Any]] = []
     seen_nt: set[str] = set()
 
@@ -1634,30 +2241,13 @@ def build_graph(col: Collection) -> dict[str, Any]:
         if not mid or mid in seen_nt:
             return
         seen_nt.add(mid)
-        try:
-            model = col.models.get(int(mid))
-        except Exception:
-            model = None
-        fields: list[str] = []
-        name = mid
-        if model and isinstance(model, dict):
-            name = str(model.get("name", mid))
-            try:
-                fields = [str(f.get("name", "")) for f in (model.get("flds") or []) if f.get("name")]
-            except Exception:
-                fields = []
+        info = _notetype_info(col, mid)
         note_type_meta.append(
             {
                 "id": str(mid),
-                "name": name,
-                "fields": fields,
-                "templates": [
-                    str(t.get("name", ""))
-                    for t in (model.get("tmpls") or [])
-                    if t.get("name")
-                ]
-                if model and isinstance(model, dict)
-                else [],
+                "name": info["name"] if info else mid,
+                "fields": list(info["fields"]) if info else [],
+                "templates": list(info["templates"]) if info else [],
                 "label_field": label_fields.get(str(mid), ""),
                 "linked_field": linked_fields.get(str(mid), ""),
                 "tooltip_fields": tooltip_fields.get(str(mid), []) if isinstance(tooltip_fields, dict) else [],
@@ -1675,13 +2265,24 @@ def build_graph(col: Collection) -> dict[str, Any]:
             if isinstance(node, dict):
                 add_note_type_meta(node)
 
+    # hubs ship as summaries; members are paged in on demand via hub_members_page()
     hub_members_payload: list[dict[str, Any]] = []
     for hub_id, entry in hub_members.items():
         try:
             nodes_list = entry.get("nodes") or []
             edges_list = entry.get("edges") or []
+            hub_node = nodes.get(hub_id) or {}
             hub_members_payload.append(
-                {"hub_id": hub_id, "nodes": nodes_list, "edges": edges_list}
+                {
+                    "hub_id": hub_id,
+                    "count": len(nodes_list),
+                    "edge_count": len(edges_list),
+                    "note_type_id": hub_node.get("note_type_id"),
+                    "note_type": hub_node.get("note_type"),
+                    "sample_labels": [
+                        str(n.get("label") or n.get("id") or "") for n in nodes_list[:HUB_SAMPLE_LABELS]
+                    ],
+                }
             )
         except Exception:
             continue
@@ -1695,10 +2296,41 @@ def build_graph(col: Collection) -> dict[str, Any]:
         except Exception:
             deck_names = []
 
-    logger.dbg("build_graph done", "nodes=", len(nodes), "edges=", len(edges))
+    profiler.end({"note_types": note_type_meta, "hubs": hub_members_payload, "decks": deck_names})
+    payload_nodes = list(nodes.values())
+    packed_styles = None
+    if bool(graph_cfg.get("packed_styles", False)):
+        profiler.begin("styles")
+        packed_styles = pack_styles(
+            payload_nodes,
+            edges,
+            {
+                "note_types": note_type_meta,
+                "layer_colors": layer_colors,
+                "link_colors": link_colors,
+                "layer_styles": layer_styles,
+            },
+        )
+        profiler.end(packed_styles)
+    profiler.begin("degrees")
+    degrees = layer_degrees(
+        payload_nodes,
+        edges,
+        {
+            "family_edges_direct": family_edges_direct,
+            "family_edges_chain": family_edges_chain,
+            "family_hub_edges_direct": family_hub_edges_direct,
+            "family_hub_edges_chain": family_hub_edges_chain,
+        },
+    )
+    profiler.end(degrees)
+    perf = profiler.summary()
+    logger.dbg("build_graph done", "nodes=", len(nodes), "edges=", len(edges), "ms=", perf["total_ms"])
     return {
-        "nodes": list(nodes.values()),
+        "nodes": payload_nodes,
         "edges": edges,
+        # full hub members stay on the Python side (popped before the payload is sent)
+        "hub_members": hub_members,
         "meta": {
             "layers": ["notes", "priority", "families", "note_links", "examples", "mass_links", "kanji"],
             "note_types": note_type_meta,
@@ -1764,5 +2396,68 @@ def build_graph(col: Collection) -> dict[str, Any]:
             "card_dots_enabled": card_dots_enabled,
             "debug_enabled": debug_enabled,
             "debug_mode": debug_mode,
+            "packed_styles": packed_styles,
+            "layer_degrees": degrees,
+            "memory_bounded_build": memory_bounded,
+            "perf": perf,
         },
     }
+
+
+def hub_members_page(
+    col: Collection, hub_members: dict[str, dict[str, Any]], hub_id: str, page: int
+) -> dict[str, Any]:
+    """Return one columnar page of a hub's member nodes and internal edges."""
+    entry = hub_members.get(hub_id) or {}
+    all_nodes = entry.get("nodes") or []
+    all_edges = entry.get("edges") or []
+    page = max(0, int(page))
+    page_nodes = all_nodes[page * HUB_PAGE_NODES : (page + 1) * HUB_PAGE_NODES]
+    page_edges = all_edges[page * HUB_PAGE_EDGES : (page + 1) * HUB_PAGE_EDGES]
+
+    note_ids: list[int] = []
+    for node in page_nodes:
+        if node.get("kind") != "note":
+            continue
+        try:
+            note_ids.append(int(node.get("id")))
+        except Exception:
+            continue
+    card_map = _build_card_map(col, note_ids)
+
+    keys: list[str] = []
+    seen_keys: set[str] = set()
+    for node in page_nodes:
+        for key in node.keys():
+            if key not in seen_keys:
+                seen_keys.add(key)
+                keys.append(key)
+    if "cards" not in seen_keys:
+        keys.append("cards")
+    node_columns: dict[str, list[Any]] = {key: [] for key in keys}
+    for node in page_nodes:
+        for key in keys:
+            if key == "cards" and node.get("kind") == "note":
+                try:
+                    node_columns[key].append(card_map.get(int(node.get("id")), []))
+                except Exception:
+                    node_columns[key].append([])
+                continue
+            node_columns[key].append(node.get(key))
+
+    edge_columns: dict[str, list[Any]] = {"source": [], "target": [], "layer": [], "meta": []}
+    for e in page_edges:
+        edge_columns["source"].append(str(e.get("source")))
+        edge_columns["target"].append(str(e.get("target")))
+        edge_columns["layer"].append(e.get("layer"))
+        edge_columns["meta"].append(e.get("meta") or {})
+
+    return {
+        "hub_id": hub_id,
+        "page": page,
+        "total_nodes": len(all_nodes),
+        "total_edges": len(all_edges),
+        "has_more": (page + 1) * HUB_PAGE_NODES < len(all_nodes) or (page + 1) * HUB_PAGE_EDGES < len(all_edges),
+        "nodes": node_columns,
+        "edges": edge_columns,
+    }
@@ -6,13 +6,35 @@ from aqt import mw
 def show_family_graph() -> None:
     if mw is None:
         return
-    from .graph_view import FamilyGraphWindow
+    from .graph_view import FamilyGraphWindow, collection_key
 
     win = getattr(mw, "_ajpc_family_graph_win", None)
+    if isinstance(win, FamilyGraphWindow) and win._collection_key != collection_key():
+        # a warm window from another profile must not be shown against this collection
+        discard_family_graph()
+        win = None
     if win is None or not isinstance(win, FamilyGraphWindow):
+        from .graph_data import invalidate_notetype_cache, invalidate_tools_config_cache
+
+        # notetype edits made while no window was listening are not tracked
+        invalidate_notetype_cache()
+        invalidate_tools_config_cache()
         win = FamilyGraphWindow()
         mw._ajpc_family_graph_win = win
     else:
         win.show()
         win.raise_()
         win.activateWindow()
+
+
+def discard_family_graph() -> None:
+    if mw is None:
+        return
+    win = getattr(mw, "_ajpc_family_graph_win", None)
+    mw._ajpc_family_graph_win = None
+    if win is None:
+        return
+    try:
+        win.discard()
+    except Exception:
+        pass
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import json
+import time
+from typing import Any
+
+from aqt import gui_hooks, mw
+from aqt.operations import QueryOp
+from aqt.qt import QTimer
+
+from . import logger
+from .graph_config import load_graph_config
+from .graph_data import RssSampler, build_graph, invalidate_notetype_cache
+from .graph_web_bundle import prune_payload_files, remove_payload_file, write_payload_file
+
+PREWARM_IDLE_DELAY_MS = 5000
+PREWARM_REFRESH_DELAY_MS = 2000
+
+# Warm build kept for the next window open: {"hub_members", "nodes", "edges", "payload_bytes"}
+# plus "payload_json", or (memory-bounded builds) "payload_path" under web/.
+_WARM: dict[str, Any] | None = None
+_STALE = False
+_BUILDING = False
+_TIMER: QTimer | None = None
+_HOOKED = False
+
+
+def serialize_payload(result: dict[str, Any], rss: RssSampler | None = None) -> str:
+    text = json.dumps(result, ensure_ascii=False)
+    escaped = text.replace("</", "<\\/")
+    if rss is not None:
+        # json.dumps holds the GIL, so the sampler thread can't see this; both copies are alive here
+        rss.sample()
+    return escaped
+
+
+def is_memory_bounded(result: dict[str, Any]) -> bool:
+    return bool((result.get("meta") or {}).get("memory_bounded_build", False))
+
+
+def build_warm_entry(col, changed_nids: list[int] | None = None) -> dict[str, Any]:
+    """Build the graph and serialize it; runs on the background thread."""
+    result = build_graph(col)
+    hub_members = result.pop("hub_members", None) or {}
+    if changed_nids:
+        meta = result.setdefault("meta", {})
+        if isinstance(meta, dict):
+            meta["changed_nids"] = list(changed_nids)
+    entry: dict[str, Any] = {
+        "hub_members": hub_members,
+        "nodes": len(result.get("nodes") or []),
+        "edges": len(result.get("edges") or []),
+    }
+    # only the serialized form is kept; the built dict is dropped as soon as this returns
+    # meta.perf is already inside the payload, so the serialize step is reported on the entry
+    bounded = is_memory_bounded(result)
+    rss = RssSampler().start()
+    t0 = time.perf_counter()
+    try:
+        if bounded:
+            entry["payload_path"], entry["payload_bytes"] = write_payload_file(result)
+        else:
+            entry["payload_json"] = serialize_payload(result, rss)
+            entry["payload_bytes"] = len(entry["payload_json"])
+    finally:
+        rss.stop()
+    entry["serialize"] = {
+        "ms": round((time.perf_counter() - t0) * 1000.0, 2),
+        "streamed": bounded,
+        "rss_start_kb": rss.start_kb,
+        "rss_peak_growth_kb": rss.peak_growth_kb(),
+    }
+    logger.dbg("payload serialize", entry["serialize"], "bytes=", entry["payload_bytes"])
+    return entry
+
+
+def discard_entry_payload(entry: dict[str, Any] | None) -> None:
+    if entry and entry.get("payload_path"):
+        remove_payload_file(entry["payload_path"])
+
+
+def _enabled() -> bool:
+    try:
+        return bool(load_graph_config().get("prebuild_on_profile_open", False))
+    except Exception:
+        return False
+
+
+def _window_open() -> bool:
+    return getattr(mw, "_ajpc_family_graph_win", None) is not None
+
+
+def _schedule(delay_ms: int) -> None:
+    global _TIMER
+    if mw is None:
+        return
+    if _TIMER is None:
+        _TIMER = QTimer(mw)
+        _TIMER.setSingleShot(True)
+        _TIMER.timeout.connect(_run)
+    _TIMER.stop()
+    _TIMER.start(delay_ms)
+
+
+def _run() -> None:
+    global _BUILDING, _STALE
+    if mw is None or not getattr(mw, "col", None):
+        return
+    if _window_open() or not _enabled():
+        return
+    if _BUILDING:
+        # a change landed mid-build; pick it up once the running build finishes
+        _STALE = True
+        return
+    _BUILDING = True
+    _STALE = False
+    logger.dbg("prewarm build start")
+
+    def on_success(entry: dict[str, Any]) -> None:
+        global _WARM, _BUILDING
+        _BUILDING = False
+        discard_entry_payload(_WARM)
+        _WARM = None
+        if _window_open():
+            # the open window does its own builds and the hooks below skip its edits,
+            # so this one would be stale by the time it could be used
+            discard_entry_payload(entry)
+            logger.dbg("prewarm build dropped: window open")
+            return
+        _WARM = entry
+        logger.dbg(
+            "prewarm build ready",
+            "nodes=",
+            entry["nodes"],
+            "bytes=",
+            entry["payload_bytes"],
+        )
+        if _STALE:
+            _schedule(PREWARM_REFRESH_DELAY_MS)
+
+    def on_failure(err: Exception) -> None:
+        global _BUILDING
+        _BUILDING = False
+        logger.dbg("prewarm build failed", repr(err))
+        if _STALE:
+            _schedule(PREWARM_REFRESH_DELAY_MS)
+
+    QueryOp(parent=mw, op=build_warm_entry, success=on_success).failure(on_failure).run_in_background()
+
+
+def take_warm_entry() -> dict[str, Any] | None:
+    """Hand the warm build to a window exactly once; None if missing or out of date."""
+    global _WARM
+    entry = _WARM
+    _WARM = None
+    if entry is None or _STALE or _BUILDING:
+        discard_entry_payload(entry)
+        return None
+    return entry
+
+
+def discard_warm_entry() -> None:
+    global _WARM, _STALE
+    discard_entry_payload(_WARM)
+    _WARM = None
+    _STALE = False
+    if _TIMER is not None:
+        _TIMER.stop()
+
+
+def _on_operation_did_execute(changes, _handler) -> None:
+    global _STALE
+    try:
+        if getattr(changes, "notetype", False):
+            invalidate_notetype_cache()
+        if _window_open() or not _enabled():
+            return
+        if _WARM is None and not _BUILDING:
+            return
+        if not any(
+            getattr(changes, attr, False)
+            for attr in ("note", "note_text", "tag", "deck", "notetype", "card")
+        ):
+            return
+        _STALE = True
+        _schedule(PREWARM_REFRESH_DELAY_MS)
+    except Exception:
+        pass
+
+
+def _on_profile_did_open(*_args, **_kw) -> None:
+    discard_warm_entry()
+    # payload files left behind by a session that did not shut down cleanly
+    prune_payload_files()
+    if _enabled():
+        _schedule(PREWARM_IDLE_DELAY_MS)
+
+
+def _on_profile_will_close(*_args, **_kw) -> None:
+    discard_warm_entry()
+
+
+def register_prewarm() -> None:
+    global _HOOKED
+    if _HOOKED:
+        return
+    _HOOKED = True
+    gui_hooks.profile_did_open.append(_on_profile_did_open)
+    gui_hooks.profile_will_close.append(_on_profile_will_close)
+    gui_hooks.operation_did_execute.append(_on_operation_did_execute)
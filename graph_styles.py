@@ -0,0 +1,303 @@
+"""Pack node/edge render styles into flat arrays the webview can upload as-is.
+
+Mirrors the colour/size/style resolution in web/graph.payload.js (nodeColor,
+ajpcNodeBaseSize, nodeRenderTypeCode, linkColor, linkStyleCode) for a freshly
+loaded payload. The lookups that were used ship alongside the arrays so the
+webview can fall back to its own resolution once runtime settings diverge.
+
+layer_degrees() does the same for node degrees: per-layer edge counts over the
+edge set the webview renders (preparePayload + collapseEdgesForRendering).
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+try:
+    import numpy as np
+except Exception:  # optional; the pure-Python path produces identical output
+    np = None
+
+_HEX6_RE = re.compile(r"^#([0-9a-fA-F]{6})$")
+_HEX3_RE = re.compile(r"^#([0-9a-fA-F]{3})$")
+_SEP_RE = re.compile(r"[\s-]+")
+
+DEFAULT_NOTE_TYPE_COLOR = "#93c5fd"
+LINK_ALPHA = 0.58
+
+_FALLBACK_LAYER_COLORS = {
+    "notes": "#3d95e7",
+    "priority": "#6ee7b7",
+    "families": "#34d399",
+    "note_links": "#f59e0b",
+    "mass_links": "#f97316",
+    "examples": "#60a5fa",
+    "kanji": "#f87171",
+    "family": "#6ee7b7",
+    "family_hub": "#34d399",
+    "reference": "#f59e0b",
+    "mass_linker": "#f97316",
+    "example": "#60a5fa",
+}
+_FALLBACK_COLOR = "#94a3b8"
+
+_NODE_BASE_SIZES = {"family": 1.0, "note_type_hub": 1.0, "kanji": 1.1, "note": 1.5}
+_STYLE_CODES = {"dashed": 1, "dotted": 2}
+
+# meta edge buckets merged into the edge list by the webview, with their forced layer
+_EXTRA_EDGE_SETS = (
+    ("family_edges_direct", "priority"),
+    ("family_edges_chain", "priority"),
+    ("family_hub_edges_direct", "families"),
+    ("family_hub_edges_chain", "families"),
+)
+
+
+class _Unpackable(Exception):
+    """A colour the webview parses differently than a plain hex; skip packing."""
+
+
+def _normalize_layer_key(layer: Any, context: str) -> str:
+    key = str("" if layer is None else layer).strip().lower()
+    if not key:
+        return ""
+    key = _SEP_RE.sub("_", key)
+    if key == "familyhub":
+        key = "family_hub"
+    if key == "masslinker":
+        key = "mass_linker"
+    if key in ("notelinks", "note_link"):
+        key = "note_links"
+    if key == "familygate":
+        key = "family"
+    if key == "family_hub":
+        return "families"
+    if key == "reference":
+        return "note_links"
+    if key == "example":
+        return "examples"
+    if key == "mass_linker":
+        return "mass_links"
+    if key == "family":
+        return "notes" if context == "node" else "priority"
+    return key
+
+
+def _normalize_layer_map(raw: Any, context: str) -> dict[str, Any]:
+    out: dict[str, Any] = {}
+    if not isinstance(raw, dict):
+        return out
+    for key, value in raw.items():
+        norm = _normalize_layer_key(key, context)
+        if norm:
+            out[norm] = value
+    return out
+
+
+def _hex(color: Any) -> str:
+    c = str(color or "").strip()
+    m = _HEX6_RE.match(c)
+    if m:
+        return "#" + m.group(1).lower()
+    m = _HEX3_RE.match(c)
+    if m:
+        return "#" + "".join(ch * 2 for ch in m.group(1)).lower()
+    raise _Unpackable(c)
+
+
+def _rgba32(hex_color: str, alpha: float) -> int:
+    rgb = int(hex_color[1:], 16)
+    a = max(0, min(255, int(round(alpha * 255))))
+    return ((rgb << 8) | a) & 0xFFFFFFFF
+
+
+def _gather(palette: list[int], index: list[int]) -> list[int]:
+    if np is not None and index:
+        return np.asarray(palette, dtype=np.uint32)[np.asarray(index, dtype=np.intp)].tolist()
+    return [palette[i] for i in index]
+
+
+class _Palette:
+    def __init__(self, alpha: float) -> None:
+        self.alpha = alpha
+        self.values: list[int] = []
+        self._index: dict[str, int] = {}
+
+    def index(self, hex_color: str) -> int:
+        idx = self._index.get(hex_color)
+        if idx is None:
+            idx = len(self.values)
+            self._index[hex_color] = idx
+            self.values.append(_rgba32(hex_color, self.alpha))
+        return idx
+
+
+def pack_styles(nodes: list[dict[str, Any]], edges: list[dict[str, Any]], meta: dict[str, Any]) -> dict[str, Any] | None:
+    """Return packed style columns aligned with ``nodes``/``edges``, or None if a colour can't be packed."""
+    try:
+        return _pack_styles(nodes, edges, meta)
+    except _Unpackable:
+        return None
+
+
+def _pack_styles(nodes: list[dict[str, Any]], edges: list[dict[str, Any]], meta: dict[str, Any]) -> dict[str, Any]:
+    layer_colors = _normalize_layer_map(meta.get("layer_colors"), "edge")
+    link_colors = _normalize_layer_map(meta.get("link_colors"), "edge")
+    layer_styles = _normalize_layer_map(meta.get("layer_styles"), "edge")
+    nt_colors: dict[str, str] = {}
+    for entry in meta.get("note_types") or []:
+        if isinstance(entry, dict) and entry.get("id"):
+            try:
+                nt_colors[str(entry["id"])] = _hex(entry.get("color"))
+            except _Unpackable:
+                nt_colors[str(entry["id"])] = DEFAULT_NOTE_TYPE_COLOR
+
+    used_nt: dict[str, str] = {}
+    used_layer: dict[str, str] = {}
+    used_link: dict[str, str] = {}
+    used_style: dict[str, int] = {}
+
+    def layer_color(layer: str) -> str:
+        color = used_layer.get(layer)
+        if color is None:
+            color = _hex(layer_colors.get(layer) or _FALLBACK_LAYER_COLORS.get(layer, _FALLBACK_COLOR))
+            used_layer[layer] = color
+        return color
+
+    def link_color(layer: str) -> str:
+        color = used_link.get(layer)
+        if color is None:
+            raw = link_colors.get(layer)
+            color = _hex(raw) if raw else layer_color(layer)
+            used_link[layer] = color
+        return color
+
+    node_palette = _Palette(1.0)
+    node_index: list[int] = []
+    node_size: list[float] = []
+    node_type: list[int] = []
+    for node in nodes:
+        kind = str(node.get("kind") or "note")
+        color = ""
+        if kind == "note":
+            ntid = str(node.get("note_type_id") or "")
+            if ntid and ntid in nt_colors:
+                color = used_nt.setdefault(ntid, nt_colors[ntid])
+        if not color:
+            layers = [k for k in (_normalize_layer_key(l, "node") for l in node.get("layers") or []) if k]
+            if layers:
+                color = layer_color(layers[0])
+            elif kind == "family":
+                color = layer_color("families")
+            else:
+                color = DEFAULT_NOTE_TYPE_COLOR
+        node_index.append(node_palette.index(color))
+        node_size.append(_NODE_BASE_SIZES.get(kind, 1.5))
+        node_type.append(0 if kind == "note" else 1)
+
+    link_palette = _Palette(LINK_ALPHA)
+    edge_index: list[int] = []
+    edge_style: list[int] = []
+    for edge in edges:
+        layer = _normalize_layer_key(edge.get("layer"), "edge")
+        edge_index.append(link_palette.index(link_color(layer) if layer else _FALLBACK_COLOR))
+        code = used_style.get(layer)
+        if code is None:
+            code = _STYLE_CODES.get(str(layer_styles.get(layer) or "solid").lower(), 0)
+            used_style[layer] = code
+        edge_style.append(code)
+
+    return {
+        "node_rgba": _gather(node_palette.values, node_index),
+        "node_size": node_size,
+        "node_type": node_type,
+        "edge_rgba": _gather(link_palette.values, edge_index),
+        "edge_style": edge_style,
+        # the resolved inputs; any runtime divergence invalidates the packed colours
+        "lookups": {
+            "note_types": used_nt,
+            "layer_colors": used_layer,
+            "link_colors": used_link,
+            "layer_styles": used_style,
+        },
+    }
+
+
+def _endpoint(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+def _meta_key(meta: dict[str, Any]) -> str:
+    try:
+        return json.dumps(meta, ensure_ascii=False, separators=(",", ":"))
+    except Exception:
+        return ""
+
+
+def _render_edges(edges: list[dict[str, Any]], meta: dict[str, Any]) -> list[tuple[str, str, str, int]]:
+    """(a, b, layer, multiplicity) per collapsed edge group, as the webview would render them."""
+    merged: list[tuple[dict[str, Any], str]] = [(e, _normalize_layer_key(e.get("layer"), "edge")) for e in edges]
+    for key, layer in _EXTRA_EDGE_SETS:
+        merged.extend((e, layer) for e in meta.get(key) or [] if isinstance(e, dict))
+
+    seen: set[tuple[str, str, str, str]] = set()
+    groups: dict[tuple[str, str, str], list[Any]] = {}
+    for edge, layer in merged:
+        source = _endpoint(edge.get("source"))
+        target = _endpoint(edge.get("target"))
+        if not source or not target:
+            continue
+        edge_meta = edge.get("meta") if isinstance(edge.get("meta"), dict) else {}
+        key = (source, target, layer, _meta_key(edge_meta))
+        if key in seen:
+            continue
+        seen.add(key)
+        a, b = (source, target) if source < target else (target, source)
+        # [has a->b, has b->a, any bidirectional, non-flow-only count]
+        group = groups.setdefault((a, b, layer), [False, False, False, 0])
+        if source == a and target == b:
+            group[0] = True
+        elif source == b and target == a:
+            group[1] = True
+        if edge_meta.get("bidirectional"):
+            group[2] = True
+        if not edge_meta.get("flow_only"):
+            group[3] += 1
+
+    out: list[tuple[str, str, str, int]] = []
+    for (a, b, layer), (has_ab, has_ba, bidir, count) in groups.items():
+        out.append((a, b, layer, 1 if (bidir or (has_ab and has_ba)) else count))
+    return out
+
+
+def layer_degrees(nodes: list[dict[str, Any]], edges: list[dict[str, Any]], meta: dict[str, Any]) -> dict[str, Any]:
+    """Per-node edge counts for each layer, row-major in ``counts`` (one row of ``len(layers)`` per node).
+
+    ``totals`` holds the per-layer sums so the webview can check the counts against the
+    edges it actually ended up with before trusting them.
+    """
+    index = {_endpoint(n.get("id")): i for i, n in enumerate(nodes)}
+    layers: list[str] = []
+    slots: dict[str, int] = {}
+    hits: list[tuple[int, int, int, int]] = []
+    for a, b, layer, count in _render_edges(edges, meta):
+        ia = index.get(a)
+        ib = index.get(b)
+        if ia is None or ib is None or ia == ib or count <= 0:
+            continue
+        slot = slots.get(layer)
+        if slot is None:
+            slot = slots[layer] = len(layers)
+            layers.append(layer)
+        hits.append((ia, ib, slot, count))
+
+    width = len(layers)
+    counts = [0] * (len(nodes) * width)
+    totals = [0] * width
+    for ia, ib, slot, count in hits:
+        counts[ia * width + slot] += count
+        counts[ib * width + slot] += count
+        totals[slot] += count
+    return {"layers": layers, "counts": counts, "totals": totals}
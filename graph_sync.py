@@ -8,8 +8,9 @@ from aqt.operations import QueryOp
 from aqt.utils import showInfo
 
 from . import logger
-from .graph_data import build_graph
-from .graph_web_assets import render_graph_html
+from .graph_data import invalidate_notetype_cache
+from .graph_prewarm import build_warm_entry, take_warm_entry
+from .graph_web_assets import render_graph_html, web_asset_url
 
 
 class GraphSyncMixin:
@@ -19,35 +20,57 @@ class GraphSyncMixin:
             return
         logger.dbg("load graph")
 
-        def op(_col):
-            return build_graph(_col)
-
-        def on_success(result: dict[str, Any]) -> None:
-            logger.dbg("graph build success", "nodes=", len(result.get("nodes", [])), "edges=", len(result.get("edges", [])))
-            html = render_graph_html(result)
-            self.web.stdHtml(html)
-            payload_json = json.dumps(result, ensure_ascii=False).replace("</", "<\\/")
-            logger.dbg("graph payload bytes", len(payload_json))
-            init_js = (
-                "(function(){"
-                "const data=" + payload_json + ";"
-                "const kick=()=>{"
-                "if(window.ajpcGraphInit){"
-                "window.ajpcGraphInit(data);"
-                "if(window.pycmd){pycmd('log:graph init called');}"
-                "}else{setTimeout(kick,50);}"
-                "};"
-                "kick();"
-                "})();"
-            )
-            self.web.eval(init_js)
-            self._graph_ready = True
+        warm = take_warm_entry()
+        if warm is not None:
+            logger.dbg("graph load from prewarm")
+            self._inject_graph(warm)
+            return
 
         def on_failure(err: Exception) -> None:
             logger.dbg("graph build failed", repr(err))
             showInfo(f"Graph build failed: {err!r}")
 
-        QueryOp(parent=self, op=op, success=on_success).failure(on_failure).run_in_background()
+        QueryOp(parent=self, op=build_warm_entry, success=self._inject_graph).failure(on_failure).run_in_background()
+
+    def _load_payload_file(self, rel: str, mode: str) -> None:
+        # the webview fetches and JSON.parses the file, then reports back so it can be deleted
+        url = web_asset_url(rel)
+        self.web.eval(
+            "(function(){"
+            "const kick=()=>{"
+            "if(window.ajpcGraphLoadUrl){"
+            "window.ajpcGraphLoadUrl(" + json.dumps(url) + "," + json.dumps(rel) + "," + json.dumps(mode) + ");"
+            "}else{setTimeout(kick,50);}"
+            "};"
+            "kick();"
+            "})();"
+        )
+
+    def _inject_graph(self, entry: dict[str, Any]) -> None:
+        logger.dbg("graph build success", "nodes=", entry.get("nodes"), "edges=", entry.get("edges"))
+        self._hub_members = entry.get("hub_members") or {}
+        html = render_graph_html(entry)
+        self.web.stdHtml(html)
+        logger.dbg("graph payload bytes", entry.get("payload_bytes"))
+        if entry.get("payload_path"):
+            self._load_payload_file(entry["payload_path"], "init")
+            self._graph_ready = True
+            return
+        payload_json = entry["payload_json"]
+        init_js = (
+            "(function(){"
+            "const data=" + payload_json + ";"
+            "const kick=()=>{"
+            "if(window.ajpcGraphInit){"
+            "window.ajpcGraphInit(data);"
+            "if(window.pycmd){pycmd('log:graph init called');}"
+            "}else{setTimeout(kick,50);}"
+            "};"
+            "kick();"
+            "})();"
+        )
+        self.web.eval(init_js)
+        self._graph_ready = True
 
     def _refresh(self) -> None:
         if mw is None or not getattr(mw, "col", None):
@@ -57,25 +80,29 @@ class GraphSyncMixin:
             return
         logger.dbg("refresh graph")
 
+        # nids changed after this point get their own refresh
+        changed_nids = list(self._pending_changed_nids)
+
         def op(_col):
-            return build_graph(_col)
+            # serialized (or streamed to disk) here so the main thread only hands it over
+            return build_warm_entry(_col, changed_nids=changed_nids)
 
-        def on_success(result: dict[str, Any]) -> None:
+        def on_success(entry: dict[str, Any]) -> None:
             logger.dbg(
                 "graph refresh success",
                 "nodes=",
-                len(result.get("nodes", [])),
+                entry.get("nodes"),
                 "edges=",
-                len(result.get("edges", [])),
+                entry.get("edges"),
+                "bytes=",
+                entry.get("payload_bytes"),
             )
-            if self._pending_changed_nids:
-                result.setdefault("meta", {})
-                try:
-                    result["meta"]["changed_nids"] = list(self._pending_changed_nids)
-                except Exception:
-                    pass
-                self._pending_changed_nids.clear()
-            payload_json = json.dumps(result, ensure_ascii=False).replace("</", "<\\/")
+            self._hub_members = entry.get("hub_members") or {}
+            self._pending_changed_nids.difference_update(changed_nids)
+            if entry.get("payload_path"):
+                self._load_payload_file(entry["payload_path"], "update")
+                return
+            payload_json = entry["payload_json"]
             update_js = (
                 "(function(){"
                 "const data=" + payload_json + ";"
@@ -96,6 +123,11 @@ class GraphSyncMixin:
         QueryOp(parent=self, op=op, success=on_success).failure(on_failure).run_in_background()
 
     def _schedule_refresh(self, reason: str) -> None:
+        if getattr(self, "_warm_hidden", False):
+            # hidden warm window: fold everything into one refresh when it is shown again
+            logger.dbg("defer refresh while hidden", reason)
+            self._refresh_on_show = True
+            return
         logger.dbg("schedule refresh", reason)
         try:
             self._refresh_timer.stop()
@@ -132,6 +164,8 @@ class GraphSyncMixin:
     def _on_operation_did_execute(self, changes, handler) -> None:
         try:
             self._sync_embedded_editor_on_operation(changes, handler)
+            if getattr(changes, "notetype", False):
+                invalidate_notetype_cache()
             if not self._graph_ready:
                 return
             if getattr(changes, "note", False) or getattr(changes, "note_text", False):
@@ -9,11 +9,29 @@ from aqt.webview import AnkiWebView
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 
 from . import logger
+from .graph_config import load_graph_config
 from .graph_bridge_handlers import GraphBridgeHandlersMixin
 from .graph_editor_embedded import EmbeddedEditorMixin
 from .graph_sync import GraphSyncMixin
 
 
+def collection_key() -> str:
+    col = getattr(mw, "col", None) if mw is not None else None
+    if col is None:
+        return ""
+    try:
+        return str(col.path)
+    except Exception:
+        return str(id(col))
+
+
+def _keep_window_warm() -> bool:
+    try:
+        return bool(load_graph_config().get("keep_window_warm", True))
+    except Exception:
+        return True
+
+
 class FamilyGraphWindow(GraphBridgeHandlersMixin, GraphSyncMixin, EmbeddedEditorMixin, QWidget):
     def __init__(self) -> None:
         super().__init__()
@@ -63,7 +81,13 @@ class FamilyGraphWindow(GraphBridgeHandlersMixin, GraphSyncMixin, EmbeddedEditor
         self._refresh_timer.setSingleShot(True)
         self._refresh_timer.timeout.connect(self._refresh)
         self._pending_changed_nids: set[int] = set()
+        self._hub_members: dict[str, dict[str, Any]] = {}
         self._note_add_hooks: list[tuple[Any, Any]] = []
+        self._collection_key = collection_key()
+        self._warm_hidden = False
+        self._refresh_on_show = False
+        self._discarding = False
+        self._torn_down = False
 
         restoreGeom(self, "ajpc_family_graph", default_size=(1100, 720))
         if self.width() < 300 or self.height() < 200:
@@ -80,7 +104,55 @@ class FamilyGraphWindow(GraphBridgeHandlersMixin, GraphSyncMixin, EmbeddedEditor
         self._bind_note_add_hooks()
 
     def closeEvent(self, event) -> None:
-        saveGeom(self, "ajpc_family_graph")
+        if self.isVisible():
+            saveGeom(self, "ajpc_family_graph")
+        if not self._discarding and _keep_window_warm():
+            # keep the page, WebGL context and layout alive; discard() is the real teardown
+            self._hide_warm()
+            event.ignore()
+            return
+        self._teardown()
+        super().closeEvent(event)
+        self.deleteLater()
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        if not self._warm_hidden:
+            return
+        self._warm_hidden = False
+        logger.dbg("window reshown warm")
+        QTimer.singleShot(160, self._preload_embedded_editor_webview)
+        if self._refresh_on_show:
+            self._refresh_on_show = False
+            self._schedule_refresh("changes while hidden")
+
+    def _hide_warm(self) -> None:
+        try:
+            self._sync_web_editor_panel_visibility(False)
+        except Exception:
+            pass
+        self._cleanup_embedded_editor()
+        self._warm_hidden = True
+        self.hide()
+        logger.dbg("window hidden warm")
+
+    def discard(self) -> None:
+        """Tear the window down for good (profile switch or warm mode disabled)."""
+        self._discarding = True
+        if self.isVisible():
+            saveGeom(self, "ajpc_family_graph")
+        self._teardown()
+        self.hide()
+        self.deleteLater()
+
+    def _teardown(self) -> None:
+        if self._torn_down:
+            return
+        self._torn_down = True
+        try:
+            self._refresh_timer.stop()
+        except Exception:
+            pass
         try:
             self._sync_web_editor_panel_visibility(False)
         except Exception:
@@ -101,7 +173,12 @@ class FamilyGraphWindow(GraphBridgeHandlersMixin, GraphSyncMixin, EmbeddedEditor
         except Exception:
             pass
         self._cleanup_embedded_editor()
-        super().closeEvent(event)
+        try:
+            if mw is not None and getattr(mw, "_ajpc_family_graph_win", None) is self:
+                mw._ajpc_family_graph_win = None
+        except Exception:
+            pass
+        logger.dbg("window torn down")
 
     def _bind_note_add_hooks(self) -> None:
         hooks = []
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import os
+import time
 from typing import Any
 
 from aqt import mw
 
 from . import logger
+from .graph_config import load_graph_config
+from .graph_web_bundle import APP_CSS, APP_JS, VENDOR_JS, build_all
 
 ADDON_DIR = os.path.dirname(__file__)
 WEB_DIR = os.path.join(ADDON_DIR, "web")
@@ -28,12 +31,32 @@ def _web_base() -> str:
     return f"/_addons/{addon_id}/web"
 
 
+def web_asset_url(rel: str) -> str:
+    """URL the webview can fetch a file under web/ from ("" outside Anki)."""
+    web_base = _web_base()
+    return f"{web_base}/{rel}" if web_base else ""
+
+
+def _bundle_urls(asset_url) -> tuple[list[str], str] | None:
+    try:
+        start = time.perf_counter()
+        built = build_all()
+        logger.dbg("web bundle", built, "ms=", round((time.perf_counter() - start) * 1000.0, 1))
+    except Exception as exc:
+        logger.dbg("web bundle failed", str(exc))
+        return None
+    # content-hashed names need no mtime query
+    return [asset_url(built["vendor"], False), asset_url(built["app"], False)], asset_url(built["style"], False)
+
+
 def render_graph_html(_payload: dict[str, Any]) -> str:
     web_base = _web_base()
 
-    def asset_url(name: str) -> str:
+    def asset_url(name: str, versioned: bool = True) -> str:
         if not web_base:
             return ""
+        if not versioned:
+            return f"{web_base}/{name}"
         path = os.path.join(WEB_DIR, name)
         try:
             ver = int(os.path.getmtime(path))
@@ -41,41 +64,18 @@ def render_graph_html(_payload: dict[str, Any]) -> str:
         except Exception:
             return f"{web_base}/{name}"
 
+    bundled = _bundle_urls(asset_url) if load_graph_config().get("web_bundle", True) else None
+    if bundled is not None:
+        script_urls, css_url = bundled
+    else:
+        script_urls = [asset_url(name) for name in VENDOR_JS + APP_JS]
+        css_url = asset_url(APP_CSS[0])
+    scripts = "\n  ".join(f'<script src="{url}"></script>' for url in script_urls)
     replacements = {
-        "__GRAPH_CSS__": asset_url("graph.css"),
-        "__GRAPH_GRAPHOLOGY_SRC__": asset_url("libs/graphology.min.js"),
-        "__GRAPH_LAYOUT_SRC__": asset_url("libs/graphology-layout.bundle.js"),
-        "__GRAPH_D3_DISPATCH_SRC__": asset_url("libs/d3-dispatch.min.js"),
-        "__GRAPH_D3_QUADTREE_SRC__": asset_url("libs/d3-quadtree.min.js"),
-        "__GRAPH_D3_TIMER_SRC__": asset_url("libs/d3-timer.min.js"),
-        "__GRAPH_D3_FORCE_SRC__": asset_url("libs/d3-force.min.js"),
-        "__GRAPH_ENGINE_SRC__": asset_url("libs/sigma.min.js"),
-        "__GRAPH_SIGMA_PROGRAM_EDGE_CURVED_JS__": asset_url("sigma-programs/graph.sigma.program.edge.curved.js"),
-        "__GRAPH_SIGMA_PROGRAM_EDGE_DASHED_JS__": asset_url("sigma-programs/graph.sigma.program.edge.dashed.js"),
-        "__GRAPH_SIGMA_PROGRAM_EDGE_DOTTED_JS__": asset_url("sigma-programs/graph.sigma.program.edge.dotted.js"),
-        "__GRAPH_SIGMA_PROGRAM_NODE_NOTE_JS__": asset_url("sigma-programs/graph.sigma.program.node.note.js"),
-        "__GRAPH_SIGMA_PROGRAM_NODE_HUB_JS__": asset_url("sigma-programs/graph.sigma.program.node.hub.js"),
-        "__GRAPH_SIGMA_PROGRAM_EXTRA_CARDDOTS_JS__": asset_url("sigma-programs/graph.sigma.program.extra.carddots.js"),
-        "__GRAPH_SIGMA_PROGRAM_EXTRA_NODEFX_JS__": asset_url("sigma-programs/graph.sigma.program.extra.nodefx.js"),
-        "__GRAPH_STATE_JS__": asset_url("graph.state.js"),
-        "__GRAPH_BRIDGE_JS__": asset_url("graph.bridge.js"),
-        "__GRAPH_ADAPTER_JS__": asset_url("graph.adapter.js"),
-        "__GRAPH_UTILS_JS__": asset_url("graph.utils.js"),
-        "__GRAPH_PAYLOAD_JS__": asset_url("graph.payload.js"),
-        "__GRAPH_FLOW_JS__": asset_url("graph.flow.js"),
-        "__GRAPH_ENGINE_JS__": asset_url("graph.engine.sigma.js"),
-        "__GRAPH_DATA_JS__": asset_url("graph.data.graphology.js"),
-        "__GRAPH_SOLVER_JS__": asset_url("graph.solver.d3.js"),
-        "__GRAPH_RENDERER_JS__": asset_url("graph.renderer.sigma.js"),
-        "__GRAPH_UI_DEPTREE_JS__": asset_url("ui/graph.ui.deptree.js"),
-        "__GRAPH_UI_DEBUG_JS__": asset_url("ui/graph.ui.debug.js"),
-        "__GRAPH_UI_TOOLTIP_JS__": asset_url("ui/graph.ui.tooltip.js"),
-        "__GRAPH_UI_CTX_JS__": asset_url("ui/graph.ui.ctx.js"),
-        "__GRAPH_UI_EDITOR_JS__": asset_url("ui/graph.ui.editor.js"),
-        "__GRAPH_UI_JS__": asset_url("graph.ui.js"),
-        "__GRAPH_MAIN_JS__": asset_url("graph.main.js"),
+        "__GRAPH_CSS__": css_url,
+        "__GRAPH_SCRIPTS__": scripts,
     }
-    logger.dbg("web base", web_base, "graph main js", replacements.get("__GRAPH_MAIN_JS__", ""))
+    logger.dbg("web base", web_base, "bundled", bundled is not None, "scripts", len(script_urls))
 
     try:
         with open(os.path.join(WEB_DIR, "graph.html"), "r", encoding="utf-8") as handle:
@@ -0,0 +1,209 @@
+"""Concatenate the graph webview assets into content-hashed bundles.
+
+Used lazily by graph_web_assets when bundling is enabled, and runnable on its own
+(no Anki, no Node) to prebuild the bundles before packaging:
+
+    python graph_web_bundle.py
+
+Memory-bounded builds also stream their payload JSON into web/dist/ (write_payload_file)
+for the webview to fetch, instead of holding it as one string.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import uuid
+from typing import Any
+
+ADDON_DIR = os.path.dirname(os.path.abspath(__file__))
+WEB_DIR = os.path.join(ADDON_DIR, "web")
+DIST_DIR = os.path.join(WEB_DIR, "dist")
+
+# Load order matters: libraries, then sigma programs, then app modules (graph.main.js last).
+VENDOR_JS = (
+    "libs/graphology.min.js",
+    "libs/graphology-layout.bundle.js",
+    "libs/d3-dispatch.min.js",
+    "libs/d3-quadtree.min.js",
+    "libs/d3-timer.min.js",
+    "libs/d3-force.min.js",
+    "libs/sigma.min.js",
+)
+APP_JS = (
+    "sigma-programs/graph.sigma.program.edge.curved.js",
+    "sigma-programs/graph.sigma.program.edge.dashed.js",
+    "sigma-programs/graph.sigma.program.edge.dotted.js",
+    "sigma-programs/graph.sigma.program.node.note.js",
+    "sigma-programs/graph.sigma.program.node.hub.js",
+    "sigma-programs/graph.sigma.program.extra.carddots.js",
+    "sigma-programs/graph.sigma.program.extra.nodefx.js",
+    "graph.state.js",
+    "graph.bridge.js",
+    "graph.adapter.js",
+    "graph.utils.js",
+    "graph.payload.js",
+    "graph.flow.js",
+    "graph.engine.sigma.js",
+    "graph.data.graphology.js",
+    "graph.solver.d3.js",
+    "graph.renderer.sigma.js",
+    "ui/graph.ui.deptree.js",
+    "ui/graph.ui.debug.js",
+    "ui/graph.ui.tooltip.js",
+    "ui/graph.ui.ctx.js",
+    "ui/graph.ui.editor.js",
+    "graph.ui.js",
+    "graph.main.js",
+)
+APP_CSS = ("graph.css",)
+
+BUNDLES = (
+    ("vendor", "js", VENDOR_JS),
+    ("app", "js", APP_JS),
+    ("style", "css", APP_CSS),
+)
+
+_HASH_LEN = 12
+PAYLOAD_PREFIX = "graph.payload."
+# list items encoded per json.dumps call when streaming a payload
+PAYLOAD_BATCH_ITEMS = 2000
+# containers this deep are written piecewise (payload -> meta -> edge lists)
+_STREAM_DEPTH = 2
+# (bundle name) -> (source stamp, relative dist path); avoids re-reading sources per window open
+_BUILT: dict[str, tuple[tuple[tuple[str, int, int], ...], str]] = {}
+
+
+def _read_source(rel: str) -> str:
+    with open(os.path.join(WEB_DIR, rel), "r", encoding="utf-8-sig") as handle:
+        return handle.read()
+
+
+def _source_stamp(files: tuple[str, ...]) -> tuple[tuple[str, int, int], ...]:
+    out = []
+    for rel in files:
+        st = os.stat(os.path.join(WEB_DIR, rel))
+        out.append((rel, st.st_mtime_ns, st.st_size))
+    return tuple(out)
+
+
+def _concat(kind: str, files: tuple[str, ...]) -> str:
+    parts: list[str] = []
+    for rel in files:
+        text = _read_source(rel).rstrip()
+        if kind == "js":
+            # each file was its own <script>; keep statements from running into each other
+            parts.append(f"/* --- {rel} --- */\n{text}\n;\n")
+        else:
+            parts.append(f"/* --- {rel} --- */\n{text}\n")
+    return "".join(parts)
+
+
+def _prune(name: str, kind: str, keep: str) -> None:
+    prefix = f"graph.{name}."
+    try:
+        entries = os.listdir(DIST_DIR)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.startswith(prefix) and entry.endswith("." + kind) and entry != keep:
+            try:
+                os.remove(os.path.join(DIST_DIR, entry))
+            except OSError:
+                pass
+
+
+def build_bundle(name: str, kind: str, files: tuple[str, ...]) -> str:
+    """Write one bundle if its content changed and return its path relative to web/."""
+    stamp = _source_stamp(files)
+    cached = _BUILT.get(name)
+    if cached and cached[0] == stamp and os.path.exists(os.path.join(WEB_DIR, cached[1])):
+        return cached[1]
+    text = _concat(kind, files)
+    data = text.encode("utf-8")
+    digest = hashlib.sha1(data).hexdigest()[:_HASH_LEN]
+    filename = f"graph.{name}.{digest}.{kind}"
+    target = os.path.join(DIST_DIR, filename)
+    if not os.path.exists(target):
+        os.makedirs(DIST_DIR, exist_ok=True)
+        tmp = target + ".tmp"
+        with open(tmp, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp, target)
+    _prune(name, kind, filename)
+    rel = f"dist/{filename}"
+    _BUILT[name] = (stamp, rel)
+    return rel
+
+
+def build_all() -> dict[str, str]:
+    return {name: build_bundle(name, kind, files) for name, kind, files in BUNDLES}
+
+
+def _write_json(handle, encode, value: Any, depth: int) -> None:
+    if depth < _STREAM_DEPTH and isinstance(value, dict) and all(isinstance(k, str) for k in value):
+        handle.write("{")
+        for i, (key, item) in enumerate(value.items()):
+            handle.write(("," if i else "") + encode(key) + ":")
+            _write_json(handle, encode, item, depth + 1)
+        handle.write("}")
+    elif isinstance(value, list) and len(value) > PAYLOAD_BATCH_ITEMS:
+        # hand-written brackets around C-encoded batches; only one batch is in memory
+        handle.write("[")
+        for start in range(0, len(value), PAYLOAD_BATCH_ITEMS):
+            batch = encode(value[start : start + PAYLOAD_BATCH_ITEMS])
+            handle.write(("," if start else "") + batch[1:-1])
+        handle.write("]")
+    else:
+        handle.write(encode(value))
+
+
+def stream_json(value: Any, path: str) -> int:
+    """Encode ``value`` to ``path`` piecewise, never materialising the whole document; returns bytes written."""
+    # encode() takes the C encoder, unlike iterencode()
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8", newline="") as handle:
+        _write_json(handle, encode, value, 0)
+    os.replace(tmp, path)
+    return os.path.getsize(path)
+
+
+def write_payload_file(result: dict[str, Any]) -> tuple[str, int]:
+    """Stream a graph payload into web/dist/; returns (path relative to web/, bytes)."""
+    os.makedirs(DIST_DIR, exist_ok=True)
+    filename = f"{PAYLOAD_PREFIX}{uuid.uuid4().hex[:_HASH_LEN]}.json"
+    size = stream_json(result, os.path.join(DIST_DIR, filename))
+    return f"dist/{filename}", size
+
+
+def remove_payload_file(rel: str) -> None:
+    filename = os.path.basename(str(rel or ""))
+    # only ever delete our own payload files, whatever the webview sends back
+    if not filename.startswith(PAYLOAD_PREFIX) or not filename.endswith(".json"):
+        return
+    try:
+        os.remove(os.path.join(DIST_DIR, filename))
+    except OSError:
+        pass
+
+
+def prune_payload_files() -> None:
+    try:
+        entries = os.listdir(DIST_DIR)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.startswith(PAYLOAD_PREFIX):
+            try:
+                os.remove(os.path.join(DIST_DIR, entry))
+            except OSError:
+                pass
+
+
+if __name__ == "__main__":
+    for bundle_name, rel_path in build_all().items():
+        size = os.path.getsize(os.path.join(WEB_DIR, rel_path))
+        sys.stdout.write(f"{bundle_name}: web/{rel_path} ({size} bytes)\n")
@@ -1,27 +1,177 @@
 from __future__ import annotations
 
+import atexit
 import os
+import threading
 import time
+from collections import deque
 from typing import Any
 
 ADDON_DIR = os.path.dirname(__file__)
 LOG_PATH = os.path.join(ADDON_DIR, "ajpc-family-graph.log")
 
+DEBUG = 10
+INFO = 20
+WARN = 30
+ERROR = 40
+_LEVEL_NAMES = {"debug": DEBUG, "info": INFO, "warn": WARN, "warning": WARN, "error": ERROR}
+_LEVEL_TAGS = {DEBUG: "", INFO: "INFO ", WARN: "WARN ", ERROR: "ERROR "}
+_OFF = 100
+
+LOG_RING_SIZE = 5000
+LOG_FLUSH_INTERVAL = 0.5
+LOG_MAX_BYTES = 2 * 1024 * 1024
+LOG_BACKUPS = 2
+
 _ENABLED = False
+_LEVEL = DEBUG
+# Single threshold checked by every call; _OFF while disabled so callers bail on one compare.
+_MIN_LEVEL = _OFF
+
+# Records are (timestamp, level, line); the writer thread drains them in batches.
+_RING: deque[tuple[float, int, str]] = deque(maxlen=LOG_RING_SIZE)
+_RING_LOCK = threading.Lock()
+_WAKE = threading.Event()
+_WRITE_LOCK = threading.Lock()
+# _emit runs on the main and background threads; only one of them may start the writer
+_WRITER_LOCK = threading.Lock()
+_WRITER: threading.Thread | None = None
+_DROPPED = 0
+
+
+def _sync_threshold() -> None:
+    global _MIN_LEVEL
+    _MIN_LEVEL = _LEVEL if _ENABLED else _OFF
 
 
 def set_enabled(flag: bool) -> None:
     global _ENABLED
+    was_enabled = _ENABLED
     _ENABLED = bool(flag)
+    _sync_threshold()
+    if was_enabled and not _ENABLED:
+        flush()
 
 
-def dbg(*args: Any) -> None:
-    if not _ENABLED:
+def set_level(level: Any) -> None:
+    global _LEVEL
+    if isinstance(level, str):
+        value = _LEVEL_NAMES.get(level.strip().lower())
+    else:
+        try:
+            value = int(level)
+        except Exception:
+            value = None
+    if value is None:
         return
+    _LEVEL = value
+    _sync_threshold()
+
+
+def _ensure_writer() -> None:
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is not None and _WRITER.is_alive():
+            return
+        _WRITER = threading.Thread(target=_writer_loop, name="ajpc-graph-log", daemon=True)
+        _WRITER.start()
+
+
+def _emit(level: int, args: tuple[Any, ...]) -> None:
+    global _DROPPED
     try:
-        ts = time.strftime("%H:%M:%S")
         line = " ".join(str(a) for a in args)
-        with open(LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(f"[FamilyGraph {ts}] {line}\n")
+    except Exception:
+        return
+    with _RING_LOCK:
+        was_empty = not _RING
+        if len(_RING) >= LOG_RING_SIZE:
+            _DROPPED += 1
+        _RING.append((time.time(), level, line))
+    if _WRITER is None or not _WRITER.is_alive():
+        _ensure_writer()
+    # the first pending record starts the writer's flush interval; a half-full ring cuts it short
+    if was_empty or len(_RING) >= LOG_RING_SIZE // 2:
+        _WAKE.set()
+
+
+def dbg(*args: Any) -> None:
+    if _MIN_LEVEL > DEBUG:
+        return
+    _emit(DEBUG, args)
+
+
+def info(*args: Any) -> None:
+    if _MIN_LEVEL > INFO:
+        return
+    _emit(INFO, args)
+
+
+def warn(*args: Any) -> None:
+    if _MIN_LEVEL > WARN:
+        return
+    _emit(WARN, args)
+
+
+def error(*args: Any) -> None:
+    if _MIN_LEVEL > ERROR:
+        return
+    _emit(ERROR, args)
+
+
+def _rotate() -> None:
+    try:
+        if os.path.getsize(LOG_PATH) < LOG_MAX_BYTES:
+            return
+    except OSError:
+        return
+    try:
+        for i in range(LOG_BACKUPS - 1, 0, -1):
+            src = f"{LOG_PATH}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{LOG_PATH}.{i + 1}")
+        if LOG_BACKUPS > 0:
+            os.replace(LOG_PATH, f"{LOG_PATH}.1")
+        else:
+            os.remove(LOG_PATH)
     except Exception:
         pass
+
+
+def flush() -> None:
+    """Write all buffered records now (called by the writer thread and at exit)."""
+    global _DROPPED
+    with _WRITE_LOCK:
+        with _RING_LOCK:
+            if not _RING and not _DROPPED:
+                return
+            batch = list(_RING)
+            _RING.clear()
+            dropped = _DROPPED
+            _DROPPED = 0
+        try:
+            _rotate()
+            parts: list[str] = []
+            if dropped:
+                ts = time.strftime("%H:%M:%S")
+                parts.append(f"[FamilyGraph {ts}] WARN log ring overflow, dropped {dropped} records\n")
+            for stamp, level, line in batch:
+                ts = time.strftime("%H:%M:%S", time.localtime(stamp))
+                parts.append(f"[FamilyGraph {ts}] {_LEVEL_TAGS.get(level, '')}{line}\n")
+            with open(LOG_PATH, "a", encoding="utf-8") as f:
+                f.write("".join(parts))
+        except Exception:
+            pass
+
+
+def _writer_loop() -> None:
+    while True:
+        # idle (nothing pending, or logging disabled): block until a record arrives
+        _WAKE.wait()
+        _WAKE.clear()
+        _WAKE.wait(LOG_FLUSH_INTERVAL)
+        _WAKE.clear()
+        flush()
+
+
+atexit.register(flush)
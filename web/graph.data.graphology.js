@@ -190,6 +190,14 @@ function ajpcBuildSeedPositionMap(nodes) {
 
 window.AjpcBuildSeedPositionMap = ajpcBuildSeedPositionMap;
 
+// Edge keys are stable across updates: ordered endpoint pair plus occurrence (multi graph).
+function ajpcEdgeKey(sid, tid, pairCounts) {
+  var pair = sid + ">" + tid;
+  var n = pairCounts.get(pair) || 0;
+  pairCounts.set(pair, n + 1);
+  return "e:" + pair + "#" + n;
+}
+
 function AjpcGraphDataGraphology(owner) {
   this.owner = owner;
   this.graph = mkGraph();
@@ -266,6 +274,7 @@ AjpcGraphDataGraphology.prototype.buildGraph = function () {
   }
 
   var edgeCount = Math.floor(owner.linksFlat.length / 2);
+  var pairCounts = new Map();
   for (var e = 0; e < edgeCount; e += 1) {
     var s = Number(owner.linksFlat[e * 2]) | 0;
     var t = Number(owner.linksFlat[(e * 2) + 1]) | 0;
@@ -275,7 +284,7 @@ AjpcGraphDataGraphology.prototype.buildGraph = function () {
     var tid = owner.idByIndex[t];
     if (!sid || !tid) continue;
 
-    var edgeId = "e:" + e;
+    var edgeId = ajpcEdgeKey(sid, tid, pairCounts);
     var width = Number(owner.linkWidths[e]);
     if (!fin(width) || width <= 0) width = DES;
 
@@ -328,6 +337,7 @@ AjpcGraphDataGraphology.prototype.styleGraph = function () {
   var owner = this.owner;
   var graph = this.graph;
   if (!graph) return;
+  var sizesFrom = owner.pointSizesFrom && owner.pointSizesFrom.length === owner.pointSizes.length ? owner.pointSizesFrom : null;
 
   for (var i = 0; i < owner.idByIndex.length; i += 1) {
     var nodeId = owner.idByIndex[i];
@@ -338,9 +348,12 @@ AjpcGraphDataGraphology.prototype.styleGraph = function () {
     var type = owner._useCustomNodeTypes ? nodeTypeByCode(owner.pointTypeCodes, i) : "circle";
     var hidden = !fin(size) || size <= 0 || !fin(alpha) || alpha <= 0.001;
     if (!fin(size) || size <= 0) size = DNS;
+    var sizeFrom = sizesFrom ? Number(sizesFrom[i]) : size;
+    if (!fin(sizeFrom) || sizeFrom < 0) sizeFrom = size;
 
     graph.mergeNodeAttributes(nodeId, {
       size: size,
+      ajpc_size_from: sizeFrom,
       color: rgba(owner.pointColors, i, DNC),
       type: type,
       hidden: hidden
@@ -380,3 +393,171 @@ AjpcGraphDataGraphology.prototype.styleGraph = function () {
     });
   }
 };
+
+// Diff the owner arrays against the live graph by id: drop what is gone, add what is new and
+// merge attributes in place, so surviving nodes keep their solved x/y and velocity.
+AjpcGraphDataGraphology.prototype.patchGraph = function () {
+  var owner = this.owner;
+  var graph = this.graph;
+  var o = off();
+  var nodeCount = owner.idByIndex.length;
+  var changed = new Set();
+  var added = [];
+  var addedIds = new Set();
+  var keepNodes = new Set();
+  var i;
+
+  for (i = 0; i < nodeCount; i += 1) {
+    if (owner.idByIndex[i]) keepNodes.add(owner.idByIndex[i]);
+  }
+  var droppedNodes = [];
+  graph.forEachNode(function (id) {
+    if (!keepNodes.has(id)) droppedNodes.push(id);
+  });
+  droppedNodes.forEach(function (id) {
+    graph.forEachNeighbor(id, function (nb) { changed.add(nb); });
+    graph.dropNode(id);
+  });
+
+  for (i = 0; i < nodeCount; i += 1) {
+    var id = owner.idByIndex[i];
+    if (!id) continue;
+    var size = Number(owner.pointSizes[i]);
+    var alpha = Number(owner.pointColors[(i * 4) + 3] || 0);
+    var hidden = !fin(size) || size <= 0 || !fin(alpha) || alpha <= 0.001;
+    if (!fin(size) || size <= 0) size = DNS;
+    var attrs = {
+      size: size,
+      color: rgba(owner.pointColors, i, DNC),
+      type: owner._useCustomNodeTypes ? nodeTypeByCode(owner.pointTypeCodes, i) : "circle",
+      hidden: hidden,
+      zIndex: i
+    };
+    var extraAttrs = owner.nodeLayoutAttrsById && typeof owner.nodeLayoutAttrsById.get === "function"
+      ? owner.nodeLayoutAttrsById.get(String(id))
+      : null;
+    if (extraAttrs && typeof extraAttrs === "object") {
+      Object.keys(extraAttrs).forEach(function (k) {
+        // node fx (ring/ping) state is runtime-owned; keep it on surviving nodes
+        if (k.indexOf("ajpc_") === 0) return;
+        attrs[k] = extraAttrs[k];
+      });
+    }
+
+    if (graph.hasNode(id)) {
+      graph.mergeNodeAttributes(id, attrs);
+      var cur = graph.getNodeAttributes(id);
+      owner.pointPositions[i * 2] = Number(cur.x || 0) + o;
+      owner.pointPositions[(i * 2) + 1] = Number(cur.y || 0) + o;
+      continue;
+    }
+
+    var x = Number(owner.pointPositions[i * 2]);
+    var y = Number(owner.pointPositions[(i * 2) + 1]);
+    if (!fin(x) || !fin(y)) {
+      var seed = adapterSeededPos(id);
+      x = Number(seed[0]);
+      y = Number(seed[1]);
+    }
+    attrs.x = x - o;
+    attrs.y = y - o;
+    attrs.label = null;
+    attrs.forceLabel = false;
+    if (extraAttrs && typeof extraAttrs === "object") {
+      Object.keys(extraAttrs).forEach(function (k) {
+        if (k.indexOf("ajpc_") === 0) attrs[k] = extraAttrs[k];
+      });
+    }
+    graph.addNode(id, attrs);
+    added.push(i);
+    addedIds.add(id);
+    changed.add(id);
+  }
+
+  var edgeCount = Math.floor(owner.linksFlat.length / 2);
+  var pairCounts = new Map();
+  var keepEdges = new Set();
+  owner.edgeIdByIndex = [];
+  owner.edgeIndexById = new Map();
+  for (var e = 0; e < edgeCount; e += 1) {
+    var s = Number(owner.linksFlat[e * 2]) | 0;
+    var t = Number(owner.linksFlat[(e * 2) + 1]) | 0;
+    if (s < 0 || s >= nodeCount || t < 0 || t >= nodeCount || s === t) continue;
+    var sid = owner.idByIndex[s];
+    var tid = owner.idByIndex[t];
+    if (!sid || !tid) continue;
+
+    var edgeId = ajpcEdgeKey(sid, tid, pairCounts);
+    var width = Number(owner.linkWidths[e]);
+    if (!fin(width) || width <= 0) width = DES;
+    var styleCodeValue = styleCode(owner.linkStyleCodes, e);
+    var weight = Number(owner.linkStrength[e]);
+    if (!fin(weight) || weight <= 0) weight = 1;
+    var edgeAlpha = Number(owner.linkColors[(e * 4) + 3] || 0);
+    var edgeAttrs = {
+      size: width,
+      weight: weight,
+      color: rgbaM(owner.linkColors, e, DEC, alphaMul(styleCodeValue)),
+      type: edgeTypeByStyle(styleCodeValue),
+      curvature: adapterEdgeCurvByStyle(styleCodeValue, e),
+      hidden: !fin(width) || width <= 0 || !fin(edgeAlpha) || edgeAlpha <= 0.001,
+      ajpc_flow: (owner.linkFlowMask && owner.linkFlowMask.length > e && owner.linkFlowMask[e]) ? 1 : 0,
+      ajpc_bidir: (owner.linkBidirMask && owner.linkBidirMask.length > e && owner.linkBidirMask[e]) ? 1 : 0,
+      zIndex: e
+    };
+
+    try {
+      if (graph.hasEdge(edgeId)) {
+        graph.mergeEdgeAttributes(edgeId, edgeAttrs);
+      } else {
+        edgeAttrs.label = null;
+        edgeAttrs.forceLabel = false;
+        graph.addDirectedEdgeWithKey(edgeId, sid, tid, edgeAttrs);
+        changed.add(sid);
+        changed.add(tid);
+      }
+      keepEdges.add(edgeId);
+      owner.edgeIdByIndex[e] = edgeId;
+      owner.edgeIndexById.set(edgeId, e);
+    } catch (_e) {}
+  }
+
+  var droppedEdges = [];
+  graph.forEachEdge(function (edgeId, _attrs, sid, tid) {
+    if (keepEdges.has(edgeId)) return;
+    droppedEdges.push(edgeId);
+    changed.add(sid);
+    changed.add(tid);
+  });
+  droppedEdges.forEach(function (edgeId) { graph.dropEdge(edgeId); });
+
+  // new nodes start next to a surviving neighbour instead of at their seed
+  for (i = 0; i < added.length; i += 1) {
+    var nodeId = owner.idByIndex[added[i]];
+    var anchor = null;
+    graph.forEachNeighbor(nodeId, function (nb, nbAttrs) {
+      if (anchor || addedIds.has(nb)) return;
+      anchor = nbAttrs;
+    });
+    if (!anchor) continue;
+    var jitter = (Number(anchor.size) || DNS) * 2;
+    var ax = Number(anchor.x || 0) + ((Math.random() - 0.5) * jitter);
+    var ay = Number(anchor.y || 0) + ((Math.random() - 0.5) * jitter);
+    graph.mergeNodeAttributes(nodeId, { x: ax, y: ay });
+    owner.pointPositions[added[i] * 2] = ax + o;
+    owner.pointPositions[(added[i] * 2) + 1] = ay + o;
+  }
+
+  dbg("patch", {
+    nodes: nodeCount,
+    edges: edgeCount,
+    addedNodes: added.length,
+    droppedNodes: droppedNodes.length,
+    droppedEdges: droppedEdges.length,
+    changed: changed.size
+  });
+
+  var changedIds = [];
+  changed.forEach(function (id) { if (graph.hasNode(id)) changedIds.push(id); });
+  return { changedIds: changedIds };
+};
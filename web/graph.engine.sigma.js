@@ -49,7 +49,12 @@ var DEF_RENDERER = {
   sigma_max_camera_ratio: 6,
   sigma_side_margin: 0,
   sigma_animations_time: 180,
-  sigma_enable_edge_hovering: false
+  sigma_enable_edge_hovering: false,
+  sigma_lod_enabled: true,
+  sigma_lod_far_zoom: 0.35,
+  sigma_lod_cull_zoom: 1.5,
+  sigma_lod_cull_margin: 0.5,
+  sigma_flow_fps: 30
 };
 
 var DEF_ENGINE = {};
@@ -89,7 +94,12 @@ var SPEC_RENDERER = [
   { key: "sigma_max_camera_ratio", label: "Max Camera Ratio", type: "number", min: 0.0001, max: 100, step: 0.0001, affectsEngine: true },
   { key: "sigma_side_margin", label: "Side Margin", type: "number", min: 0, max: 512, step: 1, affectsEngine: true },
   { key: "sigma_animations_time", label: "Animations Time", type: "number", min: 0, max: 5000, step: 1, affectsEngine: true },
-  { key: "sigma_enable_edge_hovering", label: "Enable Edge Hovering", type: "bool", affectsEngine: true }
+  { key: "sigma_enable_edge_hovering", label: "Enable Edge Hovering", type: "bool", affectsEngine: true },
+  { key: "sigma_lod_enabled", label: "Level Of Detail", type: "bool", affectsEngine: true, hint: "Bundle family edges when zoomed out and cull off-screen edges when zoomed in." },
+  { key: "sigma_lod_far_zoom", label: "LOD Far Zoom", type: "number", min: 0, max: 64, step: 0.01, affectsEngine: true, hint: "Below this zoom, intra-family edges are bundled and card dots / node FX are hidden." },
+  { key: "sigma_lod_cull_zoom", label: "LOD Cull Zoom", type: "number", min: 0, max: 64, step: 0.01, affectsEngine: true, hint: "Above this zoom, edges outside the viewport are not drawn (0 disables)." },
+  { key: "sigma_lod_cull_margin", label: "LOD Cull Margin", type: "number", min: 0, max: 4, step: 0.05, affectsEngine: true, hint: "Extra viewport fraction kept around the culling box before edges are re-culled." },
+  { key: "sigma_flow_fps", label: "Flow FPS", type: "number", min: 0, max: 120, step: 1, affectsEngine: false, hint: "Redraw rate for edge flow animation (0 follows the display). Flow pauses while the window is unfocused or no flowing edge is on screen." }
 ];
 
 var SPEC_ENGINE = [];
@@ -361,7 +371,12 @@ function trRenderer(raw, prev) {
     sigma_max_camera_ratio: num(m.sigma_max_camera_ratio, DEF_RENDERER.sigma_max_camera_ratio, 0.0001, 100),
     sigma_side_margin: num(m.sigma_side_margin, DEF_RENDERER.sigma_side_margin, 0, 512),
     sigma_animations_time: it(m.sigma_animations_time, DEF_RENDERER.sigma_animations_time, 0, 5000),
-    sigma_enable_edge_hovering: bol(m.sigma_enable_edge_hovering, DEF_RENDERER.sigma_enable_edge_hovering)
+    sigma_enable_edge_hovering: bol(m.sigma_enable_edge_hovering, DEF_RENDERER.sigma_enable_edge_hovering),
+    sigma_lod_enabled: bol(m.sigma_lod_enabled, DEF_RENDERER.sigma_lod_enabled),
+    sigma_lod_far_zoom: num(m.sigma_lod_far_zoom, DEF_RENDERER.sigma_lod_far_zoom, 0, 64),
+    sigma_lod_cull_zoom: num(m.sigma_lod_cull_zoom, DEF_RENDERER.sigma_lod_cull_zoom, 0, 64),
+    sigma_lod_cull_margin: num(m.sigma_lod_cull_margin, DEF_RENDERER.sigma_lod_cull_margin, 0, 4),
+    sigma_flow_fps: num(m.sigma_flow_fps, DEF_RENDERER.sigma_flow_fps, 0, 120)
   };
 }
 
@@ -412,6 +427,7 @@ function SigmaGraphCompat(container, config) {
   this.pointPositions = [];
   this.pointColors = new Float32Array(0);
   this.pointSizes = new Float32Array(0);
+  this.pointSizesFrom = null;
   this.pointTypeCodes = new Uint8Array(0);
 
   this.linksFlat = new Float32Array(0);
@@ -433,6 +449,7 @@ function SigmaGraphCompat(container, config) {
 
   this.dataDirty = true;
   this.styleDirty = false;
+  this.deltaPending = false;
   this._useCustomNodeTypes = false;
 
   this.dataModel = new AjpcGraphDataGraphology(this);
@@ -489,6 +506,13 @@ function setFocusDimRuntime(active) {
   runtime.focusDimAlphaMul = 0.1;
 }
 
+function setSizeTweenRuntime(startMs, durationMs) {
+  var runtime = ensureSigmaRuntimeState();
+  if (!runtime) return;
+  var dur = Number(durationMs);
+  runtime.sizeTween = fin(dur) && dur > 0 ? { start: Number(startMs) || 0, dur: dur } : null;
+}
+
 function setFlowShaderRuntime(speed, spacingMul, radiusMul) {
   var runtime = ensureSigmaRuntimeState();
   if (!runtime) return;
@@ -636,11 +660,24 @@ SigmaGraphCompat.prototype._sync = function () {
     edgeCount: Math.floor(this.linksFlat.length / 2)
   });
 
+  if (this.dataDirty && this.deltaPending && this.graph.order > 0) {
+    this.deltaPending = false;
+    var delta = this.dataModel.patchGraph();
+    this.dataDirty = false;
+    this.styleDirty = false;
+    this.renderer.invalidateLod();
+    this.renderer.refresh();
+    if (this.runtimeSolver.layout_enabled && delta.changedIds.length) this.solver.reheat(delta.changedIds);
+    return;
+  }
+
   if (this.dataDirty) {
+    this.deltaPending = false;
     this.solver.stop(false);
     this.dataModel.buildGraph();
     this.dataDirty = false;
     this.styleDirty = false;
+    this.renderer.invalidateLod();
     this.renderer.refresh();
     if (this.runtimeSolver.layout_enabled) this.solver.start();
     return;
@@ -648,11 +685,17 @@ SigmaGraphCompat.prototype._sync = function () {
 
   this.dataModel.styleGraph();
   this.styleDirty = false;
+  this.renderer.invalidateLod();
   this.renderer.refresh();
 };
 
 SigmaGraphCompat.prototype.render = function () { this._sync(); };
+SigmaGraphCompat.prototype.setDataDelta = function (flag) { this.deltaPending = !!flag; };
 SigmaGraphCompat.prototype.requestFrame = function () { if (this.renderer) this.renderer.requestFrame(); };
+SigmaGraphCompat.prototype.flowEdgesOnScreen = function () {
+  if (!this.renderer || !this.linkFlowMask || !this.linkFlowMask.length) return false;
+  return this.renderer.maskedEdgesInViewport(this.linkFlowMask, 0.1);
+};
 SigmaGraphCompat.prototype.resize = function () { if (this.renderer) this.renderer.resize(); };
 
 SigmaGraphCompat.prototype.setPointIds = function (ids) {
@@ -783,7 +826,21 @@ SigmaGraphCompat.prototype.setLinkStyleCodes = function (arr) { this.linkStyleCo
 SigmaGraphCompat.prototype.setLinkFlowMask = function (arr) { this.linkFlowMask = (arr && arr.length) ? arr : new Uint8Array(0); this.styleDirty = true; };
 SigmaGraphCompat.prototype.setLinkBidirMask = function (arr) { this.linkBidirMask = (arr && arr.length) ? arr : new Uint8Array(0); this.styleDirty = true; };
 SigmaGraphCompat.prototype.setPointColors = function (arr) { this.pointColors = (arr && arr.length) ? arr : new Float32Array(0); this.styleDirty = true; };
-SigmaGraphCompat.prototype.setPointSizes = function (arr) { this.pointSizes = (arr && arr.length) ? arr : new Float32Array(0); this.styleDirty = true; };
+SigmaGraphCompat.prototype.setPointSizes = function (arr) { this.pointSizes = (arr && arr.length) ? arr : new Float32Array(0); this.pointSizesFrom = null; this.styleDirty = true; };
+// Upload start and end sizes once; the node programs interpolate them against the clock.
+SigmaGraphCompat.prototype.setPointSizeTween = function (from, to, startMs, durationMs) {
+  if (!this._useCustomNodeTypes || !this.renderer || !from || !to || from.length !== to.length) return false;
+  this.pointSizesFrom = from;
+  this.pointSizes = to;
+  this.styleDirty = true;
+  setSizeTweenRuntime(startMs, durationMs);
+  this.renderer.animateUntil(Number(startMs) + Number(durationMs));
+  return true;
+};
+SigmaGraphCompat.prototype.endPointSizeTween = function () {
+  setSizeTweenRuntime(0, 0);
+  this.requestFrame();
+};
 SigmaGraphCompat.prototype.setPointTypeCodes = function (arr) { this.pointTypeCodes = (arr && arr.length) ? arr : new Uint8Array(0); this.styleDirty = true; };
 SigmaGraphCompat.prototype.setLinkColors = function (arr) { this.linkColors = (arr && arr.length) ? arr : new Float32Array(0); this.styleDirty = true; };
 SigmaGraphCompat.prototype.setLinkWidths = function (arr) { this.linkWidths = (arr && arr.length) ? arr : new Float32Array(0); this.styleDirty = true; };
@@ -1042,12 +1099,46 @@ function setGraphPanelFocusClass(enabled) {
 
 function luma(r, g, b) { return (0.2126 * r) + (0.7152 * g) + (0.0722 * b); }
 
+function pointSizeAnimNow() {
+  return (window.performance && typeof window.performance.now === "function") ? window.performance.now() : Date.now();
+}
+
+function pointSizeEase(t) {
+  var x = t < 0 ? 0 : (t > 1 ? 1 : t);
+  return x < 0.5 ? (2 * x * x) : (1 - (Math.pow(-2 * x + 2, 2) / 2));
+}
+
+function pointSizeAnimRunning() {
+  if (!STATE.pointSizeAnimTarget) return false;
+  if (STATE.pointSizeAnimRaf) return true;
+  return !!STATE.pointSizeAnimFrom && pointSizeAnimNow() < (Number(STATE.pointSizeAnimStart || 0) + Number(STATE.pointSizeAnimDur || 0));
+}
+
 function stopPointSizeAnimation() {
   if (STATE.pointSizeAnimRaf) {
     window.cancelAnimationFrame(STATE.pointSizeAnimRaf);
     STATE.pointSizeAnimRaf = null;
   }
+  if (STATE.pointSizeAnimFrom && STATE.graph && typeof STATE.graph.endPointSizeTween === "function") {
+    STATE.graph.endPointSizeTween();
+  }
   STATE.pointSizeAnimTarget = null;
+  STATE.pointSizeAnimFrom = null;
+}
+
+// Sizes as currently drawn: mid-transition values while a shader tween is still running.
+function pointSizesOnScreen(current) {
+  var from = STATE.pointSizeAnimFrom;
+  var to = STATE.pointSizeAnimTarget;
+  if (!pointSizeAnimRunning() || !from || !to || from.length !== to.length || to.length !== current.length) {
+    return new Float32Array(current);
+  }
+  var k = pointSizeEase((pointSizeAnimNow() - Number(STATE.pointSizeAnimStart || 0)) / Math.max(1, Number(STATE.pointSizeAnimDur || 0)));
+  var out = new Float32Array(to.length);
+  for (var i = 0; i < out.length; i += 1) {
+    out[i] = Number(from[i] || 0) + ((Number(to[i] || 0) - Number(from[i] || 0)) * k);
+  }
+  return out;
 }
 
 function sizesEqualWithin(a, b, eps) {
@@ -1074,43 +1165,48 @@ function applyPointSizesAnimated(targetSizes, durationMs) {
     ? STATE.pointStyleSizes
     : new Float32Array(target);
 
-  if (sizesEqualWithin(current, target, 0.0005)) {
-    stopPointSizeAnimation();
-    STATE.pointStyleSizes = target;
-    STATE.graph.setPointSizes(target);
+  if (pointSizeAnimRunning() && sizesEqualWithin(STATE.pointSizeAnimTarget, target, 0.0005)) {
     return;
   }
 
-  if (STATE.pointSizeAnimRaf && STATE.pointSizeAnimTarget && sizesEqualWithin(STATE.pointSizeAnimTarget, target, 0.0005)) {
+  var from = pointSizesOnScreen(current);
+  if (sizesEqualWithin(from, target, 0.0005)) {
+    stopPointSizeAnimation();
+    STATE.pointStyleSizes = target;
+    STATE.graph.setPointSizes(target);
     return;
   }
 
   stopPointSizeAnimation();
-  var from = new Float32Array(current);
   var to = new Float32Array(target);
-  var work = new Float32Array(from.length);
   var dur = Math.max(60, Number(durationMs || 170));
-  var start = (window.performance && typeof window.performance.now === "function") ? window.performance.now() : Date.now();
+  var start = pointSizeAnimNow();
 
   STATE.pointSizeAnimTarget = to;
 
-  function easeInOut(t) {
-    var x = t < 0 ? 0 : (t > 1 ? 1 : t);
-    return x < 0.5 ? (2 * x * x) : (1 - (Math.pow(-2 * x + 2, 2) / 2));
+  // Preferred path: one upload of start/end sizes, the node shaders tween against the clock.
+  if (typeof STATE.graph.setPointSizeTween === "function" && STATE.graph.setPointSizeTween(from, to, start, dur)) {
+    STATE.pointSizeAnimFrom = from;
+    STATE.pointSizeAnimStart = start;
+    STATE.pointSizeAnimDur = dur;
+    STATE.pointStyleSizes = to;
+    return;
   }
 
+  var work = new Float32Array(from.length);
+
   function tick(ts) {
     if (!STATE.graph || typeof STATE.graph.setPointSizes !== "function") {
       stopPointSizeAnimation();
       return;
     }
     var now = Number(ts || 0);
-    if (!isFinite(now) || now <= 0) now = (window.performance && typeof window.performance.now === "function") ? window.performance.now() : Date.now();
+    if (!isFinite(now) || now <= 0) now = pointSizeAnimNow();
     var p = (now - start) / dur;
     if (!isFinite(p)) p = 1;
     if (p < 0) p = 0;
     if (p > 1) p = 1;
-    var k = easeInOut(p);
+    var k = pointSizeEase(p);
 
     for (var i = 0; i < work.length; i += 1) {
       work[i] = Number(from[i] || 0) + ((Number(to[i] || 0) - Number(from[i] || 0)) * k);
@@ -1195,9 +1291,21 @@ function updateInteractiveEdgeFlowMask(focus, selectedIndex, contextIndex, hover
     return true;
   }
 
-  var nextMask = new Uint8Array(edgeCount);
+  var cache = ensureFocusAdjCache();
+  var prevActive = Array.isArray(STATE.runtimeFlowActiveEdgeIndices) ? STATE.runtimeFlowActiveEdgeIndices : [];
+  // Own the interactive flow mask so it can be patched in place; arrays set elsewhere may be shared with the renderer.
+  var mask = cache.flowMask;
+  if (!mask || STATE.runtimeEdgeFlowMask !== mask) {
+    mask = new Uint8Array(edgeCount);
+    for (var pi = 0; pi < prevActive.length; pi += 1) {
+      var pv = Number(prevActive[pi]);
+      if (pv >= 0 && pv < edgeCount) mask[pv] = 1;
+    }
+    cache.flowMask = mask;
+  }
+  var stamp = cache.edgeStamp;
+  var epoch = nextEdgeStampEpoch(cache);
   var nextActive = [];
-  var seen = Object.create(null);
   var visibleMask = (STATE.runtimeEdgeVisibleMask && STATE.runtimeEdgeVisibleMask.length === edgeCount)
     ? STATE.runtimeEdgeVisibleMask
     : null;
@@ -1206,10 +1314,8 @@ function updateInteractiveEdgeFlowMask(focus, selectedIndex, contextIndex, hover
     var e = Number(edgeIdx);
     if (!isFinite(e) || e < 0 || e >= edgeCount) return;
     if (visibleMask && !visibleMask[e]) return;
-    var key = String(e);
-    if (seen[key]) return;
-    seen[key] = 1;
-    nextMask[e] = 1;
+    if (stamp[e] === epoch) return;
+    stamp[e] = epoch;
     nextActive.push(e);
   }
 
@@ -1218,14 +1324,14 @@ function updateInteractiveEdgeFlowMask(focus, selectedIndex, contextIndex, hover
       markEdge(focus.focusedEdgeIndices[fi]);
     }
   } else {
-    var cache = ensureFocusAdjCache();
-    var touchEdgesByNode = cache && cache.touchEdgesByNode ? cache.touchEdgesByNode : [];
+    var touchOffsets = cache.touchOffsets;
+    var touchEdges = cache.touchEdges;
+    var nodeCount = cache.nodeCount;
 
     function markTouchEdges(nodeIdx) {
       var n = Number(nodeIdx);
-      if (!isFinite(n) || n < 0 || n >= touchEdgesByNode.length) return;
-      var list = touchEdgesByNode[n] || [];
-      for (var i = 0; i < list.length; i += 1) markEdge(list[i]);
+      if (!isFinite(n) || n < 0 || n >= nodeCount) return;
+      for (var i = touchOffsets[n]; i < touchOffsets[n + 1]; i += 1) markEdge(touchEdges[i]);
     }
 
     markTouchEdges(selectedIndex);
@@ -1234,46 +1340,30 @@ function updateInteractiveEdgeFlowMask(focus, selectedIndex, contextIndex, hover
     markEdge(hoverLinkIndex);
   }
 
-  var prevActive = Array.isArray(STATE.runtimeFlowActiveEdgeIndices) ? STATE.runtimeFlowActiveEdgeIndices : [];
-  var diffSet = Object.create(null);
-  var diff = [];
+  // Patch the union of the old and new neighbourhoods; cost follows the touched degree, not the edge count.
+  var patches = [];
   var i;
-
   for (i = 0; i < prevActive.length; i += 1) {
     var p = Number(prevActive[i]);
-    if (!isFinite(p) || p < 0 || p >= edgeCount) continue;
-    var pk = String(p);
-    if (!diffSet[pk]) {
-      diffSet[pk] = 1;
-      diff.push(p);
-    }
+    if (!isFinite(p) || p < 0 || p >= edgeCount || stamp[p] === epoch) continue;
+    mask[p] = 0;
+    patches.push({ index: p, flow: 0 });
   }
   for (i = 0; i < nextActive.length; i += 1) {
-    var nidx = Number(nextActive[i]);
-    if (!isFinite(nidx) || nidx < 0 || nidx >= edgeCount) continue;
-    var nk = String(nidx);
-    if (!diffSet[nk]) {
-      diffSet[nk] = 1;
-      diff.push(nidx);
-    }
+    mask[nextActive[i]] = 1;
+    patches.push({ index: nextActive[i], flow: 1 });
   }
 
-  var changed = diff.length > 0;
+  var changed = patches.length > 0;
   if (changed) {
-    var patches = [];
-    for (i = 0; i < diff.length; i += 1) {
-      var de = Number(diff[i]);
-      if (!isFinite(de) || de < 0 || de >= edgeCount) continue;
-      patches.push({ index: de, flow: nextMask[de] ? 1 : 0 });
-    }
-    if (patches.length && typeof graph.patchLinkStylesBatch === "function") {
+    if (typeof graph.patchLinkStylesBatch === "function") {
       graph.patchLinkStylesBatch(patches, true);
     } else if (typeof graph.setLinkFlowMask === "function") {
-      graph.setLinkFlowMask(nextMask);
+      graph.setLinkFlowMask(new Uint8Array(mask));
     }
   }
 
-  STATE.runtimeEdgeFlowMask = nextMask;
+  STATE.runtimeEdgeFlowMask = mask;
   STATE.runtimeFlowActiveEdgeIndices = nextActive;
   return changed;
 }
@@ -1295,6 +1385,22 @@ function isFamilyEdgeLayer(layer) {
   return layer === "priority" || layer === "families";
 }
 
+// Adjacency as CSR (offsets + edge indices), rebuilt once per active dataset.
+// The mask buffers below are owned by the cache and updated as deltas.
+function csrFromPairs(count, owners, ownerCount) {
+  var offsets = new Int32Array(count + 1);
+  var i;
+  for (i = 0; i < ownerCount; i += 1) offsets[owners[i * 2] + 1] += 1;
+  for (i = 0; i < count; i += 1) offsets[i + 1] += offsets[i];
+  var fill = offsets.slice(0, count);
+  var items = new Int32Array(ownerCount);
+  for (i = 0; i < ownerCount; i += 1) {
+    items[fill[owners[i * 2]]] = owners[(i * 2) + 1];
+    fill[owners[i * 2]] += 1;
+  }
+  return { offsets: offsets, items: items };
+}
+
 function ensureFocusAdjCache() {
   var nodes = Array.isArray(STATE.activeNodes) ? STATE.activeNodes : [];
   var edges = Array.isArray(STATE.activeEdges) ? STATE.activeEdges : [];
@@ -1311,73 +1417,131 @@ function ensureFocusAdjCache() {
     return cached;
   }
 
-  var touchEdgesByNode = new Array(nodes.length);
-  var familyOutEdgesByNode = new Array(nodes.length);
-  var edgeSourceIndex = new Int32Array(edges.length);
-  var edgeTargetIndex = new Int32Array(edges.length);
-  var familyFidByEdge = new Array(edges.length);
+  var nodeCount = nodes.length;
+  var edgeCount = edges.length;
+  var edgeSourceIndex = new Int32Array(edgeCount);
+  var edgeTargetIndex = new Int32Array(edgeCount);
+  var familyFidByEdge = new Array(edgeCount);
+  var links = STATE.graph && STATE.graph.linksFlat ? STATE.graph.linksFlat : null;
+  var useLinks = !!(links && links.length === edgeCount * 2);
+  // (node, edge) pairs; each edge touches both endpoints, family edges walk outward
+  var touchPairs = new Int32Array(edgeCount * 4);
+  var touchCount = 0;
+  var familyPairs = new Int32Array(edgeCount * 4);
+  var familyCount = 0;
   var i;
 
-  for (i = 0; i < nodes.length; i += 1) {
-    touchEdgesByNode[i] = [];
-    familyOutEdgesByNode[i] = [];
-  }
   edgeSourceIndex.fill(-1);
   edgeTargetIndex.fill(-1);
 
-  for (i = 0; i < edges.length; i += 1) {
+  for (i = 0; i < edgeCount; i += 1) {
     var edge = edges[i];
     if (!edge) continue;
-    var s = byId.get(String(edge.source || ""));
-    var t = byId.get(String(edge.target || ""));
-    if (s === undefined || t === undefined) continue;
-    s = Number(s);
-    t = Number(t);
-    if (!isFinite(s) || !isFinite(t) || s < 0 || t < 0 || s >= nodes.length || t >= nodes.length) continue;
+    var s;
+    var t;
+    if (useLinks) {
+      s = Number(links[i * 2]) | 0;
+      t = Number(links[(i * 2) + 1]) | 0;
+    } else {
+      s = byId.get(String(edge.source || ""));
+      t = byId.get(String(edge.target || ""));
+      if (s === undefined || t === undefined) continue;
+      s = Number(s);
+      t = Number(t);
+      if (!isFinite(s) || !isFinite(t)) continue;
+    }
+    if (s < 0 || t < 0 || s >= nodeCount || t >= nodeCount) continue;
 
     edgeSourceIndex[i] = s;
     edgeTargetIndex[i] = t;
-    touchEdgesByNode[s].push(i);
-    touchEdgesByNode[t].push(i);
+    touchPairs[touchCount * 2] = s;
+    touchPairs[(touchCount * 2) + 1] = i;
+    touchCount += 1;
+    touchPairs[touchCount * 2] = t;
+    touchPairs[(touchCount * 2) + 1] = i;
+    touchCount += 1;
 
     if (isFamilyEdgeLayer(String(edge.layer || ""))) {
       var meta = edgeMeta(edge);
       var fid = String(meta && meta.fid !== undefined && meta.fid !== null ? meta.fid : "");
       familyFidByEdge[i] = fid;
-      familyOutEdgesByNode[s].push(i);
-      if (meta && meta.bidirectional) familyOutEdgesByNode[t].push(i);
+      familyPairs[familyCount * 2] = s;
+      familyPairs[(familyCount * 2) + 1] = i;
+      familyCount += 1;
+      if (meta && meta.bidirectional) {
+        familyPairs[familyCount * 2] = t;
+        familyPairs[(familyCount * 2) + 1] = i;
+        familyCount += 1;
+      }
     }
   }
 
+  var touch = csrFromPairs(nodeCount, touchPairs, touchCount);
+  var familyOut = csrFromPairs(nodeCount, familyPairs, familyCount);
+
   cached = {
     nodesRef: nodes,
     edgesRef: edges,
     byIdRef: byId,
-    nodeCount: nodes.length,
-    edgeCount: edges.length,
-    touchEdgesByNode: touchEdgesByNode,
-    familyOutEdgesByNode: familyOutEdgesByNode,
+    nodeCount: nodeCount,
+    edgeCount: edgeCount,
+    touchOffsets: touch.offsets,
+    touchEdges: touch.items,
+    familyOutOffsets: familyOut.offsets,
+    familyOutEdges: familyOut.items,
     edgeSourceIndex: edgeSourceIndex,
     edgeTargetIndex: edgeTargetIndex,
-    familyFidByEdge: familyFidByEdge
+    familyFidByEdge: familyFidByEdge,
+    focusNodeMask: new Uint8Array(nodeCount),
+    focusEdgeMask: new Uint8Array(edgeCount),
+    focusNodeList: [],
+    focusEdgeList: [],
+    appliedNodeMask: new Uint8Array(nodeCount),
+    appliedEdgeMask: new Uint8Array(edgeCount),
+    flowMask: null,
+    edgeStamp: new Uint32Array(edgeCount),
+    stampEpoch: 0
   };
   STATE.focusAdjCache = cached;
   return cached;
 }
 
+function nextEdgeStampEpoch(cache) {
+  cache.stampEpoch += 1;
+  if (cache.stampEpoch >= 0xFFFFFFFF) {
+    cache.edgeStamp.fill(0);
+    cache.stampEpoch = 1;
+  }
+  return cache.stampEpoch;
+}
+
+function resetMaskEntries(mask, list) {
+  for (var i = 0; i < list.length; i += 1) {
+    var idx = Number(list[i]);
+    if (idx >= 0 && idx < mask.length) mask[idx] = 0;
+  }
+}
+
 function buildSelectionFocusMasks(selectedIndices) {
   var nodes = Array.isArray(STATE.activeNodes) ? STATE.activeNodes : [];
   var edges = Array.isArray(STATE.activeEdges) ? STATE.activeEdges : [];
   var cache = ensureFocusAdjCache();
-  var touchEdgesByNode = cache.touchEdgesByNode || [];
-  var familyOutEdgesByNode = cache.familyOutEdgesByNode || [];
-  var edgeSourceIndex = cache.edgeSourceIndex || [];
-  var edgeTargetIndex = cache.edgeTargetIndex || [];
-  var familyFidByEdge = cache.familyFidByEdge || [];
-  var nodeMask = new Uint8Array(nodes.length);
-  var edgeMask = new Uint8Array(edges.length);
+  var touchOffsets = cache.touchOffsets;
+  var touchEdges = cache.touchEdges;
+  var familyOutOffsets = cache.familyOutOffsets;
+  var familyOutEdges = cache.familyOutEdges;
+  var edgeSourceIndex = cache.edgeSourceIndex;
+  var edgeTargetIndex = cache.edgeTargetIndex;
+  var familyFidByEdge = cache.familyFidByEdge;
+  // clear only the previous neighbourhood instead of reallocating the masks
+  var nodeMask = cache.focusNodeMask;
+  var edgeMask = cache.focusEdgeMask;
+  resetMaskEntries(nodeMask, cache.focusNodeList);
+  resetMaskEntries(edgeMask, cache.focusEdgeList);
   var focusedNodeIndices = [];
   var focusedEdgeIndices = [];
+  cache.focusNodeList = focusedNodeIndices;
+  cache.focusEdgeList = focusedEdgeIndices;
   var focusedNodeCount = 0, focusedEdgeCount = 0;
   var seeds = Array.isArray(selectedIndices) ? selectedIndices.slice() : [selectedIndices];
   var uniqueSeeds = [];
@@ -1424,13 +1588,11 @@ function buildSelectionFocusMasks(selectedIndices) {
     markNode(selectedIndex);
 
     // 1) Always keep direct neighbors of seed node.
-    var around = touchEdgesByNode[selectedIndex] || [];
-    for (var ai = 0; ai < around.length; ai += 1) {
-      var eIdx = Number(around[ai]);
-      if (!isFinite(eIdx) || eIdx < 0 || eIdx >= edges.length) continue;
-      var s = Number(edgeSourceIndex[eIdx]);
-      var t = Number(edgeTargetIndex[eIdx]);
-      if (!isFinite(s) || !isFinite(t) || s < 0 || t < 0) continue;
+    for (var ai = touchOffsets[selectedIndex]; ai < touchOffsets[selectedIndex + 1]; ai += 1) {
+      var eIdx = touchEdges[ai];
+      var s = edgeSourceIndex[eIdx];
+      var t = edgeTargetIndex[eIdx];
+      if (s < 0 || t < 0) continue;
       markEdge(eIdx);
       markNode(s);
       markNode(t);
@@ -1444,14 +1606,12 @@ function buildSelectionFocusMasks(selectedIndices) {
       var cur = Number(queue[qHead]);
       qHead += 1;
       if (!isFinite(cur) || cur < 0 || cur >= nodes.length) continue;
-      var outgoing = familyOutEdgesByNode[cur] || [];
-      for (var oi = 0; oi < outgoing.length; oi += 1) {
-        var e2 = Number(outgoing[oi]);
-        if (!isFinite(e2) || e2 < 0 || e2 >= edges.length) continue;
+      for (var oi = familyOutOffsets[cur]; oi < familyOutOffsets[cur + 1]; oi += 1) {
+        var e2 = familyOutEdges[oi];
         if (!edgeFamilyMatches(e2, selectedPrioKeys)) continue;
-        var s2 = Number(edgeSourceIndex[e2]);
-        var t2 = Number(edgeTargetIndex[e2]);
-        if (!isFinite(s2) || !isFinite(t2) || s2 < 0 || t2 < 0) continue;
+        var s2 = edgeSourceIndex[e2];
+        var t2 = edgeTargetIndex[e2];
+        if (s2 < 0 || t2 < 0) continue;
 
         var next = -1;
         if (s2 === cur) next = t2;
@@ -1614,6 +1774,9 @@ function hoverNodeStylePatchByIndex(idx) {
 }
 
 function clearAppliedFocusPatchState() {
+  var cache = STATE.focusAdjCache;
+  if (cache && STATE.appliedFocusNodeMask === cache.appliedNodeMask) resetMaskEntries(cache.appliedNodeMask, STATE.appliedFocusNodeIndices || []);
+  if (cache && STATE.appliedFocusEdgeMask === cache.appliedEdgeMask) resetMaskEntries(cache.appliedEdgeMask, STATE.appliedFocusEdgeIndices || []);
   STATE.appliedFocusNodeMask = new Uint8Array(0);
   STATE.appliedFocusEdgeMask = new Uint8Array(0);
   STATE.appliedFocusNodeIndices = [];
@@ -1624,10 +1787,20 @@ function clearAppliedFocusPatchState() {
 }
 
 function storeAppliedFocusPatchState(focus, selectedIndex, contextIndex, hoverIndex) {
-  STATE.appliedFocusNodeMask = focus && focus.nodeMask ? new Uint8Array(focus.nodeMask) : new Uint8Array(0);
-  STATE.appliedFocusEdgeMask = focus && focus.edgeMask ? new Uint8Array(focus.edgeMask) : new Uint8Array(0);
-  STATE.appliedFocusNodeIndices = focus && Array.isArray(focus.focusedNodeIndices) ? focus.focusedNodeIndices.slice() : [];
-  STATE.appliedFocusEdgeIndices = focus && Array.isArray(focus.focusedEdgeIndices) ? focus.focusedEdgeIndices.slice() : [];
+  var cache = ensureFocusAdjCache();
+  var nodeMask = cache.appliedNodeMask;
+  var edgeMask = cache.appliedEdgeMask;
+  var nodeList = focus && Array.isArray(focus.focusedNodeIndices) ? focus.focusedNodeIndices.slice() : [];
+  var edgeList = focus && Array.isArray(focus.focusedEdgeIndices) ? focus.focusedEdgeIndices.slice() : [];
+  var i;
+  if (STATE.appliedFocusNodeMask === nodeMask) resetMaskEntries(nodeMask, STATE.appliedFocusNodeIndices || []);
+  if (STATE.appliedFocusEdgeMask === edgeMask) resetMaskEntries(edgeMask, STATE.appliedFocusEdgeIndices || []);
+  for (i = 0; i < nodeList.length; i += 1) if (nodeList[i] >= 0 && nodeList[i] < nodeMask.length) nodeMask[nodeList[i]] = 1;
+  for (i = 0; i < edgeList.length; i += 1) if (edgeList[i] >= 0 && edgeList[i] < edgeMask.length) edgeMask[edgeList[i]] = 1;
+  STATE.appliedFocusNodeMask = nodeMask;
+  STATE.appliedFocusEdgeMask = edgeMask;
+  STATE.appliedFocusNodeIndices = nodeList;
+  STATE.appliedFocusEdgeIndices = edgeList;
   STATE.appliedSelectedIndex = Number(isFinite(selectedIndex) ? selectedIndex : -1);
   STATE.appliedContextIndex = Number(isFinite(contextIndex) ? contextIndex : -1);
   STATE.appliedHoverIndex = Number(isFinite(hoverIndex) ? hoverIndex : -1);
@@ -1651,10 +1824,12 @@ function tryApplyFocusStylePatch(nodeCtx, edgeCtx, focus, selectedIndex, context
   var nodeCount = STATE.activeNodes.length;
   var edgeCount = STATE.activeEdges.length;
   var hasFocus = !!(focus && focus.hasFocus);
-  var curNodeMask = (focus && focus.nodeMask && focus.nodeMask.length === nodeCount) ? focus.nodeMask : new Uint8Array(nodeCount);
-  var curEdgeMask = (focus && focus.edgeMask && focus.edgeMask.length === edgeCount) ? focus.edgeMask : new Uint8Array(edgeCount);
-  var prevNodeMask = (STATE.appliedFocusNodeMask && STATE.appliedFocusNodeMask.length === nodeCount) ? STATE.appliedFocusNodeMask : new Uint8Array(nodeCount);
-  var prevEdgeMask = (STATE.appliedFocusEdgeMask && STATE.appliedFocusEdgeMask.length === edgeCount) ? STATE.appliedFocusEdgeMask : new Uint8Array(edgeCount);
+  // nothing applied means the cache's applied masks are all zero, so they stand in for empty masks
+  var cache = ensureFocusAdjCache();
+  var curNodeMask = (focus && focus.nodeMask && focus.nodeMask.length === nodeCount) ? focus.nodeMask : cache.focusNodeMask;
+  var curEdgeMask = (focus && focus.edgeMask && focus.edgeMask.length === edgeCount) ? focus.edgeMask : cache.focusEdgeMask;
+  var prevNodeMask = (STATE.appliedFocusNodeMask && STATE.appliedFocusNodeMask.length === nodeCount) ? STATE.appliedFocusNodeMask : cache.appliedNodeMask;
+  var prevEdgeMask = (STATE.appliedFocusEdgeMask && STATE.appliedFocusEdgeMask.length === edgeCount) ? STATE.appliedFocusEdgeMask : cache.appliedEdgeMask;
 
   var prevFocusNodes = Array.isArray(STATE.appliedFocusNodeIndices) ? STATE.appliedFocusNodeIndices : [];
   var prevFocusEdges = Array.isArray(STATE.appliedFocusEdgeIndices) ? STATE.appliedFocusEdgeIndices : [];
@@ -2090,9 +2265,18 @@ function applyPhysicsToGraph() {
   STATE.engine = engineCfg;
   STATE.solver = solverCfg;
   STATE.renderer = rendererCfg;
+  STATE.appliedPhysicsKey = physicsConfigKey();
   STATE.graph.setConfig({ engine: engineCfg, solver: solverCfg, renderer: rendererCfg });
 }
 
+function physicsConfigKey() {
+  try {
+    return JSON.stringify([STATE.engine || {}, STATE.solver || {}, STATE.renderer || {}]);
+  } catch (_e) {
+    return "";
+  }
+}
+
 function ensureGraphInstance() {
   if (!SigmaApi) { if (DOM.graphEmpty) DOM.graphEmpty.textContent = "Sigma failed to load."; throw new Error("Sigma API not found"); }
   if (!GraphologyApi) { if (DOM.graphEmpty) DOM.graphEmpty.textContent = "Graphology failed to load."; throw new Error("Graphology API not found"); }
@@ -2167,8 +2351,25 @@ function ensureGraphInstance() {
 }
 
 function applyGraphData(fitView) {
+  var deltaUpdate = STATE.graphUpdateMode === "delta" && !!STATE.graph && STATE.activeNodes.length > 0;
+  STATE.graphUpdateMode = "";
   ensureGraphInstance();
-  applyPhysicsToGraph();
+  if (deltaUpdate) {
+    // keep solved positions for nodes that survive the update; setConfig would restart the solver
+    persistCurrentPositions();
+    var physicsCfg = {
+      engine: cityCollectEngineRuntimeSettings(STATE.engine || {}),
+      solver: cityCollectSolverSettings(STATE.solver || {}),
+      renderer: cityCollectRendererSettings(STATE.renderer || {})
+    };
+    var prevKey = STATE.appliedPhysicsKey;
+    STATE.engine = physicsCfg.engine;
+    STATE.solver = physicsCfg.solver;
+    STATE.renderer = physicsCfg.renderer;
+    if (physicsConfigKey() !== prevKey) applyPhysicsToGraph();
+  } else {
+    applyPhysicsToGraph();
+  }
   clearNodeFxPingTimers();
   STATE.nodeFxRingSelectedIndex = -1;
   STATE.nodeFxRingContextIndex = -1;
@@ -2226,6 +2427,7 @@ function applyGraphData(fitView) {
   STATE.hoverPatchedPointIndex = null;
   clearAppliedFocusPatchState();
 
+  if (typeof STATE.graph.setDataDelta === "function") STATE.graph.setDataDelta(deltaUpdate);
   if (typeof STATE.graph.setPointIds === "function") STATE.graph.setPointIds(arrays.idsByIndex);
   STATE.graph.setPointPositions(arrays.pointPositions);
   STATE.graph.setLinks(arrays.links);
@@ -2252,7 +2454,7 @@ function applyGraphData(fitView) {
   if (shouldFit && STATE.graph && typeof STATE.graph.fitView === "function") {
     STATE.graph.fitView(0, 0.1);
   }
-  if (STATE.solver && STATE.solver.layout_enabled && typeof STATE.graph.start === "function") STATE.graph.start();
+  if (!deltaUpdate && STATE.solver && STATE.solver.layout_enabled && typeof STATE.graph.start === "function") STATE.graph.start();
   cityEnsureFlowParticlesLoop();
 }
 
@@ -8,12 +8,35 @@ function flowClamp(v, minV, maxV) {
   return n;
 }
 
+var FLOW_FPS_DEFAULT = 30;
+var FLOW_SCREEN_CHECK_MS = 400;
+
 function stopFlowParticles() {
   if (STATE.flowRaf) {
     window.cancelAnimationFrame(STATE.flowRaf);
   }
+  if (STATE.flowTimer) {
+    window.clearTimeout(STATE.flowTimer);
+  }
   STATE.flowRaf = null;
+  STATE.flowTimer = null;
   STATE.flowStartTs = 0;
+  STATE.flowLastFrameTs = 0;
+}
+
+function flowTargetFps() {
+  var cfg = STATE.renderer && typeof STATE.renderer === "object" ? STATE.renderer : {};
+  var raw = cfg.sigma_flow_fps === undefined ? FLOW_FPS_DEFAULT : cfg.sigma_flow_fps;
+  return flowClamp(raw, 0, 120);
+}
+
+function flowSuspended() {
+  return !!(document.hidden || STATE.flowWindowBlurred);
+}
+
+function flowEdgesOnScreen() {
+  if (!STATE.graph || typeof STATE.graph.flowEdgesOnScreen !== "function") return true;
+  return !!STATE.graph.flowEdgesOnScreen();
 }
 
 function hasShaderFlowCandidates() {
@@ -35,17 +58,41 @@ function hasShaderFlowCandidates() {
   return false;
 }
 
+function scheduleFlowFrame() {
+  STATE.flowRaf = window.requestAnimationFrame(drawFlowShaderFrames);
+}
+
 function drawFlowShaderFrames(ts) {
-  if (!hasShaderFlowCandidates()) {
+  STATE.flowRaf = null;
+  if (!hasShaderFlowCandidates() || flowSuspended()) {
+    // focus/visibility listeners restart the loop
     stopFlowParticles();
     return;
   }
   if (!STATE.flowStartTs) STATE.flowStartTs = ts;
-  if (STATE.graph && typeof STATE.graph.requestFrame === "function") {
-    // Keep edge shader time uniforms moving even when layout is idle.
-    STATE.graph.requestFrame();
+  if (!STATE.flowCheckTs || (ts - STATE.flowCheckTs) >= FLOW_SCREEN_CHECK_MS) {
+    STATE.flowCheckTs = ts;
+    STATE.flowOnScreen = flowEdgesOnScreen();
   }
-  STATE.flowRaf = window.requestAnimationFrame(drawFlowShaderFrames);
+  if (!STATE.flowOnScreen) {
+    // nothing flowing in view: poll at the check interval instead of every frame
+    STATE.flowTimer = window.setTimeout(function () {
+      STATE.flowTimer = null;
+      scheduleFlowFrame();
+    }, FLOW_SCREEN_CHECK_MS);
+    return;
+  }
+  var fps = flowTargetFps();
+  var minGap = fps > 0 ? (1000 / fps) : 0;
+  // 1ms slack so a 30fps target on a 60Hz display lands on every other frame
+  if (!STATE.flowLastFrameTs || (ts - STATE.flowLastFrameTs) >= (minGap - 1)) {
+    STATE.flowLastFrameTs = ts;
+    if (STATE.graph && typeof STATE.graph.requestFrame === "function") {
+      // Keep edge shader time uniforms moving even when layout is idle.
+      STATE.graph.requestFrame();
+    }
+  }
+  scheduleFlowFrame();
 }
 
 function ensureFlowCanvasSize() {
@@ -53,16 +100,30 @@ function ensureFlowCanvasSize() {
 }
 
 function ensureFlowParticlesLoop() {
-  if (!hasShaderFlowCandidates()) {
+  if (!hasShaderFlowCandidates() || flowSuspended()) {
     stopFlowParticles();
     return;
   }
-  if (!STATE.flowRaf) {
+  if (!STATE.flowRaf && !STATE.flowTimer) {
     STATE.flowStartTs = 0;
-    STATE.flowRaf = window.requestAnimationFrame(drawFlowShaderFrames);
+    STATE.flowCheckTs = 0;
+    scheduleFlowFrame();
   }
 }
 
+(function bindFlowSuspension() {
+  window.addEventListener("blur", function () {
+    STATE.flowWindowBlurred = true;
+  });
+  window.addEventListener("focus", function () {
+    STATE.flowWindowBlurred = false;
+    ensureFlowParticlesLoop();
+  });
+  document.addEventListener("visibilitychange", function () {
+    if (!document.hidden) ensureFlowParticlesLoop();
+  });
+})();
+
 (function registerFlowAdapterPorts() {
   var adapter = window && window.GraphAdapter;
   if (!adapter || typeof adapter.registerCityPort !== "function") return;
@@ -17,9 +17,16 @@ function resolveApplyGraphData() {
 function applyPayload(payload, fitView) {
   STATE.raw = preparePayload(payload);
   if (STATE.depTreeCache && typeof STATE.depTreeCache.clear === "function") STATE.depTreeCache.clear();
-  STATE.depTreePendingNid = null;
+  STATE.depTreeIndex = null;
+  if (STATE.hubMembers && typeof STATE.hubMembers.clear === "function") STATE.hubMembers.clear();
   ensureRuntimeState();
   refreshUiOnly();
+  if (typeof setDebugBuildPerf === "function") setDebugBuildPerf(STATE.raw && STATE.raw.meta ? STATE.raw.meta.perf : null);
+  applyRawGraph(fitView);
+  reexpandHubs();
+}
+
+function applyRawGraph(fitView) {
   var applyFn = resolveApplyGraphData();
   if (!applyFn) {
     throw new Error("applyGraphData is not defined");
@@ -29,8 +36,16 @@ function applyPayload(payload, fitView) {
   log("engine render nodes=" + STATE.activeNodes.length + " edges=" + STATE.activeEdges.length);
 }
 
+function logStartupTiming() {
+  if (STATE.startupLogged || !window.performance || typeof window.performance.now !== "function") return;
+  STATE.startupLogged = true;
+  var scripts = document.getElementsByTagName("script").length;
+  log("startup first payload at " + window.performance.now().toFixed(1) + "ms scripts=" + scripts);
+}
+
 function boot(payload) {
   if (!DOM.graph) wireDom();
+  logStartupTiming();
   try {
     applyPayload(payload, STATE.isFirstRender);
   } catch (err) {
@@ -42,13 +57,186 @@ function boot(payload) {
 }
 
 window.ajpcGraphInit = function (data) {
+  STATE.graphUpdateMode = "";
   boot(data || {});
 };
 
+// Updates are diffed against the live graph by id instead of rebuilding it.
 window.ajpcGraphUpdate = function (data) {
+  STATE.graphUpdateMode = "delta";
   boot(data || {});
 };
 
+// Memory-bounded builds stream the payload to a file under web/ instead of inlining it;
+// JSON.parse on the fetched text avoids compiling one huge script literal.
+window.ajpcGraphLoadUrl = function (url, name, mode) {
+  var release = function () {
+    if (window.pycmd) window.pycmd("payload:done:" + String(name || ""));
+  };
+  fetch(url, { cache: "no-store" })
+    .then(function (res) {
+      if (!res.ok) throw new Error("payload fetch failed " + res.status);
+      return res.json();
+    })
+    .then(function (data) {
+      release();
+      if (mode === "update" && window.ajpcGraphUpdate) {
+        window.ajpcGraphUpdate(data);
+        if (window.pycmd) window.pycmd("log:graph update called");
+      } else {
+        window.ajpcGraphInit(data);
+        if (window.pycmd) window.pycmd("log:graph init called");
+      }
+    })
+    .catch(function (err) {
+      release();
+      if (DOM.graphEmpty) DOM.graphEmpty.textContent = "Graph load failed: " + String(err && err.message ? err.message : err);
+      log("payload load failed " + String(err));
+    });
+};
+
+// Hub members are not part of the payload; they are paged in from Python on demand.
+function hubMembersEntry(hubId) {
+  var key = String(hubId || "");
+  if (!(STATE.hubMembers instanceof Map)) STATE.hubMembers = new Map();
+  var entry = STATE.hubMembers.get(key);
+  if (!entry) {
+    entry = { hubId: key, nodes: [], edges: [], totalNodes: 0, totalEdges: 0, loading: false, complete: false, callbacks: [] };
+    STATE.hubMembers.set(key, entry);
+  }
+  return entry;
+}
+
+function requestHubMembers(hubId, done) {
+  var entry = hubMembersEntry(hubId);
+  if (entry.complete) {
+    if (typeof done === "function") done(entry);
+    return;
+  }
+  if (typeof done === "function") entry.callbacks.push(done);
+  if (entry.loading) return;
+  entry.loading = true;
+  entry.error = "";
+  if (window.pycmd) window.pycmd("hub:expand:" + encodeURIComponent(entry.hubId) + ":0");
+}
+
+function finishHubMembers(entry) {
+  entry.loading = false;
+  var callbacks = entry.callbacks.splice(0);
+  callbacks.forEach(function (cb) {
+    try { cb(entry); } catch (_e) {}
+  });
+}
+
+function isHubExpanded(hubId) {
+  return STATE.expandedHubs instanceof Set && STATE.expandedHubs.has(String(hubId || ""));
+}
+
+// Members go into STATE.raw next to their hub (tagged hubMemberOf) and reach the engine
+// through the same delta path as ajpcGraphUpdate; collapsing filters them out again.
+function setHubExpanded(hubId, expanded) {
+  var key = String(hubId || "");
+  if (!key || !STATE.raw) return;
+  if (!(STATE.expandedHubs instanceof Set)) STATE.expandedHubs = new Set();
+  var raw = STATE.raw;
+  var nodes = raw.nodes.filter(function (n) { return n.hubMemberOf !== key; });
+  var edges = raw.edges.filter(function (e) { return e.hubMemberOf !== key; });
+  var entry = expanded ? hubMembersEntry(key) : null;
+  if (entry && entry.complete) {
+    var have = new Set();
+    nodes.forEach(function (n) { have.add(n.id); });
+    if (!have.has(key)) return;
+    entry.nodes.forEach(function (row) {
+      var node = normalizeNode(row);
+      if (!node.id || have.has(node.id)) return;
+      node.hubMemberOf = key;
+      have.add(node.id);
+      nodes.push(node);
+      var link = normalizeEdge({ source: key, target: node.id, layer: "mass_links", meta: { hub_member: true } });
+      link.hubMemberOf = key;
+      edges.push(link);
+    });
+    entry.edges.forEach(function (e) {
+      if (!have.has(e.source) || !have.has(e.target)) return;
+      edges.push({ source: e.source, target: e.target, layer: e.layer, meta: e.meta, hubMemberOf: key });
+    });
+    STATE.expandedHubs.add(key);
+  } else {
+    STATE.expandedHubs.delete(key);
+  }
+  STATE.raw = { nodes: nodes, edges: dedupeEdges(edges), meta: raw.meta };
+  if (STATE.depTreeCache && typeof STATE.depTreeCache.clear === "function") STATE.depTreeCache.clear();
+  STATE.depTreeIndex = null;
+  ensureRuntimeState();
+  refreshUiOnly();
+  STATE.graphUpdateMode = "delta";
+  applyRawGraph(false);
+}
+
+function expandHub(hubId, done) {
+  requestHubMembers(hubId, function (entry) {
+    // a payload that arrived meanwhile dropped this entry and re-requests on its own
+    if (entry.complete && STATE.hubMembers.get(entry.hubId) === entry) setHubExpanded(entry.hubId, true);
+    if (typeof done === "function") done(entry);
+  });
+}
+
+// A new payload comes without members; expanded hubs that still exist are reloaded.
+function reexpandHubs() {
+  if (!(STATE.expandedHubs instanceof Set) || !STATE.expandedHubs.size || !STATE.raw) return;
+  var present = new Set();
+  STATE.raw.nodes.forEach(function (n) { present.add(n.id); });
+  Array.from(STATE.expandedHubs).forEach(function (hubId) {
+    if (present.has(hubId)) expandHub(hubId);
+    else STATE.expandedHubs.delete(hubId);
+  });
+}
+
+function hubColumnsToRows(columns, keys) {
+  var cols = columns && typeof columns === "object" ? columns : {};
+  var names = keys || Object.keys(cols);
+  var first = names.length ? cols[names[0]] : null;
+  var len = Array.isArray(first) ? first.length : 0;
+  var rows = new Array(len);
+  for (var i = 0; i < len; i += 1) {
+    var row = {};
+    for (var k = 0; k < names.length; k += 1) {
+      var col = cols[names[k]];
+      if (Array.isArray(col) && col[i] !== undefined && col[i] !== null) row[names[k]] = col[i];
+    }
+    rows[i] = row;
+  }
+  return rows;
+}
+
+window.ajpcHubMembersFromPy = function (batch) {
+  if (!batch || typeof batch !== "object") return;
+  var entry = hubMembersEntry(batch.hub_id);
+  if (batch.error) {
+    entry.error = String(batch.error);
+    entry.complete = false;
+    finishHubMembers(entry);
+    return;
+  }
+  var page = Number(batch.page || 0);
+  if (page === 0) {
+    entry.nodes = [];
+    entry.edges = [];
+  }
+  Array.prototype.push.apply(entry.nodes, hubColumnsToRows(batch.nodes));
+  hubColumnsToRows(batch.edges, ["source", "target", "layer", "meta"]).forEach(function (e) {
+    entry.edges.push(normalizeEdge(e));
+  });
+  entry.totalNodes = Number(batch.total_nodes || 0);
+  entry.totalEdges = Number(batch.total_edges || 0);
+  if (batch.has_more) {
+    if (window.pycmd) window.pycmd("hub:expand:" + encodeURIComponent(entry.hubId) + ":" + String(page + 1));
+    return;
+  }
+  entry.complete = true;
+  finishHubMembers(entry);
+};
+
 if (document.readyState === "loading") {
   document.addEventListener("DOMContentLoaded", function () {
     wireDom();
@@ -531,6 +531,87 @@ function dedupeEdges(edges) {
   return out;
 }
 
+// Optional style columns from Python (meta.packed_styles), aligned with payload nodes/edges.
+function attachPackedStyles(nodes, edges, packed) {
+  if (!packed || typeof packed !== "object") return;
+  var rgba = packed.node_rgba;
+  var sizes = packed.node_size;
+  var types = packed.node_type;
+  var i;
+  if (Array.isArray(rgba) && Array.isArray(sizes) && Array.isArray(types)
+      && rgba.length === nodes.length && sizes.length === nodes.length && types.length === nodes.length) {
+    for (i = 0; i < nodes.length; i += 1) {
+      nodes[i].packedRgba = Number(rgba[i]) >>> 0;
+      nodes[i].packedBaseSize = Number(sizes[i]);
+      nodes[i].packedTypeCode = Number(types[i]) | 0;
+    }
+  }
+  var edgeRgba = packed.edge_rgba;
+  var edgeStyle = packed.edge_style;
+  if (Array.isArray(edgeRgba) && Array.isArray(edgeStyle)
+      && edgeRgba.length === edges.length && edgeStyle.length === edges.length) {
+    for (i = 0; i < edges.length; i += 1) {
+      edges[i].packedRgba = Number(edgeRgba[i]) >>> 0;
+      edges[i].packedStyle = Number(edgeStyle[i]) | 0;
+    }
+  }
+}
+
+function attachLayerDegreeRows(nodes, degrees) {
+  if (!degrees || typeof degrees !== "object") return;
+  var layers = degrees.layers;
+  var counts = degrees.counts;
+  if (!Array.isArray(layers) || !Array.isArray(counts) || counts.length !== nodes.length * layers.length) return;
+  for (var i = 0; i < nodes.length; i += 1) nodes[i].layerDegreeRow = i;
+}
+
+function packedLookupMatches(table, current) {
+  if (!table || typeof table !== "object") return true;
+  var keys = Object.keys(table);
+  for (var i = 0; i < keys.length; i += 1) {
+    if (current(keys[i]) !== table[keys[i]]) return false;
+  }
+  return true;
+}
+
+// Packed colours were resolved from the payload's settings; runtime edits make them stale.
+function packedStylesUsable() {
+  var meta = STATE.raw && STATE.raw.meta ? STATE.raw.meta : null;
+  var packed = meta && meta.packed_styles && typeof meta.packed_styles === "object" ? meta.packed_styles : null;
+  if (!packed) return false;
+  var lookups = packed.lookups && typeof packed.lookups === "object" ? packed.lookups : {};
+  return packedLookupMatches(lookups.note_types, function (id) {
+    var nt = STATE.noteTypes[id];
+    return nt && nt.color ? normalizeHexColor(nt.color, "") : "";
+  }) && packedLookupMatches(lookups.layer_colors, function (layer) {
+    return normalizeHexColor(STATE.layerColors[layer] || fallbackLayerColor(layer), "");
+  }) && packedLookupMatches(lookups.link_colors, function (layer) {
+    return normalizeHexColor((STATE.linkColors && STATE.linkColors[layer]) || fallbackLayerColor(layer), "");
+  }) && packedLookupMatches(lookups.layer_styles, function (layer) {
+    return linkStyleCode({ layer: layer });
+  });
+}
+
+function unpackRgba(value) {
+  var v = Number(value) >>> 0;
+  return [((v >>> 24) & 255) / 255, ((v >>> 16) & 255) / 255, ((v >>> 8) & 255) / 255, (v & 255) / 255];
+}
+
+function styledNodeColor(node, usePacked) {
+  if (usePacked && node && node.packedRgba !== undefined) return unpackRgba(node.packedRgba);
+  return nodeColor(node);
+}
+
+function styledLinkColor(edge, usePacked) {
+  if (usePacked && edge && edge.packedRgba !== undefined) return unpackRgba(edge.packedRgba);
+  return linkColor(edge);
+}
+
+function styledLinkStyleCode(edge, usePacked) {
+  if (usePacked && edge && edge.packedStyle !== undefined) return edge.packedStyle;
+  return linkStyleCode(edge);
+}
+
 function preparePayload(payload) {
   var raw = payload && typeof payload === "object" ? payload : {};
   var meta = raw.meta && typeof raw.meta === "object" ? raw.meta : {};
@@ -538,6 +619,8 @@ function preparePayload(payload) {
   var baseNodes = Array.isArray(raw.nodes) ? raw.nodes.map(normalizeNode) : [];
   var baseEdges = Array.isArray(raw.edges) ? raw.edges.map(normalizeEdge) : [];
   var extraEdges = mergeExtraEdgeSets(meta);
+  attachPackedStyles(baseNodes, baseEdges, meta.packed_styles);
+  attachLayerDegreeRows(baseNodes, meta.layer_degrees);
 
   return {
     nodes: baseNodes,
@@ -786,54 +869,6 @@ function edgeAllowedByLayer(edge) {
   return !!STATE.layers[edge.layer];
 }
 
-function buildActiveData() {
-  var nodes = STATE.raw.nodes;
-  var edges = STATE.raw.edges;
-
-  var filteredEdges = edges.filter(edgeAllowedByLayer);
-  var touchedByLayer = new Set();
-
-  filteredEdges.forEach(function (edge) {
-    touchedByLayer.add(edge.source);
-    touchedByLayer.add(edge.target);
-  });
-
-  var visibleNodes = nodes.filter(function (node) {
-    if (!nodeAllowedByNoteType(node)) return false;
-    var baseAllowed = nodeAllowedByLayer(node);
-    var bridgedFromNotes = !baseAllowed && touchedByLayer.has(node.id) && nodeHasLayer(node, "notes");
-    if (!baseAllowed && !bridgedFromNotes) return false;
-    if (STATE.showUnlinked) return baseAllowed ? true : touchedByLayer.has(node.id);
-    if (baseAllowed && nodeHasNodeOnlyLayer(node)) return true;
-    return touchedByLayer.has(node.id);
-  });
-
-  var visibleSet = new Set(visibleNodes.map(function (n) { return n.id; }));
-  var visibleEdges = filteredEdges.filter(function (edge) {
-    return visibleSet.has(edge.source) && visibleSet.has(edge.target);
-  });
-
-  if (!STATE.showUnlinked) {
-    var linked = new Set();
-    visibleEdges.forEach(function (edge) {
-      linked.add(edge.source);
-      linked.add(edge.target);
-    });
-    visibleNodes = visibleNodes.filter(function (node) {
-      if (linked.has(node.id)) return true;
-      // Keep notes nodes that are referenced by active edge layers even when
-      // opposite endpoints are hidden by other layer toggles (e.g. priority-only).
-      return touchedByLayer.has(node.id) && nodeHasLayer(node, "notes");
-    });
-    visibleSet = new Set(visibleNodes.map(function (n) { return n.id; }));
-    visibleEdges = visibleEdges.filter(function (edge) {
-      return visibleSet.has(edge.source) && visibleSet.has(edge.target);
-    });
-  }
-
-  return { nodes: visibleNodes, edges: visibleEdges };
-}
-
 function nodeColor(node) {
   var color = "";
 
@@ -862,6 +897,7 @@ function nodeColor(node) {
 }
 
 function ajpcNodeBaseSize(node) {
+  if (node && typeof node.packedBaseSize === "number" && node.packedBaseSize > 0) return node.packedBaseSize;
   var base = 1.5;
   if (node.kind === "family") base = 1;
   else if (node.kind === "note_type_hub") base = 1;
@@ -904,6 +940,39 @@ function buildNodeDegreeArray(nodeCount, edgeRecords, edgeVisibleMask) {
   return out;
 }
 
+// Visible degree as a dot product of enabled layers against each node's build-time counts.
+// Exact only while every node with an enabled edge is visible; returns null otherwise.
+function layerDegreeDot(nodes, edges, indexById, nodeVisible) {
+  var vis = STATE.visibilityIndex;
+  if (!vis || vis.nodesRef !== nodes || vis.edgesRef !== edges || vis.byIdRef !== indexById) return null;
+  var ld = vis.layerDegree;
+  if (!ld || ld.rows.length !== nodes.length) return null;
+  var width = ld.width;
+  var weights = new Float32Array(width);
+  for (var b = 0; b < vis.layerKeys.length; b += 1) {
+    var col = ld.colByBit[b];
+    var key = vis.layerKeys[b];
+    if (col >= 0 && Object.prototype.hasOwnProperty.call(STATE.layers, key) && STATE.layers[key]) weights[col] = 1;
+  }
+  if (ld.noLayerCol >= 0) weights[ld.noLayerCol] = 1;
+
+  var counts = ld.counts;
+  var out = new Float32Array(nodes.length);
+  for (var i = 0; i < nodes.length; i += 1) {
+    var base = ld.rows[i] * width;
+    var sum = 0;
+    for (var c = 0; c < width; c += 1) {
+      if (weights[c]) sum += weights[c] * Number(counts[base + c] || 0);
+    }
+    if (!nodeVisible[i]) {
+      if (sum > 0) return null;
+      continue;
+    }
+    out[i] = sum;
+  }
+  return out;
+}
+
 function nodeSize(node, degree) {
   var base = Number(ajpcNodeBaseSize(node));
   if (!isFinite(base) || base <= 0) base = 1;
@@ -913,6 +982,7 @@ function nodeSize(node, degree) {
   return base * (1 + (k * Math.sqrt(d)));
 }
 function nodeRenderTypeCode(node) {
+  if (node && node.packedTypeCode !== undefined) return node.packedTypeCode;
   if (node && node.kind === "note") return 0;
   return 1;
 }
@@ -1033,12 +1103,17 @@ function cloneEdgeForRender(edge, forceBidirectional) {
   if (forceBidirectional) {
     meta.bidirectional = true;
   }
-  return {
+  var out = {
     source: String(edge && edge.source !== undefined && edge.source !== null ? edge.source : ""),
     target: String(edge && edge.target !== undefined && edge.target !== null ? edge.target : ""),
     layer: String(edge && edge.layer ? edge.layer : ""),
     meta: meta
   };
+  if (edge && edge.packedRgba !== undefined) {
+    out.packedRgba = edge.packedRgba;
+    out.packedStyle = edge.packedStyle;
+  }
+  return out;
 }
 
 function collapseEdgesForRendering(edges) {
@@ -1146,7 +1221,15 @@ function resolveBaseLinkWeight(edge) {
 }
 
 function resolveBaseLinkStrength(edge) {
-  return 1;
+  // Build-time edge weights (kanji TF-IDF) and degree damping scale the solver pull;
+  // edges outside the link MST backbone are drawn but do not pull.
+  var meta = edgeMeta(edge);
+  if (meta.render_only) return 0;
+  var weight = Number(meta.weight);
+  if (!isFinite(weight) || weight < 0) weight = 1;
+  var damping = Number(meta.strength);
+  if (!isFinite(damping) || damping < 0) damping = 1;
+  return clamp(weight, 0, 1) * clamp(damping, 0, 1);
 }
 
 function resolveTrailingHubDistance() {
@@ -1457,7 +1540,7 @@ function buildAlgorithmicLinkScalars(edgeRecords, nodeCount, baseStrengths) {
     var metric = Number(metrics[i] || 0);
     var metricScale = strengthScaleFromMetric(metric);
     distances[i] = clamp(baseDistance * lengthWeight * distanceScaleFromMetric(metric), 1, 5000);
-    strengths[i] = clamp((activeStrength > 0 ? metricScale : 0), 0, 50);
+    strengths[i] = clamp(activeStrength * metricScale, 0, 50);
   }
 
   applyTrailingHubDistances(edgeRecords, distances, baseStrengths);
@@ -1509,7 +1592,7 @@ function buildLinkScalarArrays(edgeRecords, baseStrengths) {
     var metricScale = strengthScaleFromMetric(metric);
 
     distances[i] = clamp(baseDistance * lengthWeight * distanceScaleFromMetric(metric) * LINK_SCALAR_DISTANCE_SCALE, 1, 5000);
-    strengths[i] = clamp((activeStrength > 0 ? metricScale : 0) * LINK_SCALAR_STRENGTH_SCALE, 0, 50);
+    strengths[i] = clamp(activeStrength * metricScale * LINK_SCALAR_STRENGTH_SCALE, 0, 50);
   }
 
   applyTrailingHubDistances(edgeRecords, distances, baseStrengths);
@@ -1533,6 +1616,7 @@ function buildGraphArrays(active) {
   var edges = collapseEdgesForRendering(active.edges || []);
   var suppressHubDirectMask = buildFamilyHubDirectSuppressMask(edges);
   var externalSeedMap = buildExternalSeedMap(nodes);
+  var usePacked = packedStylesUsable();
 
   var indexById = new Map();
   var idsByIndex = [];
@@ -1557,7 +1641,7 @@ function buildGraphArrays(active) {
       px = Number(fallback[0]);
       py = Number(fallback[1]);
     }
-    var col = nodeColor(node);
+    var col = styledNodeColor(node, usePacked);
 
     pointPositions[idx * 2] = px;
     pointPositions[idx * 2 + 1] = py;
@@ -1582,7 +1666,7 @@ function buildGraphArrays(active) {
     var t = indexById.get(edge.target);
     if (s === undefined || t === undefined) return;
 
-    var col = linkColor(edge);
+    var col = styledLinkColor(edge, usePacked);
     var suppressed = !!(suppressHubDirectMask && suppressHubDirectMask.length > edgeIdx && suppressHubDirectMask[edgeIdx]);
     var width = linkWidth(edge);
     var strength = resolveBaseLinkStrength(edge);
@@ -1597,7 +1681,7 @@ function buildGraphArrays(active) {
     linkColorsFlat.push(col[0], col[1], col[2], col[3]);
     linkWidths.push(width);
     linkStrengthFlat.push(strength);
-    linkStyleCodes.push(linkStyleCode(edge));
+    linkStyleCodes.push(styledLinkStyleCode(edge, usePacked));
     linkFlowMask.push(hasFlow);
     linkBidirMask.push(hasBidir);
     edgeRecords.push({ edge: edge, sourceIndex: s, targetIndex: t });
@@ -1645,7 +1729,230 @@ function buildRuntimeEdgeRecords() {
   return out;
 }
 
+// Per-payload layer/note-type bitsets; rebuilt only when the active arrays change.
+var VISIBILITY_MAX_LAYER_BITS = 32;
+var VISIBILITY_EDGE_NO_LAYER = -1;
+var VISIBILITY_EDGE_NO_ENDPOINT = -1;
+
+function ensureVisibilityIndex(nodes, edges, indexById) {
+  var cached = STATE.visibilityIndex;
+  if (
+    cached &&
+    cached.nodesRef === nodes &&
+    cached.edgesRef === edges &&
+    cached.byIdRef === indexById &&
+    cached.nodeCount === nodes.length &&
+    cached.edgeCount === edges.length
+  ) {
+    return cached;
+  }
+
+  var layerKeys = [];
+  var layerBitByKey = Object.create(null);
+  function layerBit(layer) {
+    var key = String(layer || "");
+    if (!key) return -1;
+    var bit = layerBitByKey[key];
+    if (bit !== undefined) return bit;
+    if (layerKeys.length >= VISIBILITY_MAX_LAYER_BITS) return -2;
+    bit = layerKeys.length;
+    layerKeys.push(key);
+    layerBitByKey[key] = bit;
+    return bit;
+  }
+
+  var nodeLayerBits = new Uint32Array(nodes.length);
+  var nodeOnlyBits = new Uint32Array(nodes.length);
+  var nodeNotesFlag = new Uint8Array(nodes.length);
+  var nodeNoteType = new Int32Array(nodes.length);
+  var noteTypeIds = [];
+  var noteTypeSlot = Object.create(null);
+  var notesBit = layerBit("notes");
+  var i;
+  var overflow = false;
+
+  for (i = 0; i < nodes.length; i += 1) {
+    var node = nodes[i] || {};
+    var layers = Array.isArray(node.layers) ? node.layers : [];
+    var bits = 0;
+    var onlyBits = 0;
+    for (var k = 0; k < layers.length; k += 1) {
+      var bit = layerBit(layers[k]);
+      if (bit === -2) overflow = true;
+      if (bit < 0) continue;
+      bits |= (1 << bit);
+      if (isNodeOnlyLayer(layers[k])) onlyBits |= (1 << bit);
+    }
+    nodeLayerBits[i] = bits >>> 0;
+    nodeOnlyBits[i] = onlyBits >>> 0;
+    nodeNotesFlag[i] = (bits & (1 << notesBit)) ? 1 : 0;
+    nodeNoteType[i] = -1;
+    if (node.kind === "note") {
+      var ntid = String(node.note_type_id || "");
+      if (ntid) {
+        var slot = noteTypeSlot[ntid];
+        if (slot === undefined) {
+          slot = noteTypeIds.length;
+          noteTypeIds.push(ntid);
+          noteTypeSlot[ntid] = slot;
+        }
+        nodeNoteType[i] = slot;
+      }
+    }
+  }
+
+  var edgeLayer = new Int32Array(edges.length);
+  var edgeSource = new Int32Array(edges.length);
+  var edgeTarget = new Int32Array(edges.length);
+  var layerTotals = Object.create(null);
+  for (i = 0; i < edges.length; i += 1) {
+    var edge = edges[i];
+    var eb = edge && edge.layer ? layerBit(edge.layer) : VISIBILITY_EDGE_NO_LAYER;
+    if (eb === -2) overflow = true;
+    edgeLayer[i] = eb;
+    var s = indexById.get(String(edge && edge.source !== undefined ? edge.source : ""));
+    var t = indexById.get(String(edge && edge.target !== undefined ? edge.target : ""));
+    s = (s === undefined) ? VISIBILITY_EDGE_NO_ENDPOINT : Number(s);
+    t = (t === undefined) ? VISIBILITY_EDGE_NO_ENDPOINT : Number(t);
+    if (s < 0 || t < 0 || s >= nodes.length || t >= nodes.length || s === t) {
+      s = VISIBILITY_EDGE_NO_ENDPOINT;
+      t = VISIBILITY_EDGE_NO_ENDPOINT;
+    }
+    edgeSource[i] = s;
+    edgeTarget[i] = t;
+    if (s >= 0) {
+      var totalKey = eb >= 0 ? layerKeys[eb] : "";
+      layerTotals[totalKey] = (layerTotals[totalKey] || 0) + 1;
+    }
+  }
+
+  cached = {
+    nodesRef: nodes,
+    edgesRef: edges,
+    byIdRef: indexById,
+    nodeCount: nodes.length,
+    edgeCount: edges.length,
+    overflow: overflow,
+    layerKeys: layerKeys,
+    nodeLayerBits: nodeLayerBits,
+    nodeOnlyBits: nodeOnlyBits,
+    nodeNotesFlag: nodeNotesFlag,
+    nodeNoteType: nodeNoteType,
+    noteTypeIds: noteTypeIds,
+    edgeLayer: edgeLayer,
+    edgeSource: edgeSource,
+    edgeTarget: edgeTarget,
+    layerDegree: overflow ? null : resolveLayerDegrees(nodes, layerKeys, layerTotals)
+  };
+  STATE.visibilityIndex = cached;
+  return cached;
+}
+
+// Build-time per-layer degree counts, usable only if they describe exactly the edges indexed here.
+function resolveLayerDegrees(nodes, layerKeys, layerTotals) {
+  var meta = STATE.raw && STATE.raw.meta ? STATE.raw.meta : null;
+  var degrees = meta && meta.layer_degrees && typeof meta.layer_degrees === "object" ? meta.layer_degrees : null;
+  if (!degrees || !Array.isArray(degrees.layers) || !Array.isArray(degrees.totals) || !Array.isArray(degrees.counts)) return null;
+  var width = degrees.layers.length;
+  var colByKey = Object.create(null);
+  var i;
+  for (i = 0; i < width; i += 1) {
+    var key = String(degrees.layers[i] || "");
+    colByKey[key] = i;
+    if (Number(degrees.totals[i] || 0) !== Number(layerTotals[key] || 0)) return null;
+  }
+  var seen = Object.keys(layerTotals);
+  for (i = 0; i < seen.length; i += 1) {
+    if (colByKey[seen[i]] === undefined && layerTotals[seen[i]] > 0) return null;
+  }
+  var rows = new Int32Array(nodes.length);
+  for (i = 0; i < nodes.length; i += 1) {
+    var row = nodes[i] ? Number(nodes[i].layerDegreeRow) : NaN;
+    if (!isFinite(row) || row < 0 || ((row + 1) * width) > degrees.counts.length) return null;
+    rows[i] = row;
+  }
+  var colByBit = new Int32Array(layerKeys.length);
+  for (i = 0; i < layerKeys.length; i += 1) {
+    colByBit[i] = colByKey[layerKeys[i]] !== undefined ? colByKey[layerKeys[i]] : -1;
+  }
+  return {
+    width: width,
+    counts: degrees.counts,
+    rows: rows,
+    colByBit: colByBit,
+    noLayerCol: colByKey[""] !== undefined ? colByKey[""] : -1
+  };
+}
+
 function buildRuntimeVisibilityMasks(nodes, edges, indexById) {
+  var vis = ensureVisibilityIndex(nodes, edges, indexById);
+  if (vis.overflow) return buildRuntimeVisibilityMasksByLookup(nodes, edges, indexById);
+
+  var enabledBits = 0;
+  var i;
+  for (i = 0; i < vis.layerKeys.length; i += 1) {
+    var key = vis.layerKeys[i];
+    if (Object.prototype.hasOwnProperty.call(STATE.layers, key) && STATE.layers[key]) enabledBits |= (1 << i);
+  }
+  var noteTypeVisible = new Uint8Array(vis.noteTypeIds.length);
+  for (i = 0; i < vis.noteTypeIds.length; i += 1) {
+    var nt = STATE.noteTypes[vis.noteTypeIds[i]];
+    noteTypeVisible[i] = (!nt || nt.visible !== false) ? 1 : 0;
+  }
+
+  var nodeCount = nodes.length;
+  var edgeCount = edges.length;
+  var nodeBase = new Uint8Array(nodeCount);
+  var nodeTypeOk = new Uint8Array(nodeCount);
+  var nodeVisible = new Uint8Array(nodeCount);
+  var edgeVisible = new Uint8Array(edgeCount);
+  var touchedByLayer = new Uint8Array(nodeCount);
+  var touchedByVisibleEdge = new Uint8Array(nodeCount);
+
+  for (i = 0; i < nodeCount; i += 1) {
+    var slot = vis.nodeNoteType[i];
+    var typeOk = slot < 0 || noteTypeVisible[slot] === 1;
+    nodeTypeOk[i] = typeOk ? 1 : 0;
+    var bits = vis.nodeLayerBits[i];
+    var onlyBits = vis.nodeOnlyBits[i];
+    var layerOk = !bits || ((onlyBits ? onlyBits : bits) & enabledBits) !== 0;
+    nodeBase[i] = (layerOk && typeOk) ? 1 : 0;
+  }
+
+  for (i = 0; i < edgeCount; i += 1) {
+    var eb = vis.edgeLayer[i];
+    if (eb !== VISIBILITY_EDGE_NO_LAYER && !(enabledBits & (1 << eb))) continue;
+    var s = vis.edgeSource[i];
+    var t = vis.edgeTarget[i];
+    if (s < 0 || t < 0) continue;
+    touchedByLayer[s] = 1;
+    touchedByLayer[t] = 1;
+    // notes-layer endpoints bridge into an active edge layer even when their own layer is off
+    var sOk = nodeBase[s] || (vis.nodeNotesFlag[s] && nodeTypeOk[s]);
+    var tOk = nodeBase[t] || (vis.nodeNotesFlag[t] && nodeTypeOk[t]);
+    if (!sOk || !tOk) continue;
+    edgeVisible[i] = 1;
+    touchedByVisibleEdge[s] = 1;
+    touchedByVisibleEdge[t] = 1;
+  }
+
+  for (i = 0; i < nodeCount; i += 1) {
+    if (!nodeBase[i]) {
+      if (touchedByLayer[i] && vis.nodeNotesFlag[i] && nodeTypeOk[i]) nodeVisible[i] = 1;
+      continue;
+    }
+    if (STATE.showUnlinked || touchedByVisibleEdge[i] || vis.nodeOnlyBits[i]) nodeVisible[i] = 1;
+  }
+
+  for (i = 0; i < edgeCount; i += 1) {
+    if (!edgeVisible[i]) continue;
+    if (!nodeVisible[vis.edgeSource[i]] || !nodeVisible[vis.edgeTarget[i]]) edgeVisible[i] = 0;
+  }
+
+  return { nodeVisible: nodeVisible, edgeVisible: edgeVisible };
+}
+
+function buildRuntimeVisibilityMasksByLookup(nodes, edges, indexById) {
   var nodeBase = new Uint8Array(nodes.length);
   var nodeVisible = new Uint8Array(nodes.length);
   var edgeVisible = new Uint8Array(edges.length);
@@ -1719,12 +2026,13 @@ function applyRuntimeUiSettings(reheatLayout) {
   var edgeVisible = masks.edgeVisible;
   var suppressHubDirectMask = buildFamilyHubDirectSuppressMask(edges);
   var edgeRendered = new Uint8Array(edges.length);
+  var usePacked = packedStylesUsable();
 
   var pointColorsFlat = [];
   var pointSizes = new Float32Array(nodes.length);
   var i;
   for (i = 0; i < nodes.length; i += 1) {
-    var col = nodeColor(nodes[i]);
+    var col = styledNodeColor(nodes[i], usePacked);
     var visibleNode = !!nodeVisible[i];
     pointColorsFlat.push(col[0], col[1], col[2], visibleNode ? col[3] : 0);
     pointSizes[i] = 0;
@@ -1742,8 +2050,8 @@ function applyRuntimeUiSettings(reheatLayout) {
     var visibleEdge = !!edgeVisible[i];
     var suppressed = !!(suppressHubDirectMask && suppressHubDirectMask.length > i && suppressHubDirectMask[i]);
     var renderEdge = visibleEdge && !suppressed;
-    var lcol = linkColor(edge);
-    var lstyle = linkStyleCode(edge);
+    var lcol = styledLinkColor(edge, usePacked);
+    var lstyle = styledLinkStyleCode(edge, usePacked);
     var lwidth = linkWidth(edge);
     var lstrength = resolveBaseLinkStrength(edge);
     if (!renderEdge) {
@@ -1765,7 +2073,8 @@ function applyRuntimeUiSettings(reheatLayout) {
     edgeRecords[i] = { edge: edge, sourceIndex: sIdx, targetIndex: tIdx };
   }
 
-  var degreeVisible = buildNodeDegreeArray(nodes.length, edgeRecords, edgeVisible);
+  var degreeVisible = layerDegreeDot(nodes, edges, indexById, nodeVisible)
+    || buildNodeDegreeArray(nodes.length, edgeRecords, edgeVisible);
   for (i = 0; i < nodes.length; i += 1) {
     pointSizes[i] = nodeVisible[i] ? nodeSize(nodes[i], degreeVisible[i]) : 0;
   }
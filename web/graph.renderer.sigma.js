@@ -10,6 +10,10 @@ function AjpcGraphRendererSigma(owner) {
   this.nodeFxAnimUntilMs = 0;
   this.nodeFxPersistent = false;
   this._nodeFxTickBound = null;
+  this.frameAnimUntilMs = 0;
+  this.lodLevel = "mid";
+  this.lodCullBox = null;
+  this.lodBundle = null;
 }
 
 function setNoteNodeAAFlag(enabled) {
@@ -220,7 +224,9 @@ AjpcGraphRendererSigma.prototype._settings = function () {
     zIndex: true,
     allowInvalidContainer: true,
     defaultDrawNodeHover: function () {},
-    defaultDrawNodeLabel: drawAjpcNodeLabel
+    defaultDrawNodeLabel: drawAjpcNodeLabel,
+    nodeReducer: function (node, data) { return self._lodNodeReducer(node, data); },
+    edgeReducer: function (edge, data) { return self._lodEdgeReducer(edge, data); }
   };
 
   if (Object.keys(edgePrograms).length) out.edgeProgramClasses = edgePrograms;
@@ -229,6 +235,182 @@ AjpcGraphRendererSigma.prototype._settings = function () {
   return out;
 };
 
+AjpcGraphRendererSigma.prototype._lodSettings = function () {
+  var p = this.owner.runtimeRenderer || DEF_RENDERER;
+  return {
+    enabled: bol(p.sigma_lod_enabled, DEF_RENDERER.sigma_lod_enabled),
+    farZoom: num(p.sigma_lod_far_zoom, DEF_RENDERER.sigma_lod_far_zoom, 0, 64),
+    cullZoom: num(p.sigma_lod_cull_zoom, DEF_RENDERER.sigma_lod_cull_zoom, 0, 64),
+    cullMargin: num(p.sigma_lod_cull_margin, DEF_RENDERER.sigma_lod_cull_margin, 0, 4)
+  };
+};
+
+AjpcGraphRendererSigma.prototype._viewportGraphBox = function (margin) {
+  if (!this.instance || typeof this.instance.getDimensions !== "function") return null;
+  var dims = this.instance.getDimensions();
+  var w = Math.max(1, Number(dims && dims.width || 1));
+  var h = Math.max(1, Number(dims && dims.height || 1));
+  var a = this.viewportToGraph(0, 0);
+  var b = this.viewportToGraph(w, h);
+  if (!a || !b) return null;
+  var minX = Math.min(a.x, b.x);
+  var maxX = Math.max(a.x, b.x);
+  var minY = Math.min(a.y, b.y);
+  var maxY = Math.max(a.y, b.y);
+  var m = Number(margin) || 0;
+  var padX = (maxX - minX) * m;
+  var padY = (maxY - minY) * m;
+  return { minX: minX - padX, minY: minY - padY, maxX: maxX + padX, maxY: maxY + padY };
+};
+
+AjpcGraphRendererSigma.prototype.maskedEdgesInViewport = function (mask, margin) {
+  var box = this._viewportGraphBox(margin);
+  var owner = this.owner;
+  var graph = owner.graph;
+  if (!box || !graph) return true;
+  var links = owner.linksFlat;
+  var count = Math.min(mask.length, Math.floor(links.length / 2));
+  for (var i = 0; i < count; i += 1) {
+    if (!mask[i]) continue;
+    var sid = owner.idByIndex[Number(links[i * 2]) | 0];
+    var tid = owner.idByIndex[Number(links[(i * 2) + 1]) | 0];
+    if (!sid || !tid || !graph.hasNode(sid) || !graph.hasNode(tid)) continue;
+    var sx = Number(graph.getNodeAttribute(sid, "x"));
+    var sy = Number(graph.getNodeAttribute(sid, "y"));
+    var tx = Number(graph.getNodeAttribute(tid, "x"));
+    var ty = Number(graph.getNodeAttribute(tid, "y"));
+    if (!fin(sx) || !fin(sy) || !fin(tx) || !fin(ty)) continue;
+    if (Math.max(sx, tx) < box.minX || Math.min(sx, tx) > box.maxX || Math.max(sy, ty) < box.minY || Math.min(sy, ty) > box.maxY) continue;
+    return true;
+  }
+  return false;
+};
+
+AjpcGraphRendererSigma.prototype._lodLevelForZoom = function (cfg, zoom) {
+  if (!cfg.enabled) return "mid";
+  if (cfg.farZoom > 0 && zoom < cfg.farZoom) return "far";
+  if (cfg.cullZoom > 0 && zoom > cfg.cullZoom) return "near";
+  return "mid";
+};
+
+// Level of detail: "far" bundles intra-family and cluster-to-cluster edges and drops
+// card dots / node FX, "near" hides edges outside a padded viewport box. Reducers only
+// run when sigma reprocesses, so the level is re-evaluated on camera updates and a
+// refresh is issued only when it (or the culling box) actually changes.
+AjpcGraphRendererSigma.prototype.updateLod = function (force) {
+  if (!this.instance) return false;
+  var cfg = this._lodSettings();
+  var level = this._lodLevelForZoom(cfg, this.getZoomLevel());
+  var changed = level !== this.lodLevel;
+
+  if (level === "near") {
+    var view = this._viewportGraphBox(0);
+    var box = this.lodCullBox;
+    var inside = !!(view && box && view.minX >= box.minX && view.maxX <= box.maxX && view.minY >= box.minY && view.maxY <= box.maxY);
+    if (changed || force || !inside) {
+      this.lodCullBox = this._viewportGraphBox(cfg.cullMargin);
+      changed = true;
+    }
+  } else {
+    this.lodCullBox = null;
+  }
+
+  if (!changed && !force) return false;
+  this.lodLevel = level;
+  dbg("lod", { level: level, cullBox: this.lodCullBox });
+  this.instance.refresh({ schedule: true });
+  return true;
+};
+
+AjpcGraphRendererSigma.prototype.invalidateLod = function () {
+  this.lodBundle = null;
+};
+
+AjpcGraphRendererSigma.prototype._lodBundleCounts = function () {
+  if (this.lodBundle) return this.lodBundle;
+  var owner = this.owner;
+  var graph = owner.graph;
+  var edgeCount = Math.floor(owner.linksFlat.length / 2);
+  var counts = new Uint32Array(edgeCount);
+  var clusterByIndex = new Array(owner.idByIndex.length);
+  var repByPair = new Map();
+  var i;
+
+  for (i = 0; i < owner.idByIndex.length; i += 1) {
+    var attrs = owner.nodeLayoutAttrsById ? owner.nodeLayoutAttrsById.get(String(owner.idByIndex[i])) : null;
+    var cluster = attrs ? String(attrs.grp_family_cluster || "") : "";
+    clusterByIndex[i] = cluster.indexOf("family:") === 0 ? cluster : "";
+  }
+
+  for (var e = 0; e < edgeCount; e += 1) {
+    counts[e] = 1;
+    var edgeId = owner.edgeIdByIndex[e];
+    if (!edgeId || !graph || !graph.hasEdge(edgeId) || graph.getEdgeAttribute(edgeId, "hidden")) continue;
+    var s = Number(owner.linksFlat[e * 2]) | 0;
+    var t = Number(owner.linksFlat[(e * 2) + 1]) | 0;
+    var cs = clusterByIndex[s] || "";
+    var ct = clusterByIndex[t] || "";
+    if (!cs || !ct) continue;
+    if (cs === ct) {
+      // the family hub star keeps the cluster shape; member-to-member edges collapse into it
+      if (owner.idByIndex[s] !== cs && owner.idByIndex[t] !== cs) counts[e] = 0;
+      continue;
+    }
+    var key = cs < ct ? (cs + "|" + ct) : (ct + "|" + cs);
+    var rep = repByPair.get(key);
+    if (rep === undefined) {
+      repByPair.set(key, e);
+      continue;
+    }
+    counts[rep] += 1;
+    counts[e] = 0;
+  }
+
+  this.lodBundle = counts;
+  return counts;
+};
+
+AjpcGraphRendererSigma.prototype._lodNodeReducer = function (node, data) {
+  if (this.lodLevel !== "far" || !data || data.hidden) return data;
+  var st = window && window.STATE ? window.STATE : null;
+  if (st && (st.selectedNodeId === node || st.contextNodeId === node)) return data;
+  data.card_count = 0;
+  data.ajpc_ping_mode = 0;
+  data.ajpc_ring_mode = 0;
+  return data;
+};
+
+AjpcGraphRendererSigma.prototype._lodEdgeReducer = function (edge, data) {
+  if (this.lodLevel === "mid" || !data || data.hidden) return data;
+  var owner = this.owner;
+  var idx = owner.edgeIndexById ? owner.edgeIndexById.get(edge) : undefined;
+  if (idx === undefined) return data;
+
+  if (this.lodLevel === "far") {
+    var counts = this._lodBundleCounts();
+    var c = counts.length > idx ? counts[idx] : 1;
+    if (c === 0) data.hidden = true;
+    else if (c > 1) data.size = Number(data.size || DES) * (1 + (Math.log(c) * 0.5));
+    return data;
+  }
+
+  var box = this.lodCullBox;
+  var graph = owner.graph;
+  if (!box || !graph) return data;
+  var sid = owner.idByIndex[Number(owner.linksFlat[idx * 2]) | 0];
+  var tid = owner.idByIndex[Number(owner.linksFlat[(idx * 2) + 1]) | 0];
+  if (!sid || !tid || !graph.hasNode(sid) || !graph.hasNode(tid)) return data;
+  var sx = Number(graph.getNodeAttribute(sid, "x"));
+  var sy = Number(graph.getNodeAttribute(sid, "y"));
+  var tx = Number(graph.getNodeAttribute(tid, "x"));
+  var ty = Number(graph.getNodeAttribute(tid, "y"));
+  if (!fin(sx) || !fin(sy) || !fin(tx) || !fin(ty)) return data;
+  if (Math.max(sx, tx) < box.minX || Math.min(sx, tx) > box.maxX || Math.max(sy, ty) < box.minY || Math.min(sy, ty) > box.maxY) {
+    data.hidden = true;
+  }
+  return data;
+};
+
 AjpcGraphRendererSigma.prototype._cam = function () {
   if (!this.instance || typeof this.instance.getCamera !== "function") return null;
   try {
@@ -330,9 +512,11 @@ AjpcGraphRendererSigma.prototype._bind = function () {
     if (typeof owner.config.onBackgroundClick === "function") owner.config.onBackgroundClick();
   });
 
+  var self = this;
   var cam = this._cam();
   if (cam && typeof cam.on === "function") {
     this.camCb = function () {
+      self.updateLod(false);
       if (typeof owner.config.onZoom === "function") owner.config.onZoom();
     };
     cam.on("updated", this.camCb);
@@ -363,6 +547,8 @@ AjpcGraphRendererSigma.prototype.init = function () {
 AjpcGraphRendererSigma.prototype.applySettings = function () {
   if (!this.instance) return;
   var st = this._settings();
+  this.lodLevel = this._lodLevelForZoom(this._lodSettings(), this.getZoomLevel());
+  this.lodCullBox = this.lodLevel === "near" ? this._viewportGraphBox(this._lodSettings().cullMargin) : null;
   this.instance.setSettings(st);
   var cam = this._cam();
   if (cam) {
@@ -400,7 +586,7 @@ AjpcGraphRendererSigma.prototype._startNodeFxLoop = function () {
       }
       self.requestFrame();
       var now = performance.now();
-      if (self.nodeFxPersistent || now < self.nodeFxAnimUntilMs) {
+      if (self.nodeFxPersistent || now < self.nodeFxAnimUntilMs || now < self.frameAnimUntilMs) {
         self.nodeFxAnimRaf = window.requestAnimationFrame(self._nodeFxTickBound);
         return;
       }
@@ -420,12 +606,20 @@ AjpcGraphRendererSigma.prototype.setNodeFxAnimationState = function (persistent,
   var now = performance.now();
   if (!this.nodeFxPersistent && this.nodeFxAnimUntilMs <= now) {
     this.nodeFxAnimUntilMs = 0;
-    this._stopNodeFxLoop();
+    if (this.frameAnimUntilMs <= now) this._stopNodeFxLoop();
     return;
   }
   this._startNodeFxLoop();
 };
 
+// Keep redrawing (without reprocessing) until a shader-driven transition has run its course.
+AjpcGraphRendererSigma.prototype.animateUntil = function (untilMs) {
+  var until = Number(untilMs);
+  if (!isFinite(until) || until <= performance.now()) return;
+  if (until > this.frameAnimUntilMs) this.frameAnimUntilMs = until;
+  this._startNodeFxLoop();
+};
+
 AjpcGraphRendererSigma.prototype.resize = function () {
   if (!this.instance) return;
   try {
@@ -642,6 +836,7 @@ AjpcGraphRendererSigma.prototype.kill = function () {
   this._stopNodeFxLoop();
   this.nodeFxPersistent = false;
   this.nodeFxAnimUntilMs = 0;
+  this.frameAnimUntilMs = 0;
 
   var cam = this._cam();
   if (cam && this.camCb && typeof cam.off === "function") {
@@ -650,6 +845,9 @@ AjpcGraphRendererSigma.prototype.kill = function () {
 
   try { this.instance.kill(); } catch (_e2) {}
   this.instance = null;
+  this.lodLevel = "mid";
+  this.lodCullBox = null;
+  this.lodBundle = null;
 
   if (DOM) {
     DOM.flowCanvas = null;
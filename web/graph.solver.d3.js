@@ -1,5 +1,8 @@
 "use strict";
 
+// Alpha cap for a delta reheat; only the changed neighbourhood is free to move.
+var SOLVER_DELTA_REHEAT_ALPHA = 0.3;
+
 function AjpcGraphSolverD3(owner) {
   this.owner = owner;
   this.simulation = null;
@@ -99,13 +102,18 @@ AjpcGraphSolverD3.prototype._buildModel = function () {
     var s = byId.get(sid);
     var t = byId.get(tid);
     if (!s || !t || s === t) continue;
+    var edgeIndex = owner.edgeIndexById && typeof owner.edgeIndexById.get === "function"
+      ? Number(owner.edgeIndexById.get(String(edgeId)))
+      : i;
+    // zero-strength links (suppressed, render-only) exert no force; keep them out of the solver
+    if (owner.linkStrength && isFinite(edgeIndex) && edgeIndex >= 0 && owner.linkStrength.length > edgeIndex) {
+      if (!(Number(owner.linkStrength[edgeIndex]) > 0)) continue;
+    }
     d3links.push({
       source: s,
       target: t,
       id: String(edgeId),
-      edgeIndex: owner.edgeIndexById && typeof owner.edgeIndexById.get === "function"
-        ? Number(owner.edgeIndexById.get(String(edgeId)))
-        : i
+      edgeIndex: edgeIndex
     });
   }
 
@@ -167,7 +175,7 @@ AjpcGraphSolverD3.prototype._applyTick = function () {
   }
 };
 
-AjpcGraphSolverD3.prototype._buildSimulation = function () {
+AjpcGraphSolverD3.prototype._buildSimulation = function (freeIds) {
   var d3 = this._d3();
   if (!d3) return false;
 
@@ -177,6 +185,14 @@ AjpcGraphSolverD3.prototype._buildSimulation = function () {
   this.links = model.links;
 
   if (!this.nodes.length) return false;
+  if (freeIds) {
+    for (var i = 0; i < this.nodes.length; i += 1) {
+      var pinned = this.nodes[i];
+      if (freeIds.has(pinned.id)) continue;
+      pinned.fx = pinned.x;
+      pinned.fy = pinned.y;
+    }
+  }
 
   var self = this;
   var charge = d3.forceManyBody()
@@ -210,7 +226,7 @@ AjpcGraphSolverD3.prototype._buildSimulation = function () {
   this._cooldownTicks = cfg.d3_cooldown_ticks;
   this._cooldownTimeMs = cfg.d3_cooldown_time_ms;
 
-  if (cfg.d3_warmup_ticks > 0) {
+  if (cfg.d3_warmup_ticks > 0 && !freeIds) {
     sim.stop();
     sim.tick(cfg.d3_warmup_ticks);
     this._applyTick();
@@ -243,6 +259,32 @@ AjpcGraphSolverD3.prototype.start = function (alpha) {
   this.simulation.restart();
 };
 
+// Restart the layout after a delta update with everything outside the changed nodes and their
+// neighbours pinned, so the rest of the graph keeps its solved positions.
+AjpcGraphSolverD3.prototype.reheat = function (changedIds) {
+  var cfg = this._settings();
+  if (!cfg.layout_enabled || !this._d3()) return;
+  var graph = this.owner && this.owner.graph ? this.owner.graph : null;
+  var ids = Array.isArray(changedIds) ? changedIds : [];
+  if (!graph || !ids.length) return;
+
+  var free = new Set();
+  ids.forEach(function (id) {
+    if (!graph.hasNode(id)) return;
+    free.add(String(id));
+    graph.forEachNeighbor(id, function (nb) { free.add(String(nb)); });
+  });
+  if (!free.size) return;
+
+  this.stop(true);
+  if (!this._buildSimulation(free) || !this.simulation) return;
+  this.simulation.alpha(Math.max(Math.min(cfg.d3_alpha, SOLVER_DELTA_REHEAT_ALPHA), cfg.d3_alpha_min));
+  this.simulation.alphaTarget(cfg.d3_alpha_target);
+  this._startTs = Date.now();
+  this._tickCount = 0;
+  this.simulation.restart();
+};
+
 AjpcGraphSolverD3.prototype.stop = function (destroySimulation) {
   if (!this.simulation) return;
   try { this.simulation.stop(); } catch (_e) {}
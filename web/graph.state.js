@@ -32,6 +32,9 @@ var STATE = {
   layerStats: {},
   positionCache: new Map(),
   isFirstRender: true,
+  startupLogged: false,
+  graphUpdateMode: "",
+  appliedPhysicsKey: "",
   selectedNodeId: null,
   selectedPointIndex: null,
   contextNodeId: null,
@@ -43,7 +46,12 @@ var STATE = {
   selectedSuggestIdx: -1,
   persistHooksEnabled: true,
   flowRaf: null,
+  flowTimer: null,
   flowStartTs: 0,
+  flowLastFrameTs: 0,
+  flowCheckTs: 0,
+  flowOnScreen: true,
+  flowWindowBlurred: false,
   perfRaf: null,
   perfWindowStart: 0,
   perfFrameCount: 0,
@@ -76,6 +84,9 @@ var STATE = {
   appliedHoverIndex: -1,
   pointSizeAnimRaf: null,
   pointSizeAnimTarget: null,
+  pointSizeAnimFrom: null,
+  pointSizeAnimStart: 0,
+  pointSizeAnimDur: 0,
   basePointColors: new Float32Array(0),
   basePointSizes: new Float32Array(0),
   baseLinkColors: new Float32Array(0),
@@ -87,9 +98,11 @@ var STATE = {
   focusNodeMask: new Uint8Array(0),
   focusEdgeMask: new Uint8Array(0),
   focusAdjCache: null,
+  visibilityIndex: null,
   depTreeCache: new Map(),
-  depTreePendingNid: null,
-  depTreeLoadingNid: 0,
+  depTreeIndex: null,
+  hubMembers: new Map(),
+  expandedHubs: new Set(),
   depTreeRenderState: {
     nid: 0,
     payloadRef: null,
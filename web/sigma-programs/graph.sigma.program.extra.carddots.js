@@ -20,6 +20,7 @@
   var UNIFORMS = [
     "u_sizeRatio",
     "u_correctionRatio",
+    "u_size_t",
     "u_ringRadiusMul",
     "u_dotRadiusMul",
     "u_color_default",
@@ -39,6 +40,7 @@
     "attribute vec4 a_color;",
     "attribute vec2 a_position;",
     "attribute float a_size;",
+    "attribute float a_size_from;",
     "attribute float a_card_count;",
     "attribute float a_mask_normal;",
     "attribute float a_mask_suspended;",
@@ -48,6 +50,7 @@
     "",
     "uniform mat3 u_matrix;",
     "uniform float u_sizeRatio;",
+    "uniform float u_size_t;",
     "uniform float u_correctionRatio;",
     "uniform float u_ringRadiusMul;",
     "uniform float u_dotRadiusMul;",
@@ -62,8 +65,14 @@
     "varying float v_mask_buried;",
     "varying float v_focus;",
     "",
+    "float sizeTween(float from, float to, float t) {",
+    "  float k = clamp(t, 0.0, 1.0);",
+    "  k = k < 0.5 ? (2.0 * k * k) : (1.0 - (0.5 * (2.0 - 2.0 * k) * (2.0 - 2.0 * k)));",
+    "  return mix(from, to, k);",
+    "}",
+    "",
     "void main(void) {",
-    "  float baseSize = a_size * u_correctionRatio / u_sizeRatio * 4.0;",
+    "  float baseSize = sizeTween(a_size_from, a_size, u_size_t) * u_correctionRatio / u_sizeRatio * 4.0;",
     "  float coverageScale = u_ringRadiusMul + u_dotRadiusMul + 0.7;",
     "  vec2 unit = vec2(cos(a_angle), sin(a_angle));",
     "  vec2 diffVector = (baseSize * coverageScale) * unit;",
@@ -302,6 +311,14 @@
     colorPlusFg: colorToVec4(CARD_DOTS_SHADER_COLOR_INPUT.colorPlusFg, [0.97, 0.98, 1.0, 1])
   };
 
+  function sizeTweenProgress(runtime) {
+    var tween = runtime && runtime.sizeTween;
+    var dur = Number(tween && tween.dur);
+    if (!isFinite(dur) || dur <= 0) return 1;
+    var t = (performance.now() - Number(tween.start || 0)) / dur;
+    return t < 0 ? 0 : (t > 1 ? 1 : t);
+  }
+
   class AJPCCardDotsNodeProgram extends NodeProgram {
     getDefinition() {
       return {
@@ -313,6 +330,7 @@
         ATTRIBUTES: [
           { name: "a_position", size: 2, type: FLOAT },
           { name: "a_size", size: 1, type: FLOAT },
+          { name: "a_size_from", size: 1, type: FLOAT },
           { name: "a_card_count", size: 1, type: FLOAT },
           { name: "a_mask_normal", size: 1, type: FLOAT },
           { name: "a_mask_suspended", size: 1, type: FLOAT },
@@ -342,6 +360,7 @@
       array[startIndex++] = numOr(data.x, 0);
       array[startIndex++] = numOr(data.y, 0);
       array[startIndex++] = numOr(data.size, 0);
+      array[startIndex++] = numOr(data.ajpc_size_from, numOr(data.size, 0));
       array[startIndex++] = count;
       array[startIndex++] = maskNormal;
       array[startIndex++] = maskSuspended;
@@ -363,6 +382,7 @@
       if (!isFinite(dimAlphaMul)) dimAlphaMul = 0.16;
       gl.uniform1f(uniformLocations.u_sizeRatio, params.sizeRatio);
       gl.uniform1f(uniformLocations.u_correctionRatio, params.correctionRatio);
+      gl.uniform1f(uniformLocations.u_size_t, sizeTweenProgress(runtime));
       gl.uniform1f(uniformLocations.u_ringRadiusMul, 0.7); //Dot distance to center
       gl.uniform1f(uniformLocations.u_dotRadiusMul, 0.11); //Dot diameter
       gl.uniform4f(uniformLocations.u_color_default, c.colorDefault[0], c.colorDefault[1], c.colorDefault[2], c.colorDefault[3]);
@@ -21,6 +21,7 @@
     "u_matrix",
     "u_sizeRatio",
     "u_correctionRatio",
+    "u_size_t",
     "u_time",
     "u_maxCoverageMul",
     "u_ping_max_radius_mul",
@@ -49,6 +50,7 @@
     "attribute vec4 a_id;",
     "attribute vec2 a_position;",
     "attribute float a_size;",
+    "attribute float a_size_from;",
     "attribute vec4 a_color;",
     "attribute float a_focus;",
     "attribute float a_ping_start;",
@@ -61,6 +63,7 @@
     "",
     "uniform mat3 u_matrix;",
     "uniform float u_sizeRatio;",
+    "uniform float u_size_t;",
     "uniform float u_correctionRatio;",
     "uniform float u_maxCoverageMul;",
     "",
@@ -75,8 +78,14 @@
     "varying float v_ring_mode;",
     "varying vec4 v_ring_color;",
     "",
+    "float sizeTween(float from, float to, float t) {",
+    "  float k = clamp(t, 0.0, 1.0);",
+    "  k = k < 0.5 ? (2.0 * k * k) : (1.0 - (0.5 * (2.0 - 2.0 * k) * (2.0 - 2.0 * k)));",
+    "  return mix(from, to, k);",
+    "}",
+    "",
     "void main(void) {",
-    "  float baseSize = a_size * u_correctionRatio / u_sizeRatio * 4.0;",
+    "  float baseSize = sizeTween(a_size_from, a_size, u_size_t) * u_correctionRatio / u_sizeRatio * 4.0;",
     "  float coverageScale = u_maxCoverageMul + 0.7;",
     "  vec2 local = (baseSize * coverageScale) * vec2(cos(a_angle), sin(a_angle));",
     "  vec2 position = a_position + local;",
@@ -291,6 +300,14 @@
     return [fb[0], fb[1], fb[2], fb[3]];
   }
 
+  function sizeTweenProgress(runtime) {
+    var tween = runtime && runtime.sizeTween;
+    var dur = Number(tween && tween.dur);
+    if (!isFinite(dur) || dur <= 0) return 1;
+    var t = (performance.now() - Number(tween.start || 0)) / dur;
+    return t < 0 ? 0 : (t > 1 ? 1 : t);
+  }
+
   class AJPCNodeFxProgram extends NodeProgram {
     getDefinition() {
       return {
@@ -302,6 +319,7 @@
         ATTRIBUTES: [
           { name: "a_position", size: 2, type: FLOAT },
           { name: "a_size", size: 1, type: FLOAT },
+          { name: "a_size_from", size: 1, type: FLOAT },
           { name: "a_focus", size: 1, type: FLOAT },
           { name: "a_ping_start", size: 1, type: FLOAT },
           { name: "a_ping_dur", size: 1, type: FLOAT },
@@ -330,6 +348,7 @@
       array[startIndex++] = numOr(data.x, 0);
       array[startIndex++] = numOr(data.y, 0);
       array[startIndex++] = numOr(data.size, 0);
+      array[startIndex++] = numOr(data.ajpc_size_from, numOr(data.size, 0));
       array[startIndex++] = numOr(data.ajpc_focus, 0) > 0 ? 1 : 0;
       array[startIndex++] = numOr(data.ajpc_ping_start, -1);
       array[startIndex++] = numOr(data.ajpc_ping_dur, 0);
@@ -381,6 +400,7 @@
       gl.uniformMatrix3fv(uniformLocations.u_matrix, false, params.matrix);
       gl.uniform1f(uniformLocations.u_sizeRatio, params.sizeRatio);
       gl.uniform1f(uniformLocations.u_correctionRatio, params.correctionRatio);
+      gl.uniform1f(uniformLocations.u_size_t, sizeTweenProgress(runtime));
       gl.uniform1f(uniformLocations.u_time, performance.now() * 0.001);
       gl.uniform1f(uniformLocations.u_maxCoverageMul, maxCoverage);
       gl.uniform1f(uniformLocations.u_ping_max_radius_mul, pingRadiusMul);
@@ -54,6 +54,34 @@
     return vs;
   }
 
+  // Point-size transitions run in the shader: a_size is the target, a_size_from the start.
+  function patchHubSizeTween(source) {
+    var vs = String(source || "");
+    if (!vs || vs.indexOf("AJPC_HUB_SIZE_TWEEN") >= 0) return vs;
+    var main = /void\s+main\s*\(\s*(?:void)?\s*\)/.exec(vs);
+    if (!main || !/attribute\s+float\s+a_size\s*;/.test(vs)) return vs;
+    var head = vs.slice(0, main.index).replace(
+      /attribute\s+float\s+a_size\s*;/,
+      "attribute float a_size;\nattribute float a_size_from;\nuniform float u_size_t;"
+    );
+    var body = vs.slice(main.index).replace(/\ba_size\b/g, "sizeTween(a_size_from, a_size, u_size_t)");
+    return head +
+      "float sizeTween(float from, float to, float t) {\n" +
+      "  float k = clamp(t, 0.0, 1.0);\n" +
+      "  k = k < 0.5 ? (2.0 * k * k) : (1.0 - (0.5 * (2.0 - 2.0 * k) * (2.0 - 2.0 * k)));\n" +
+      "  return mix(from, to, k);\n" +
+      "}\n\n" +
+      body + "\n// AJPC_HUB_SIZE_TWEEN";
+  }
+
+  function sizeTweenProgress(runtime) {
+    var tween = runtime && runtime.sizeTween;
+    var dur = Number(tween && tween.dur);
+    if (!isFinite(dur) || dur <= 0) return 1;
+    var t = (performance.now() - Number(tween.start || 0)) / dur;
+    return t < 0 ? 0 : (t > 1 ? 1 : t);
+  }
+
   function patchHubFragmentShader(source) {
     var fs = String(source || "");
     if (!fs) return fs;
@@ -81,15 +109,22 @@
       var attrs = Array.isArray(def.ATTRIBUTES) ? def.ATTRIBUTES.slice() : [];
       this._ajpcFocusOffset = attributeItems(attrs);
       attrs.push({ name: "a_focus", size: 1, type: WebGLRenderingContext.FLOAT });
+      var vs = patchHubSizeTween(patchHubVertexShader(def.VERTEX_SHADER_SOURCE));
+      this._ajpcSizeFromOffset = -1;
+      if (vs.indexOf("AJPC_HUB_SIZE_TWEEN") >= 0) {
+        this._ajpcSizeFromOffset = attributeItems(attrs);
+        attrs.push({ name: "a_size_from", size: 1, type: WebGLRenderingContext.FLOAT });
+      }
       def.ATTRIBUTES = attrs;
 
       var uniforms = Array.isArray(def.UNIFORMS) ? def.UNIFORMS.slice() : [];
       if (uniforms.indexOf("u_focus_active") < 0) uniforms.push("u_focus_active");
       if (uniforms.indexOf("u_dim_rgb_mul") < 0) uniforms.push("u_dim_rgb_mul");
       if (uniforms.indexOf("u_dim_alpha_mul") < 0) uniforms.push("u_dim_alpha_mul");
+      if (this._ajpcSizeFromOffset >= 0 && uniforms.indexOf("u_size_t") < 0) uniforms.push("u_size_t");
       def.UNIFORMS = uniforms;
 
-      def.VERTEX_SHADER_SOURCE = patchHubVertexShader(def.VERTEX_SHADER_SOURCE);
+      def.VERTEX_SHADER_SOURCE = vs;
       def.FRAGMENT_SHADER_SOURCE = patchHubFragmentShader(def.FRAGMENT_SHADER_SOURCE);
       def._ajpcHubFocusPatched = true;
       return def;
@@ -102,6 +137,11 @@
       var focus = Number(data && data.ajpc_focus);
       if (!isFinite(focus)) focus = 0;
       this.array[startIndex + offset] = focus > 0 ? 1 : 0;
+      var sizeOffset = this._ajpcSizeFromOffset;
+      if (isFinite(sizeOffset) && sizeOffset >= 0) {
+        var sizeFrom = Number(data && data.ajpc_size_from);
+        this.array[startIndex + sizeOffset] = isFinite(sizeFrom) ? sizeFrom : Number(data && data.size) || 0;
+      }
     }
 
     setUniforms(params, context) {
@@ -117,6 +157,7 @@
       if (uniformLocations.u_focus_active !== undefined && uniformLocations.u_focus_active !== null) gl.uniform1f(uniformLocations.u_focus_active, focusActive ? 1 : 0);
       if (uniformLocations.u_dim_rgb_mul !== undefined && uniformLocations.u_dim_rgb_mul !== null) gl.uniform1f(uniformLocations.u_dim_rgb_mul, dimRgbMul);
       if (uniformLocations.u_dim_alpha_mul !== undefined && uniformLocations.u_dim_alpha_mul !== null) gl.uniform1f(uniformLocations.u_dim_alpha_mul, dimAlphaMul);
+      if (uniformLocations.u_size_t !== undefined && uniformLocations.u_size_t !== null) gl.uniform1f(uniformLocations.u_size_t, sizeTweenProgress(runtime));
     }
   }
 
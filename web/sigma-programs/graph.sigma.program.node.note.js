@@ -76,7 +76,7 @@
     "  #endif",
     "}"
   ].join("\n");
-  var VERTEX_SHADER_SOURCE = "\nattribute vec4 a_id;\nattribute vec4 a_color;\nattribute vec2 a_position;\nattribute float a_size;\nattribute float a_seed;\nattribute float a_focus;\nattribute float a_angle;\n\nuniform mat3 u_matrix;\nuniform float u_sizeRatio;\nuniform float u_correctionRatio;\n\nvarying vec4 v_color;\nvarying vec2 v_diffVector;\nvarying float v_radius;\nvarying float v_seed;\nvarying float v_focus;\n\nconst float bias = 255.0 / 254.0;\nconst float coverageScale = 2.1;\n\nvoid main() {\n  float baseSize = a_size * u_correctionRatio / u_sizeRatio * 4.0;\n  vec2 unit = vec2(cos(a_angle), sin(a_angle));\n  vec2 diffVector = (baseSize * coverageScale) * unit;\n  vec2 position = a_position + diffVector;\n  gl_Position = vec4((u_matrix * vec3(position, 1.0)).xy, 0.0, 1.0);\n\n  v_diffVector = diffVector;\n  v_radius = baseSize / 2.0;\n  v_seed = a_seed;\n  v_focus = a_focus;\n\n  #ifdef PICKING_MODE\n    v_color = a_id;\n  #else\n    v_color = a_color;\n  #endif\n\n  v_color.a *= bias;\n}\n";
+  var VERTEX_SHADER_SOURCE = "\nattribute vec4 a_id;\nattribute vec4 a_color;\nattribute vec2 a_position;\nattribute float a_size;\nattribute float a_size_from;\nattribute float a_seed;\nattribute float a_focus;\nattribute float a_angle;\n\nuniform mat3 u_matrix;\nuniform float u_sizeRatio;\nuniform float u_correctionRatio;\nuniform float u_size_t;\n\nvarying vec4 v_color;\nvarying vec2 v_diffVector;\nvarying float v_radius;\nvarying float v_seed;\nvarying float v_focus;\n\nconst float bias = 255.0 / 254.0;\nconst float coverageScale = 2.1;\n\nfloat sizeTween(float from, float to, float t) {\n  float k = clamp(t, 0.0, 1.0);\n  k = k < 0.5 ? (2.0 * k * k) : (1.0 - (0.5 * (2.0 - 2.0 * k) * (2.0 - 2.0 * k)));\n  return mix(from, to, k);\n}\n\nvoid main() {\n  float baseSize = sizeTween(a_size_from, a_size, u_size_t) * u_correctionRatio / u_sizeRatio * 4.0;\n  vec2 unit = vec2(cos(a_angle), sin(a_angle));\n  vec2 diffVector = (baseSize * coverageScale) * unit;\n  vec2 position = a_position + diffVector;\n  gl_Position = vec4((u_matrix * vec3(position, 1.0)).xy, 0.0, 1.0);\n\n  v_diffVector = diffVector;\n  v_radius = baseSize / 2.0;\n  v_seed = a_seed;\n  v_focus = a_focus;\n\n  #ifdef PICKING_MODE\n    v_color = a_id;\n  #else\n    v_color = a_color;\n  #endif\n\n  v_color.a *= bias;\n}\n";
 
   var UNSIGNED_BYTE = WebGLRenderingContext.UNSIGNED_BYTE;
   var FLOAT = WebGLRenderingContext.FLOAT;
@@ -88,9 +88,19 @@
     "u_focus_active",
     "u_dim_rgb_mul",
     "u_dim_alpha_mul",
+    "u_size_t",
     "u_matrix"
   ];
 
+  // Progress of the current point-size transition; sizes themselves are uploaded once per transition.
+  function sizeTweenProgress(runtime) {
+    var tween = runtime && runtime.sizeTween;
+    var dur = Number(tween && tween.dur);
+    if (!isFinite(dur) || dur <= 0) return 1;
+    var t = (performance.now() - Number(tween.start || 0)) / dur;
+    return t < 0 ? 0 : (t > 1 ? 1 : t);
+  }
+
   class AJPCNoteNodeProgram extends NodeProgram {
     getDefinition() {
       return {
@@ -102,6 +112,7 @@
         ATTRIBUTES: [
           { name: "a_position", size: 2, type: FLOAT },
           { name: "a_size", size: 1, type: FLOAT },
+          { name: "a_size_from", size: 1, type: FLOAT },
           { name: "a_seed", size: 1, type: FLOAT },
           { name: "a_focus", size: 1, type: FLOAT },
           { name: "a_color", size: 4, type: UNSIGNED_BYTE, normalized: true },
@@ -122,9 +133,12 @@
       var seed = (Math.abs((nodeIndex * 1103515245) + 12345) % 2048) / 2048;
       var focus = Number(data && data.ajpc_focus);
       if (!isFinite(focus)) focus = 0;
+      var sizeFrom = Number(data && data.ajpc_size_from);
+      if (!isFinite(sizeFrom)) sizeFrom = data.size;
       array[startIndex++] = data.x;
       array[startIndex++] = data.y;
       array[startIndex++] = data.size;
+      array[startIndex++] = sizeFrom;
       array[startIndex++] = seed;
       array[startIndex++] = focus > 0 ? 1 : 0;
       array[startIndex++] = color;
@@ -148,6 +162,7 @@
       gl.uniform1f(uniformLocations.u_focus_active, focusActive ? 1 : 0);
       gl.uniform1f(uniformLocations.u_dim_rgb_mul, dimRgbMul);
       gl.uniform1f(uniformLocations.u_dim_alpha_mul, dimAlphaMul);
+      gl.uniform1f(uniformLocations.u_size_t, sizeTweenProgress(runtime));
       gl.uniformMatrix3fv(uniformLocations.u_matrix, false, params.matrix);
     }
   }
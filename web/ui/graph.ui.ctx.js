@@ -212,6 +212,23 @@ function buildContextMenuGroupsForCtx(ctx) {
         if (pycmd) pycmd("ctx:browsertag:" + encodeURIComponent(tag));
       }
     });
+    if (isHubExpanded(node.id)) {
+      openGroup.push({
+        label: "Collapse Hub Members",
+        cb: function () { setHubExpanded(node.id, false); }
+      });
+    } else {
+      openGroup.push({
+        label: "Expand Hub Members",
+        cb: function () {
+          showToast("Loading hub members");
+          expandHub(node.id, function (entry) {
+            if (entry.error) showToast("Hub members failed: " + entry.error);
+            else showToast("Hub members: " + String(entry.nodes.length) + " notes, " + String(entry.edges.length) + " links");
+          });
+        }
+      });
+    }
   }
   groups.push(openGroup);
 
@@ -18,6 +18,21 @@ var DEBUG_COORD_SPEC = [
   { key: "cam", a: "camX", b: "camY" }
 ];
 
+// Build telemetry rows (meta.perf.gates); keys are short to fit the 52px key column.
+var DEBUG_PERF_KEYS = {
+  family: "fam",
+  example: "ex",
+  kanji: "kanji",
+  mass_linker: "mass",
+  reference: "ref",
+  unlinked: "unl",
+  hub_aggregation: "hubs",
+  links: "links",
+  filter: "filter",
+  card_map: "cards",
+  meta: "meta"
+};
+
 function debugCallEngine(name) {
   var adapter = window && window.GraphAdapter;
   if (!adapter || typeof adapter.callEngine !== "function") return undefined;
@@ -96,6 +111,56 @@ function setDebugExtraValues(v) {
   });
 }
 
+function formatDebugBytes(n) {
+  var v = Number(n);
+  if (!isFiniteNumber(v) || v < 0) return "";
+  if (v >= 1048576) return (v / 1048576).toFixed(1) + "M";
+  if (v >= 1024) return (v / 1024).toFixed(1) + "k";
+  return String(Math.round(v));
+}
+
+function setDebugBuildPerf(perf) {
+  if (!DOM.debugPerf) return;
+  var p = perf && typeof perf === "object" ? perf : null;
+  var gates = p && Array.isArray(p.gates) ? p.gates : [];
+  DOM.debugPerf.innerHTML = "";
+  if (!p) return;
+  var table = document.createElement("div");
+  table.className = "coord-table";
+  table.setAttribute("aria-label", "debug build telemetry");
+
+  function addRow(key, a, b) {
+    var k = document.createElement("div");
+    k.className = "coord-key";
+    k.textContent = key;
+    var av = document.createElement("div");
+    av.className = "coord-val";
+    av.textContent = a;
+    var bv = document.createElement("div");
+    bv.className = "coord-val";
+    bv.textContent = b;
+    table.appendChild(k);
+    table.appendChild(av);
+    table.appendChild(bv);
+  }
+
+  gates.forEach(function (g) {
+    if (!g || typeof g !== "object") return;
+    var ms = Number(g.ms);
+    var counts = "n" + Number(g.notes || 0) + "|e" + Number(g.edges || 0);
+    var bytes = formatDebugBytes(g.bytes);
+    if (g.bytes !== undefined && bytes) counts += "|" + bytes;
+    addRow(
+      DEBUG_PERF_KEYS[g.gate] || String(g.gate || "--"),
+      isFiniteNumber(ms) ? ms.toFixed(1) + "ms" : "--",
+      counts
+    );
+  });
+  var total = Number(p.total_ms);
+  addRow("build", isFiniteNumber(total) ? total.toFixed(1) + "ms" : "--", "n" + Number(p.notes || 0));
+  DOM.debugPerf.appendChild(table);
+}
+
 function clearDebugValueTables() {
   setDebugCoordValues({
     use: "--",
@@ -374,6 +439,7 @@ function wireDebugDom() {
   
   DOM.debugCoords = byId("debug-coords");
   DOM.debugExtra = byId("debug-extra");
+  DOM.debugPerf = byId("debug-perf");
   DOM.debugCoordCells = null;
   DOM.debugExtraCells = null;
 
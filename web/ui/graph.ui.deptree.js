@@ -58,14 +58,142 @@ function formatDepTreeFallbackHtml(payload, extra) {
   );
 }
 
-function requestDepTreeForNid(nid) {
+// --- Local dep-tree engine ---------------------------------------------------
+// Prerequisite chains are derived from the family_prios carried by the loaded
+// payload (the same data family_edges_chain is built from), so selecting a node
+// never needs a round trip to Python. Results are memoised per nid in
+// STATE.depTreeCache; applyPayload() drops both cache and index on every
+// ajpcGraphInit/ajpcGraphUpdate.
+
+var DEP_TREE_MAX_NODES = 80;
+
+function depTreeIndex() {
+  if (STATE.depTreeIndex) return STATE.depTreeIndex;
+  var nodes = (STATE.raw && Array.isArray(STATE.raw.nodes)) ? STATE.raw.nodes : [];
+  var byId = new Map();
+  var levelsByFid = new Map();
+  for (var i = 0; i < nodes.length; i += 1) {
+    var node = nodes[i];
+    if (!node || String(node.kind || "") !== "note") continue;
+    var id = String(node.id || "");
+    if (!id) continue;
+    byId.set(id, node);
+    var prios = node.family_prios && typeof node.family_prios === "object" ? node.family_prios : null;
+    if (!prios) continue;
+    Object.keys(prios).forEach(function (fid) {
+      var prio = Number(prios[fid]);
+      if (!isFiniteNumber(prio)) return;
+      var levels = levelsByFid.get(fid);
+      if (!levels) {
+        levels = new Map();
+        levelsByFid.set(fid, levels);
+      }
+      var bucket = levels.get(prio);
+      if (!bucket) {
+        bucket = [];
+        levels.set(prio, bucket);
+      }
+      bucket.push(id);
+    });
+  }
+  var sortedPriosByFid = new Map();
+  levelsByFid.forEach(function (levels, fid) {
+    sortedPriosByFid.set(fid, Array.from(levels.keys()).sort(function (a, b) { return a - b; }));
+  });
+  STATE.depTreeIndex = { byId: byId, levelsByFid: levelsByFid, sortedPriosByFid: sortedPriosByFid };
+  return STATE.depTreeIndex;
+}
+
+function depTreeAdjacentLevel(index, nodeId, step) {
+  // step < 0: members of the nearest lower prio level (prerequisites).
+  // step > 0: members of the nearest higher prio level (dependents).
+  var out = [];
+  var node = index.byId.get(nodeId);
+  var prios = node && node.family_prios && typeof node.family_prios === "object" ? node.family_prios : null;
+  if (!prios) return out;
+  Object.keys(prios).forEach(function (fid) {
+    var prio = Number(prios[fid]);
+    var sorted = index.sortedPriosByFid.get(fid);
+    var levels = index.levelsByFid.get(fid);
+    if (!sorted || !levels || !isFiniteNumber(prio)) return;
+    var pos = sorted.indexOf(prio);
+    if (pos < 0) return;
+    var next = pos + (step < 0 ? -1 : 1);
+    if (next < 0 || next >= sorted.length) return;
+    var members = levels.get(sorted[next]) || [];
+    for (var i = 0; i < members.length; i += 1) {
+      if (members[i] !== nodeId) out.push(members[i]);
+    }
+  });
+  return out;
+}
+
+function buildDepTreeForNid(nid) {
+  var rootId = String(nid || "");
+  var index = depTreeIndex();
+  var out = { current_nid: Number(nid || 0), nodes: [], edges: [], estimated_height: 0 };
+  if (!index.byId.has(rootId)) return out;
+
+  var depth = new Map();
+  var edgeKeys = new Set();
+  var edges = [];
+  depth.set(rootId, 0);
+
+  function walk(step) {
+    var queue = [rootId];
+    while (queue.length) {
+      var cur = queue.shift();
+      var curDepth = Number(depth.get(cur) || 0);
+      var next = depTreeAdjacentLevel(index, cur, step);
+      for (var i = 0; i < next.length; i += 1) {
+        var other = next[i];
+        var src = step < 0 ? other : cur;
+        var dst = step < 0 ? cur : other;
+        var key = src + ">" + dst;
+        if (!depth.has(other)) {
+          if (depth.size >= DEP_TREE_MAX_NODES) continue;
+          depth.set(other, curDepth + step);
+          queue.push(other);
+        }
+        if (edgeKeys.has(key)) continue;
+        edgeKeys.add(key);
+        edges.push({ source: "n" + src, target: "n" + dst });
+      }
+    }
+  }
+
+  walk(-1);
+  walk(1);
+
+  var minDepth = 0;
+  var maxDepth = 0;
+  depth.forEach(function (d, id) {
+    var node = index.byId.get(id);
+    minDepth = Math.min(minDepth, d);
+    maxDepth = Math.max(maxDepth, d);
+    out.nodes.push({
+      id: "n" + id,
+      nid: Number(id),
+      label: String((node && node.label) || id)
+    });
+  });
+  out.edges = edges;
+  if (out.nodes.length <= 1 && !edges.length) {
+    out.nodes = [];
+    return out;
+  }
+  out.estimated_height = 40 + ((maxDepth - minDepth + 1) * 44);
+  return out;
+}
+
+function depTreeForNid(nid) {
   var target = Number(nid || 0);
-  if (!isFiniteNumber(target) || target <= 0) return;
+  if (!isFiniteNumber(target) || target <= 0) return null;
   var cache = depTreeCacheMap();
-  if (cache.has(target)) return;
-  if (Number(STATE.depTreePendingNid || 0) === target) return;
-  STATE.depTreePendingNid = target;
-  persistHook("deptree:" + String(target));
+  if (cache.has(target)) return cache.get(target);
+  var payload = normalizeDepTreePayload(buildDepTreeForNid(target));
+  cache.set(target, payload);
+  return payload;
 }
 
 function depTreeHasData(payload) {
@@ -152,7 +280,6 @@ function depTreeDebugStats(nowMs) {
 }
 
 function resetDepTreeRenderState() {
-  STATE.depTreeLoadingNid = 0;
   STATE.depTreeRenderState = {
     nid: 0,
     payloadRef: null,
@@ -222,7 +349,6 @@ function markDepTreeRendered(nid, payload) {
     width: Number(size.width || 0),
     height: Number(size.height || 0)
   };
-  STATE.depTreeLoadingNid = 0;
   recordDepTreeRender();
 }
 
@@ -1207,50 +1333,13 @@ function renderActiveDepTree(node) {
     resetDepTreeRenderState();
     return;
   }
-  var cache = depTreeCacheMap();
-  if (cache.has(nid)) {
-    var payload = cache.get(nid);
-    if (!depTreeHasData(payload)) {
-      depTreeRenderEmptyState(payload, "No dependency data");
-      markDepTreeRendered(nid, payload);
-      return;
-    }
-    if (!shouldRenderDepTreeCanvas(nid, payload, false)) return;
-    renderDepTreeCanvas(payload);
+  var payload = depTreeForNid(nid);
+  if (!depTreeHasData(payload)) {
+    depTreeRenderEmptyState(payload, "No dependency data");
     markDepTreeRendered(nid, payload);
     return;
   }
-  if (Number(STATE.depTreeLoadingNid || 0) !== nid || !DOM.statusActiveDepTreeCanvas) {
-    depTreeSetEmptyState(false);
-    DOM.statusActiveDepTree.innerHTML = renderHtmlTemplate(
-      `<div>
-        <h3>Dependency Tree:</h3> {{status}}
-      </div>`,
-      { status: "loading..." }
-    );
-    DOM.statusActiveDepTreeCanvas = null;
-  }
-  STATE.depTreeLoadingNid = nid;
-  requestDepTreeForNid(nid);
-};
-
-window.setActiveDepTreeFromPy = function (payload) {
-  var p = normalizeDepTreePayload(payload);
-  var nid = Number(p.current_nid || 0);
-  if (!isFiniteNumber(nid) || nid <= 0) return;
-  depTreeCacheMap().set(nid, p);
-  if (Number(STATE.depTreePendingNid || 0) === nid) STATE.depTreePendingNid = null;
-
-  var sel = selectedNodeForStatus();
-  if (!sel || !sel.node) return;
-  if (nodeNidForDepTree(sel.node) !== nid) return;
-  if (!depTreeHasData(p)) {
-    depTreeRenderEmptyState(p, "No dependency data");
-    markDepTreeRendered(nid, p);
-    return;
-  }
-  if (!shouldRenderDepTreeCanvas(nid, p, false)) return;
-  renderDepTreeCanvas(p);
-  markDepTreeRendered(nid, p);
-};
-
+  if (!shouldRenderDepTreeCanvas(nid, payload, false)) return;
+  renderDepTreeCanvas(payload);
+  markDepTreeRendered(nid, payload);
+}